@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Dino animation updates.
+
+Compares the per-tick cost of Dino.update_state_animation with the old
+behaviour (slice + scale the frame from the sprite sheet on every call)
+against the pre-scaled frame table lookup.
+
+Usage:
+    python benchmarks/animation_frames.py [ticks]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.dino import Dino
+
+DELTA_TIME = 1.0 / 60.0
+
+
+def legacy_get_frame(dino, sheet, frame_index):
+    """Frame extraction as it was done before the frame table existed"""
+    frame_x = (frame_index * dino.frame_width) % sheet.get_width()
+    frame_y = ((frame_index * dino.frame_width) // sheet.get_width()) * dino.frame_height
+    frame_rect = pygame.Rect(frame_x, frame_y, dino.frame_width, dino.frame_height)
+    frame = sheet.subsurface(frame_rect).copy()
+    if dino.scale != 1.0:
+        scaled_width = int(dino.frame_width * dino.scale)
+        scaled_height = int(dino.frame_height * dino.scale)
+        frame = pygame.transform.scale(frame, (scaled_width, scaled_height))
+    return frame
+
+
+def run_ticks(dino, ticks, get_frame):
+    """Run the run-state animation for a number of ticks, returns seconds per tick"""
+    frames = dino.animation_frames["run"]
+    dino.state = "run"
+    dino.state_frame_index = 0
+    dino.animation_timer = 0.0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        dino.animation_timer += DELTA_TIME
+        if dino.animation_timer >= 1.0 / dino.animation_speed:
+            dino.state_frame_index = (dino.state_frame_index + 1) % len(frames)
+            dino.animation_timer = 0.0
+        dino.sprite = get_frame(frames[dino.state_frame_index])
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    dino = Dino(150, 485)
+    sheet = pygame.image.load(dino.sprite_sheets["base"]).convert_alpha()
+
+    before = run_ticks(dino, ticks, lambda index: legacy_get_frame(dino, sheet, index))
+    after = run_ticks(dino, ticks, dino.get_frame)
+
+    print(f"Ticks:               {ticks}")
+    print(f"Before (slice+scale): {before * 1e6:8.2f} us/tick")
+    print(f"After (frame table):  {after * 1e6:8.2f} us/tick")
+    print(f"Speedup:              {before / after:8.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Background drawing.
+
+Compares the old background path (screen fill, then five per-pixel alpha
+layers and the ground tiled with while loops) against the flattened strips
+at each quality level, per frame, while scrolling at a typical speed.
+
+Usage:
+    python benchmarks/background_draw.py [frames]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.assets import asset_cache
+from scenes.background import Background
+from scenes.path_utils import get_resource_path
+
+SCREEN_SIZE = (1152, 648)
+SPEED = 400.0
+DELTA_TIME = 1.0 / 60.0
+
+
+def legacy_draw(background, ground_image, screen):
+    """Background drawing as it was before the strips existed"""
+    screen.fill((135, 206, 235))
+    for i, layer in enumerate(background.layers):
+        x = background.layer_positions[i]
+        if x > 0:
+            x -= layer.get_width()
+        while x < background.screen_width:
+            screen.blit(layer, (x, 0))
+            x += layer.get_width()
+    x = min(background.ground_positions)
+    if x > 0:
+        x -= ground_image.get_width()
+    while x < background.screen_width:
+        screen.blit(ground_image, (x, background.ground_y))
+        x += ground_image.get_width()
+
+
+def measure(background, draw, frames):
+    """Average seconds per frame for a draw callable while scrolling"""
+    total = 0.0
+    for _ in range(frames):
+        background.update(DELTA_TIME, SPEED)
+        start = time.perf_counter()
+        draw()
+        total += time.perf_counter() - start
+    return total / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    background = Background(*SCREEN_SIZE)
+    ground_image = asset_cache.get_image(get_resource_path(Background.GROUND_IMAGE_PATH))
+    legacy = measure(background, lambda: legacy_draw(background, ground_image, screen), frames)
+
+    print(f"Frames: {frames}")
+    print(f"{'legacy (alpha layers)':<24}{legacy * 1000:8.3f} ms/frame")
+    for quality in Background.QUALITY_GROUPS:
+        background.set_quality(quality)
+
+        def draw():
+            if not background.opaque:
+                screen.fill((135, 206, 235))
+            background.draw(screen)
+
+        elapsed = measure(background, draw, frames)
+        strips = len(background.strips)
+        label = f"{quality} ({strips} strip{'s' if strips > 1 else ''})"
+        print(f"{label:<24}{elapsed * 1000:8.3f} ms/frame"
+              f"  {legacy / elapsed:5.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
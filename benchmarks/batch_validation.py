@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Validate BatchSimulation against the scalar Simulation and measure throughput.
+
+Both engines play the same seeds with the same per-tick input streams; every
+game must end on the same tick with the same score, coins, death cause and
+powerups picked up. Two streams are checked: random inputs, which end most
+games within seconds, and the inputs reflex_policy chose in the scalar run,
+which survive long enough to pick up powerups.
+
+Usage:
+    python benchmarks/batch_validation.py [games] [max_ticks]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.batch_simulation import BatchSimulation, OBSTACLE_TYPES, POWERUP_DURATIONS
+from scenes.policies import reflex_policy
+from scenes.simulation import Simulation, TickInput
+
+
+def make_inputs(games, max_ticks, seed=0):
+    """Random but reproducible (jump, duck) streams, shape (max_ticks, games)"""
+    rng = np.random.default_rng(seed)
+    jump = rng.random((max_ticks, games)) < 0.04
+    duck = rng.random((max_ticks, games)) < 0.3
+    return jump, duck
+
+
+def replay_inputs(jump, duck):
+    """Scalar policy that plays back pre-generated streams"""
+    def policy(simulation, g):
+        tick = simulation.ticks
+        return TickInput(bool(jump[tick, g]), bool(duck[tick, g]))
+    return policy
+
+
+def run_scalar(seeds, policy, max_ticks):
+    """Play each seed with the scalar engine; returns the results and the (jump, duck) streams played"""
+    results = []
+    jump = np.zeros((max_ticks, len(seeds)), dtype=bool)
+    duck = np.zeros((max_ticks, len(seeds)), dtype=bool)
+    simulation = Simulation()
+    for g, seed in enumerate(seeds):
+        simulation.new_game(seed)
+        simulation.start()
+        while simulation.game_running and simulation.ticks < max_ticks:
+            tick = simulation.ticks
+            tick_input = policy(simulation, g)
+            jump[tick, g], duck[tick, g] = tick_input.jump, tick_input.duck
+            simulation.step(Simulation.FIXED_DELTA, tick_input)
+        results.append((simulation.ticks, simulation.score, simulation.token_score, simulation.death_cause,
+                        sum(simulation.powerups_used.values())))
+    return results, jump, duck
+
+
+def run_batch(seeds, jump, duck, max_ticks):
+    """Play every seed at once with the batch engine"""
+    batch = BatchSimulation(len(seeds))
+    batch.reset(seeds)
+    picked = np.zeros(len(seeds), dtype=np.int64)
+    start = time.perf_counter()
+    tick = 0
+    while batch.alive.any() and tick < max_ticks:
+        batch.step(jump[tick], duck[tick])
+        # A powerup timer only reads its full duration on the tick it was picked up
+        picked += (batch.powerups[:, 1:] == POWERUP_DURATIONS[1:]).sum(axis=1)
+        tick += 1
+    elapsed = time.perf_counter() - start
+    death_cause = [OBSTACLE_TYPES[cause] if cause >= 0 else None for cause in batch.death_cause.tolist()]
+    results = list(zip(batch.ticks.tolist(), batch.score.tolist(), batch.token_score.tolist(), death_cause,
+                       picked.tolist()))
+    return results, tick, elapsed
+
+
+def validate(name, seeds, policy, max_ticks):
+    """Play seeds with both engines; returns (mismatches, powerups picked up)"""
+    start = time.perf_counter()
+    scalar, jump, duck = run_scalar(seeds, policy, max_ticks)
+    scalar_elapsed = time.perf_counter() - start
+    batch, batch_steps, batch_elapsed = run_batch(seeds, jump, duck, max_ticks)
+
+    mismatches = [
+        (seed, s, b) for seed, s, b in zip(seeds, scalar, batch)
+        if s[0] != b[0] or s[2] != b[2] or abs(s[1] - b[1]) > 1e-9 or s[3] != b[3] or s[4] != b[4]
+    ]
+    game_ticks = sum(result[0] for result in scalar)
+    powerups = sum(result[4] for result in scalar)
+
+    print(f"{name} inputs")
+    print(f"  Games:          {len(seeds)}")
+    print(f"  Game ticks:     {game_ticks} ({game_ticks / len(seeds) / Simulation.TICK_RATE:.1f} s per game)")
+    print(f"  Powerups:       {powerups}")
+    # The scalar time includes choosing the inputs
+    print(f"  Scalar:         {game_ticks / scalar_elapsed:12.0f} game ticks/s")
+    print(f"  Batch:          {game_ticks / batch_elapsed:12.0f} game ticks/s ({batch_steps} steps)")
+    print(f"  Mismatches:     {len(mismatches)}")
+    for seed, s, b in mismatches[:10]:
+        print(f"    seed {seed}: scalar ticks={s[0]} score={s[1]:.3f} coins={s[2]} death={s[3]} powerups={s[4]} | "
+              f"batch ticks={b[0]} score={b[1]:.3f} coins={b[2]} death={b[3]} powerups={b[4]}")
+    return mismatches, powerups
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    max_ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+    seeds = list(range(1, games + 1))
+
+    failed = False
+    mismatches, _ = validate("Random", seeds, replay_inputs(*make_inputs(games, max_ticks)), max_ticks)
+    failed |= bool(mismatches)
+    mismatches, powerups = validate("Reflex", seeds, lambda simulation, g: reflex_policy(simulation), max_ticks)
+    failed |= bool(mismatches)
+    if not powerups:
+        print("No powerup was picked up; the reflex games did not exercise powerups")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for the sweep-and-prune collision broadphase.
+
+Fills an ObstacleManager and a TokenManager with hundreds of live objects
+and compares the x-sorted window queries used by find_collision,
+TokenManager.check_collision and is_safe_spawn_position against the old
+linear scans over every object. Both paths must give the same answers.
+
+Usage:
+    python benchmarks/broadphase.py [entities ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.dino import Dino
+from scenes.obstacles import ObstacleFactory, ObstacleManager
+from scenes.simulation import Simulation
+from scenes.tokens import Token, TokenManager
+
+SPACING = 60  # Pixels between entities; dense enough to keep several near the dino
+QUERIES = 2000
+
+
+def legacy_find_collision(obstacle_manager, dino):
+    """ObstacleManager.find_collision before the broadphase: scan every obstacle"""
+    dino_rect = dino.get_collision_rect()
+    for obstacle in obstacle_manager.obstacles:
+        if obstacle.rect and dino_rect.colliderect(obstacle.rect):
+            return obstacle
+    return None
+
+
+def legacy_token_hits(token_manager, dino):
+    """Token collision test before the broadphase: scan every token"""
+    return [token for token in token_manager.tokens if not token.collected and token.collides_with(dino)]
+
+
+def legacy_is_safe(token_manager, x, y, obstacle_manager):
+    """TokenManager.is_safe_spawn_position before the broadphase"""
+    token_rect = pygame.Rect(x - 20, y - 20, 40, 40)
+    for obstacle in obstacle_manager.obstacles:
+        if obstacle.rect:
+            safe_rect = obstacle.rect.inflate(token_manager.min_distance_from_obstacles * 2,
+                                              token_manager.vertical_safe_zone * 2)
+            if token_rect.colliderect(safe_rect):
+                return False
+    return True
+
+
+def populate(entities, ground_y):
+    """Managers holding `entities` obstacles and tokens spread ahead of and behind the dino"""
+    rng = random.Random(0)
+    obstacle_manager = ObstacleManager(1152, ground_y, rng)
+    token_manager = TokenManager(1152, ground_y, rng)
+    start_x = -entities * SPACING // 4
+    for i in range(entities):
+        x = start_x + i * SPACING
+        if rng.random() < 0.5:
+            obstacle = ObstacleFactory.create_bird(x, rng=rng)
+        else:
+            obstacle = ObstacleFactory.create_ground_obstacle(x, 0, rng=rng)
+            obstacle.position.y = ground_y - obstacle.rect.height // 2
+            obstacle.rect.centery = obstacle.position.y
+        obstacle_manager.obstacles.add(obstacle)
+    for i in range(entities):
+        # Out of order on purpose: tokens are inserted, not appended
+        x = start_x + rng.randrange(entities * SPACING)
+        token_manager.tokens.add(Token(x, rng.choice(token_manager.token_heights), "coin", rng=rng))
+    return obstacle_manager, token_manager
+
+
+def time_calls(calls):
+    """Seconds per call for a list of zero-argument callables"""
+    start = time.perf_counter()
+    for call in calls:
+        call()
+    return (time.perf_counter() - start) / len(calls)
+
+
+def measure(entities, dino, ground_y):
+    """Compare old and new query cost for one entity count; returns timings and mismatches"""
+    obstacle_manager, token_manager = populate(entities, ground_y)
+    rng = random.Random(1)
+    spawn_points = [(rng.uniform(0, entities * SPACING * 0.75), rng.choice(token_manager.token_heights))
+                    for _ in range(QUERIES)]
+
+    mismatches = 0
+    if legacy_find_collision(obstacle_manager, dino) is not obstacle_manager.find_collision(dino):
+        mismatches += 1
+    for x, y in spawn_points:
+        if legacy_is_safe(token_manager, x, y, obstacle_manager) != token_manager.is_safe_spawn_position(x, y, obstacle_manager):
+            mismatches += 1
+    expected_coins = len(legacy_token_hits(token_manager, dino))
+    coins, _ = token_manager.check_collision(dino)
+    if coins != expected_coins:
+        mismatches += 1
+
+    results = {
+        "find_collision": (
+            time_calls([lambda: legacy_find_collision(obstacle_manager, dino)] * QUERIES),
+            time_calls([lambda: obstacle_manager.find_collision(dino)] * QUERIES),
+        ),
+        "token collisions": (
+            time_calls([lambda: legacy_token_hits(token_manager, dino)] * QUERIES),
+            time_calls([lambda: token_manager.check_collision(dino)] * QUERIES),
+        ),
+        "is_safe_spawn_position": (
+            time_calls([lambda p=p: legacy_is_safe(token_manager, p[0], p[1], obstacle_manager) for p in spawn_points]),
+            time_calls([lambda p=p: token_manager.is_safe_spawn_position(p[0], p[1], obstacle_manager) for p in spawn_points]),
+        ),
+    }
+    return results, mismatches
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [50, 200, 500, 1000]
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    ground_y = Simulation().ground_y
+    dino = Dino(Simulation.DINO_START_POS[0], ground_y)
+    dino.state = "run"
+
+    total_mismatches = 0
+    print(f"{'entities':>8}  {'query':<24}{'linear':>10}{'sorted':>10}{'speedup':>9}")
+    for entities in counts:
+        results, mismatches = measure(entities, dino, ground_y)
+        total_mismatches += mismatches
+        for name, (before, after) in results.items():
+            print(f"{entities:>8}  {name:<24}{before * 1e6:>8.2f}us{after * 1e6:>8.2f}us{before / after:>8.1f}x")
+    print(f"Mismatches: {total_mismatches}")
+
+    pygame.quit()
+    return 1 if total_mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
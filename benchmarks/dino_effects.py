@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the dino's invincibility flash.
+
+Compares the old godmode draw (sprite.copy() and set_alpha() every frame,
+timed by the wall clock) against the precomputed half-opacity frames picked
+by game time, per frame. Reports the peak Python memory allocated by each
+draw; the pixel data of the old per-frame copy is allocated by SDL, outside
+tracemalloc, so it is listed separately.
+
+Usage:
+    python benchmarks/dino_effects.py [frames]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.assets import asset_cache
+from scenes.simulation import Simulation, NO_INPUT
+
+SCREEN_SIZE = (1152, 648)
+
+
+def legacy_draw(dino, screen, alpha):
+    """Dino.draw with is_invincible set, as it was before effect frames"""
+    render_rect = dino.get_render_rect(alpha)
+    flash_alpha = 128 if int(time.time() * 4) % 2 else 255
+    temp_sprite = dino.sprite.copy()
+    temp_sprite.set_alpha(flash_alpha)
+    screen.blit(temp_sprite, render_rect)
+
+
+def measure(simulation, draw, frames):
+    """Tick and draw frames; returns (seconds per draw, peak Python bytes allocated per draw)"""
+    draw_time = 0.0
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(frames):
+        simulation.step(simulation.FIXED_DELTA, NO_INPUT)
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        draw()
+        draw_time += time.perf_counter() - start
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return draw_time / frames, allocated
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 480
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    simulation = Simulation(*SCREEN_SIZE)
+    simulation.new_game(0)
+    simulation.start()
+    simulation.activate_powerup("godmode", frames / Simulation.TICK_RATE + 1.0, "godmode")
+    dino = simulation.dino
+    legacy = measure(simulation, lambda: legacy_draw(dino, screen, 0.5), frames)
+    effect = measure(simulation, lambda: dino.draw(screen, True, 0.5), frames)
+
+    print(f"Frames: {frames} (godmode active)")
+    print(f"{'':10}{'draw':>12}{'python':>14}{'pixels':>14}")
+    copied = asset_cache.surface_bytes(dino.sprite)
+    for label, (draw_time, allocated), pixels in (("legacy", legacy, copied), ("effect", effect, 0)):
+        print(f"{label:10}{draw_time * 1e6:>10.1f}us{allocated / frames:>10.0f} B/f{pixels:>10d} B/f")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the dirty-rectangle renderer.
+
+Measures draw-and-present time per frame on the start screen, during play
+and on the game over screen, with dirty rects on and with a full redraw and
+flip every frame. Also reports how many frames were skipped or partially
+presented and the average share of the window sent to the display.
+
+Usage:
+    python benchmarks/dirty_rects.py [frames]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.main_game import MainGame
+from scenes.policies import idle_policy, reflex_policy
+
+SEED = 7
+
+
+def play(game, policy, frames):
+    """Tick and draw frames; returns (seconds per frame, renderer stats, area share)"""
+    simulation = game.simulation
+    renderer = game.renderer
+    before = renderer.stats()
+    area = 0
+    draw_time = 0.0
+    for i in range(frames):
+        simulation.step(simulation.FIXED_DELTA, policy(simulation))
+        if simulation.game_running:
+            game.background.update(simulation.FIXED_DELTA, simulation.speed)
+        if any(event == "game_over" for event, _ in simulation.events):
+            game.game_over_screen.show()  # Without saving a high score
+        start = time.perf_counter()
+        game.draw((i % 4) / 4)
+        draw_time += time.perf_counter() - start
+        area += renderer.last_update_area
+    after = renderer.stats()
+    counts = {key: after[key] - before[key] for key in after}
+    return draw_time / frames, counts, area / (frames * game.screen_width * game.screen_height)
+
+
+def measure(dirty_rects, frames):
+    """Results per screen for one renderer setting"""
+    results = {}
+    game = MainGame(dirty_rects=dirty_rects, verbose=False)
+    game.simulation.new_game(SEED)
+    results["start screen"] = play(game, idle_policy, frames)
+
+    game.simulation.start()
+    game.hud.hide_start_label()
+    results["playing"] = play(game, reflex_policy, frames)
+
+    # Run into the next obstacle, then stay on the game over screen
+    while game.simulation.game_running:
+        play(game, idle_policy, 1)
+    results["game over"] = play(game, idle_policy, frames)
+    return results
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+
+    full = measure(False, frames)
+    dirty = measure(True, frames)
+    pygame.quit()
+
+    print(f"Frames per screen: {frames}")
+    print(f"{'':14}{'full redraw':>14}{'dirty rects':>14}{'speedup':>9}   frames full/partial/skipped, window share")
+    for screen, (full_time, _, _) in full.items():
+        dirty_time, counts, share = dirty[screen]
+        print(f"{screen:14}{full_time * 1000:>12.3f}ms{dirty_time * 1000:>12.3f}ms{full_time / dirty_time:>8.1f}x"
+              f"   {counts['full']}/{counts['partial']}/{counts['skipped']}, {share * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark for DinoEnv steps per second.
+
+Runs the Gym-style environment under SDL's dummy video driver in vector
+mode (rendering off) and pixel mode, and checks the documented vector-mode
+target of 20,000 steps per second.
+
+Usage:
+    python benchmarks/environment_steps.py [steps]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.environment import DinoEnv, ACTION_NONE, ACTION_JUMP, ACTION_DUCK
+
+VECTOR_TARGET = 20000  # steps/second, documented in DinoEnv
+
+
+def policy(observation):
+    """Jump or duck when the nearest obstacle is close (vector observations)"""
+    dx = observation[8]
+    if observation[12] and 0 < dx < 120:  # Bird ahead
+        return ACTION_DUCK
+    if observation[10] and 0 < dx < 120:
+        return ACTION_JUMP
+    return ACTION_NONE
+
+
+def measure(env, steps, use_policy):
+    """Step the environment, resetting on game over; returns steps/second"""
+    observation = env.reset(seed=0)
+    episode = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        action = policy(observation) if use_policy else ACTION_NONE
+        observation, reward, done, info = env.step(action)
+        if done:
+            episode += 1
+            observation = env.reset(seed=episode)
+    return steps / (time.perf_counter() - start)
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    vector_rate = measure(DinoEnv("vector"), steps, True)
+    pixel_rate = measure(DinoEnv("pixels"), max(steps // 20, 100), False)
+
+    print(f"Vector observations (render off): {vector_rate:10.0f} steps/s (target {VECTOR_TARGET})")
+    print(f"Pixel observations:               {pixel_rate:10.0f} steps/s")
+    return 0 if vector_rate >= VECTOR_TARGET else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
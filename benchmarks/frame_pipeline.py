@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the pipelined main loop (simulation on its own thread).
+
+Runs the real game loop, serial and pipelined, while a second thread
+presses and releases DOWN at random moments by posting key events. Each
+press is stamped with the time it was posted, so the game's latency
+tracker reports the full input-to-photon time: from the press to the end
+of the first present showing the tick that read it. The dino is kept
+invincible so the run never ends.
+
+Presenting is slowed down to stand in for a display that blocks (vsync,
+a slow driver or compositor), by a fixed delay per frame or by a long
+hitch once a second (a window drag, a quality switch). Besides latency the
+benchmark reports the longest gap between two simulation ticks: the serial
+loop cannot tick while a frame is stuck, the pipelined one keeps ticking.
+
+Usage:
+    python benchmarks/frame_pipeline.py [seconds per run]
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.main_game import MainGame
+
+SEED = 3
+# (name, extra seconds per present, seconds of one hitch every second)
+SCENARIOS = (
+    ("none", 0.0, 0.0),
+    ("8 ms", 0.008, 0.0),
+    ("16 ms", 0.016, 0.0),
+    ("100 ms/s", 0.0, 0.1),
+)
+PRESS_INTERVAL = (0.15, 0.35)  # Seconds between presses (uniform)
+HOLD_TIME = 0.08  # Seconds each press is held
+
+
+def slow_present(present, delay, hitch):
+    """A display function that blocks for delay seconds, and for hitch seconds once a second"""
+    next_hitch = [time.perf_counter() + 1.0]
+    def slowed(*args):
+        pause = delay
+        if hitch and time.perf_counter() >= next_hitch[0]:
+            pause += hitch
+            next_hitch[0] += 1.0
+        if pause:
+            time.sleep(pause)
+        return present(*args)
+    return slowed
+
+
+def press_keys(seconds):
+    """Post DOWN presses until the time is up, then quit the game"""
+    rng = random.Random(SEED)
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        time.sleep(rng.uniform(*PRESS_INTERVAL))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN, pressed_at=time.perf_counter()))
+        time.sleep(HOLD_TIME)
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_DOWN))
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def measure(pipelined, delay, hitch, seconds):
+    """Play for a while; returns (latency stats, frames per second, ticks per second, longest tick gap)"""
+    game = MainGame(pipelined=pipelined, verbose=False)
+    game.simulation.new_game(SEED)
+    game.simulation.start()
+    game.hud.hide_start_label()
+    game.simulation.activate_powerup("godmode", 1e9, "godmode")
+
+    # Time every tick, whichever thread runs it
+    tick_times = []
+    advance = game.advance
+    def timed_advance(delta_time):
+        tick_times.append(time.perf_counter())
+        advance(delta_time)
+    game.advance = timed_advance
+
+    flip, update = pygame.display.flip, pygame.display.update
+    pygame.display.flip = slow_present(flip, delay, hitch)
+    pygame.display.update = slow_present(update, delay, hitch)
+    renderer = game.renderer
+    presser = threading.Thread(target=press_keys, args=(seconds,), daemon=True)
+    start = time.perf_counter()
+    presser.start()
+    try:
+        game.run()
+    except SystemExit:
+        pass
+    finally:
+        pygame.display.flip, pygame.display.update = flip, update
+    elapsed = time.perf_counter() - start
+    presser.join()
+
+    frames = renderer.full_frames + renderer.partial_frames
+    gap = max(later - earlier for earlier, later in zip(tick_times, tick_times[1:]))
+    return game.latency.stats(), frames / elapsed, game.tick_count / elapsed, gap
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+
+    print(f"{seconds:.0f} s per run, a DOWN press every {PRESS_INTERVAL[0]}-{PRESS_INTERVAL[1]} s")
+    print(f"{'present delay':<15}{'loop':<11}{'latency mean':>13}{'p50':>9}{'p95':>9}{'max':>9}{'FPS':>6}{'ticks/s':>9}{'tick gap':>10}")
+    for name, delay, hitch in SCENARIOS:
+        for pipelined in (False, True):
+            latency, fps, tick_rate, gap = measure(pipelined, delay, hitch, seconds)
+            print(f"{name:<15}{'pipelined' if pipelined else 'serial':<11}"
+                  f"{latency['mean_ms']:>11.1f}ms{latency['p50_ms']:>7.1f}ms{latency['p95_ms']:>7.1f}ms{latency['max_ms']:>7.1f}ms"
+                  f"{fps:>6.0f}{tick_rate:>9.1f}{gap * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
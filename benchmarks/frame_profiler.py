@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the frame profiler's overhead.
+
+Plays the same seeded run (update and draw every frame) with the profiler
+off, timing phases, timing phases with the overlay shown, and recording a
+trace, and prints the time per frame of each. With the profiler off every
+section still in the game loop costs two attribute checks; the cost of one
+is measured on its own as well. Ends with the phase percentiles of the
+profiled run.
+
+Usage:
+    python benchmarks/frame_profiler.py [frames]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.main_game import MainGame
+from scenes.profiler import FrameProfiler
+from scenes.policies import reflex_policy
+
+SEED = 0
+REPEATS = 3  # Best of, to keep other load on the machine out of the numbers
+
+
+def play(game, frames):
+    """Seconds per frame of a seeded run, timed like the main loop"""
+    simulation = game.simulation
+    profiler = game.profiler
+    game.read_input = lambda: reflex_policy(simulation)
+    game.new_game()
+    simulation.new_game(SEED)
+    simulation.start()
+    game.hud.hide_start_label()
+    start = time.perf_counter()
+    for _ in range(frames):
+        profiler.begin_frame()
+        with profiler.section("events"):
+            game.handle_events()
+        game.update(simulation.FIXED_DELTA)
+        game.draw(0.5)
+        profiler.end_frame()
+        if not simulation.game_running:
+            simulation.new_game(SEED)
+            simulation.start()
+    return (time.perf_counter() - start) / frames
+
+
+def section_cost(count=1000000):
+    """Seconds to enter and leave one section of a profiler that is off"""
+    section = FrameProfiler().section("benchmark")
+    start = time.perf_counter()
+    for _ in range(count):
+        with section:
+            pass
+    empty_start = time.perf_counter()
+    for _ in range(count):
+        pass
+    end = time.perf_counter()
+    return ((empty_start - start) - (end - empty_start)) / count
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    trace_path = os.path.join(tempfile.gettempdir(), "dino_frame_trace.json")
+
+    game = MainGame(verbose=False)
+    profiler = game.profiler
+    play(game, frames)  # Warm up caches and atlases
+    results = {}
+    events = 0
+    # Modes take turns, so drift in machine load hits them all alike
+    for _ in range(REPEATS):
+        for label in ("off", "phases", "overlay", "trace"):
+            game.set_profiler_visible(label == "overlay")
+            profiler.set_enabled(label != "off")
+            if label == "trace":
+                game.trace_path = trace_path
+                game.toggle_trace()
+            seconds = play(game, frames)
+            results[label] = min(results.get(label, seconds), seconds)
+            if label == "trace":
+                events = len(profiler.trace)
+                game.toggle_trace()
+    profiler.set_enabled(True)
+    profiler.reset()
+    play(game, frames)
+    summary = profiler.summary()
+    pygame.quit()
+
+    sections_per_frame = sum(1 for _ in profiler.sections) + 1  # Each section runs about once a frame
+    print(f"Frames: {frames} (best of {REPEATS})")
+    print(f"Section with the profiler off: {section_cost() * 1e9:.0f} ns, "
+          f"{sections_per_frame} sections in the loop")
+    for label, seconds in results.items():
+        overhead = (seconds / results["off"] - 1.0) * 100
+        print(f"  {label:<8}{seconds * 1000:8.3f} ms/frame  {overhead:+6.1f}%")
+    print(f"Trace: {events} events for {frames} frames, written to {trace_path}")
+    print(f"{'phase':<20}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    for phase, values in summary.items():
+        print(f"{phase:<20}{values['p50_ms']:>9.3f}{values['p95_ms']:>9.3f}{values['p99_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
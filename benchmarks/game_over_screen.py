@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the game over screen.
+
+Compares the old per-frame path (translucent full-screen overlay blit and
+six shadowed text lines rendered with font.render) against the cached
+composite built on the first draw after show(), per frame.
+
+Usage:
+    python benchmarks/game_over_screen.py [frames]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.game_over import GameOver
+
+SCREEN_SIZE = (1152, 648)
+FINAL_SCORE = 54321
+HIGH_SCORE = 98765
+
+
+def legacy_draw(game_over, screen):
+    """GameOver.draw as it was before the composite was cached"""
+    screen.blit(game_over.overlay, (0, 0))
+    for text, font, x, y, color in game_over.layout(FINAL_SCORE, HIGH_SCORE):
+        screen.blit(font.render(text, True, game_over.shadow_color), (x + 3, y + 3))
+        screen.blit(font.render(text, True, color), (x, y))
+
+
+def measure(draw, frames):
+    """Average seconds per frame"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    screen.fill((60, 120, 90))
+    game_over = GameOver(*SCREEN_SIZE)
+
+    legacy = measure(lambda: legacy_draw(game_over, screen), frames)
+
+    game_over.show()
+    start = time.perf_counter()
+    game_over.draw(screen, FINAL_SCORE, HIGH_SCORE)
+    build = time.perf_counter() - start
+    cached = measure(lambda: game_over.draw(screen, FINAL_SCORE, HIGH_SCORE), frames)
+
+    print(f"Frames: {frames}")
+    print(f"legacy   {legacy * 1e6:8.1f}us/frame")
+    print(f"cached   {cached * 1e6:8.1f}us/frame  {legacy / cached:5.1f}x  (built once in {build * 1000:.2f}ms)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
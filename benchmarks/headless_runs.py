@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the display-free Simulation.
+
+Plays complete runs without a window, audio device or keyboard using a
+simple scripted policy and reports runs and ticks per second.
+
+Usage:
+    python benchmarks/headless_runs.py [runs]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.simulation import Simulation
+from scenes.policies import reflex_policy
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    simulation = Simulation()
+    start = time.perf_counter()
+    total_ticks = 0
+    for _ in range(runs):
+        total_ticks += simulation.run(reflex_policy, max_ticks=60 * 60 * 10)
+    elapsed = time.perf_counter() - start
+
+    print(f"Runs:          {runs}")
+    print(f"Average ticks: {total_ticks / runs:.1f}")
+    print(f"Runs/second:   {runs / elapsed:.1f}")
+    print(f"Ticks/second:  {total_ticks / elapsed:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the lookahead autopilot (LookaheadPolicy in scenes/policies.py).
+
+Plays the same seeded runs with reflex_policy and with the lookahead
+policy and compares how long they survive, then reports what the planner
+costs: decisions, searches and simulated fork ticks per second, how much
+faster than real time it still plays, the time of one decision (p50, p99
+and worst; searches are the slow ones, the 60 FPS frame budget is 16.7 ms)
+and the memory a search holds at its peak.
+
+Usage:
+    python benchmarks/lookahead_planner.py [runs] [--horizon S] [--budget TICKS] [--time-budget MS]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.policies import LookaheadPolicy, reflex_policy
+from scenes.profiler import FrameProfiler
+from scenes.simulation import Simulation
+
+MAX_SECONDS = 300
+ALLOCATION_TICKS = 20 * Simulation.TICK_RATE
+
+
+def survival(simulation, policy, seeds):
+    """Seconds survived per seed (runs are cut off at MAX_SECONDS)"""
+    max_ticks = MAX_SECONDS * Simulation.TICK_RATE
+    seconds = []
+    for seed in seeds:
+        seconds.append(simulation.run(policy, seed, max_ticks) / Simulation.TICK_RATE)
+    return seconds
+
+
+def timed_run(simulation, policy, seeds):
+    """Play the seeds timing every decision; returns (decision times, seconds taken, seconds survived per seed)"""
+    times = []
+    survived = []
+    clock = time.perf_counter
+    max_ticks = MAX_SECONDS * Simulation.TICK_RATE
+    start = clock()
+    for seed in seeds:
+        policy.reset(seed)
+        simulation.new_game(seed)
+        simulation.start()
+        while simulation.game_running and simulation.ticks < max_ticks:
+            begin = clock()
+            tick_input = policy(simulation)
+            times.append(clock() - begin)
+            simulation.step(simulation.FIXED_DELTA, tick_input)
+        survived.append(simulation.ticks / Simulation.TICK_RATE)
+    return times, clock() - start, survived
+
+
+def allocations(simulation, horizon, budget):
+    """Memory a search holds at its peak (mean and worst, bytes) over the first ALLOCATION_TICKS of a run"""
+    policy = LookaheadPolicy(horizon, budget)
+    simulation.new_game(0)
+    simulation.start()
+    policy(simulation)  # Builds the fork outside the measurement
+    peaks = []
+    tracemalloc.start()
+    while simulation.game_running and simulation.ticks < ALLOCATION_TICKS:
+        searches = policy.searches
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        tick_input = policy(simulation)
+        if policy.searches != searches:
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        simulation.step(simulation.FIXED_DELTA, tick_input)
+    tracemalloc.stop()
+    return sum(peaks) / max(len(peaks), 1), max(peaks, default=0), len(peaks)
+
+
+def summary(seconds):
+    return f"mean {sum(seconds) / len(seconds):6.1f}s  min {min(seconds):6.1f}s  max {max(seconds):6.1f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the lookahead autopilot")
+    parser.add_argument("runs", type=int, nargs="?", default=10)
+    parser.add_argument("--horizon", type=float, default=1.5, help="seconds the planner looks ahead")
+    parser.add_argument("--budget", type=int, default=1000, help="fork ticks per search")
+    parser.add_argument("--time-budget", type=float, help="milliseconds per search (none by default)")
+    args = parser.parse_args()
+    time_budget = args.time_budget / 1000 if args.time_budget is not None else None
+    seeds = range(args.runs)
+
+    simulation = Simulation()
+    reflex = survival(simulation, reflex_policy, seeds)
+    policy = LookaheadPolicy(args.horizon, args.budget, time_budget)
+    times, elapsed, lookahead = timed_run(simulation, policy, seeds)
+    mean_peak, worst_peak, searches = allocations(simulation, args.horizon, args.budget)
+
+    print(f"{args.runs} runs (cut off at {MAX_SECONDS}s), horizon {args.horizon}s, budget {args.budget} ticks"
+          f"{f', {args.time_budget} ms' if time_budget is not None else ''}")
+    print(f"  reflex     {summary(reflex)}")
+    print(f"  lookahead  {summary(lookahead)}")
+    ticks = len(times)
+    print(f"Planner: {policy.decisions / elapsed:,.0f} decisions/s ({ticks / elapsed / Simulation.TICK_RATE:.0f}x real time), "
+          f"{policy.searches / elapsed:,.0f} searches/s, {policy.fork_ticks / elapsed:,.0f} fork ticks/s")
+    print(f"  {policy.searches / ticks * 100:.1f}% of ticks search, {policy.fork_ticks / max(policy.searches, 1):.0f} fork ticks "
+          f"and {policy.forks / max(policy.searches, 1):.1f} restores per search, {policy.exhausted} out of budget, {policy.timeouts} out of time")
+    p50, p99 = FrameProfiler.percentiles(times, (50, 99))
+    print(f"  decision p50 {p50 * 1000:.3f} ms  p99 {p99 * 1000:.2f} ms  worst {max(times) * 1000:.1f} ms")
+    print(f"  search peak memory mean {mean_peak / 1024:.1f} KiB, worst {worst_peak / 1024:.1f} KiB ({searches} searches)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the low-resolution render target.
+
+Plays the same seeded run in both render paths and compares draw time per
+frame and cached sprite memory:
+
+    full     every sprite pre-scaled to window size and blitted at 1152x648
+    low-res  unscaled sprites drawn to a 384x216 scene, upscaled once per frame
+
+Usage:
+    python benchmarks/low_res_render.py [frames]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.assets import asset_cache
+from scenes.main_game import MainGame
+from scenes.policies import reflex_policy
+
+
+def measure(low_res, frames):
+    """Draw frames of a seeded run; returns (seconds per frame, sprite bytes)"""
+    game = MainGame(low_res=low_res, verbose=False)
+    simulation = game.simulation
+    seed = 0
+    simulation.new_game(seed)
+    simulation.start()
+    draw_time = 0.0
+    for _ in range(frames):
+        if not simulation.game_running:
+            seed += 1
+            simulation.new_game(seed)
+            simulation.start()
+        simulation.step(simulation.FIXED_DELTA, reflex_policy(simulation))
+        game.background.update(simulation.FIXED_DELTA, simulation.speed)
+        start = time.perf_counter()
+        game.draw(0.5)
+        draw_time += time.perf_counter() - start
+    return draw_time / frames, asset_cache.bytes
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+
+    full_time, full_bytes = measure(False, frames)
+    low_time, low_bytes = measure(True, frames)
+    pygame.quit()
+
+    print(f"Frames: {frames}")
+    print(f"{'':10}{'draw':>12}{'sprites':>12}")
+    print(f"{'full':10}{full_time * 1000:>10.2f}ms{full_bytes / 1e6:>10.1f}MB")
+    print(f"{'low-res':10}{low_time * 1000:>10.2f}ms{low_bytes / 1e6:>10.1f}MB")
+    print(f"Draw speedup {full_time / low_time:.1f}x, sprite memory {full_bytes / low_bytes:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
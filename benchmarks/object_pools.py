@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Check that steady-state play does not allocate obstacles or tokens.
+
+Prewarms the obstacle and token pools the way MainGame does, then plays
+seeded runs and reports how many objects each pool still had to create
+(should be 0) next to how many it recycled. Without prewarming, the pools
+fill up during the first runs; that is reported too.
+
+The pool counters only count game objects, so the Python memory each tick
+still allocates (tracemalloc: the peak above the tick's starting point,
+which includes objects freed again within the tick) is reported as well,
+for running ticks and for ticks that spawn, collect or collide with
+nothing.
+
+Usage:
+    python benchmarks/object_pools.py [runs]
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.simulation import Simulation
+from scenes.policies import reflex_policy
+
+MAX_TICKS = 60 * 60 * 5
+ALLOCATION_TICKS = 3000
+
+
+def play(simulation, runs):
+    """Play seeded runs; returns (ticks, seconds)"""
+    start = time.perf_counter()
+    ticks = 0
+    for seed in range(runs):
+        ticks += simulation.run(reflex_policy, seed, MAX_TICKS)
+    return ticks, time.perf_counter() - start
+
+
+def report(label, simulation, ticks, elapsed):
+    """Print pool counters; returns the number of objects created during play"""
+    print(f"{label}: {ticks} ticks, {ticks / elapsed:.0f} ticks/s")
+    created = 0
+    pools = (("obstacles", simulation.obstacle_manager.pool), ("tokens", simulation.token_manager.pool))
+    for name, pool in pools:
+        stats = pool.stats()
+        created += stats["created"]
+        print(f"  {name:<10} prewarmed {stats['prewarmed']:3d}, created {stats['created']:3d} "
+              f"({stats['created'] * 1000 / ticks:.3f} per 1000 ticks), reused {stats['reused']:6d}")
+    return created
+
+
+def measure_allocations(simulation, ticks):
+    """(mean peak bytes allocated per running tick, the same for quiet ticks, quiet tick count, bytes still held)
+
+    Quiet ticks are those on which no obstacle or token was spawned,
+    recycled or collected and no event fired.
+    """
+    total_bytes = quiet_bytes = quiet = 0
+    pools = (simulation.obstacle_manager.pool, simulation.token_manager.pool)
+    seed = 0
+    simulation.new_game(seed)
+    simulation.start()
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for _ in range(ticks):
+        if not simulation.game_running:
+            seed += 1
+            simulation.new_game(seed)
+            simulation.start()
+        tick_input = reflex_policy(simulation)
+        counts = [(pool.reused, pool.created, pool.released) for pool in pools]
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        simulation.step(simulation.FIXED_DELTA, tick_input)
+        allocated = tracemalloc.get_traced_memory()[1] - before
+        total_bytes += allocated
+        if not simulation.events and counts == [(pool.reused, pool.created, pool.released) for pool in pools]:
+            quiet_bytes += allocated
+            quiet += 1
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return total_bytes / ticks, quiet_bytes / max(quiet, 1), quiet, held
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    cold = Simulation()
+    cold_result = play(cold, runs)
+    warm = Simulation()
+    warm.obstacle_manager.prewarm()
+    warm.token_manager.prewarm()
+    warm_result = play(warm, runs)
+
+    print(f"Runs: {runs}")
+    report("Without prewarm", cold, *cold_result)
+    created = report("With prewarm", warm, *warm_result)
+    mean_bytes, quiet_bytes, quiet, held = measure_allocations(warm, ALLOCATION_TICKS)
+    print(f"Python allocation per running tick (tracemalloc peak): {mean_bytes:.0f} B mean, "
+          f"{quiet_bytes:.0f} B on the {quiet} of {ALLOCATION_TICKS} ticks with no spawn, pickup or event; "
+          f"{held} B still held after them")
+    return 0 if created == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the adaptive quality levels and their governor.
+
+First measures the draw time per frame of a seeded run at every quality
+level. Then replays those costs through QualityGovernor on a simulated
+machine that has room to spare, becomes too slow for the "high" level
+(another program starts), then recovers, with frame-to-frame noise, and
+prints every level change. The simulated load is given relative to the
+frame budget and only the measured ratios between levels are kept, so the
+scenario is the same on any machine. A well-behaved governor steps down
+quickly, comes back up slowly and does not flip back and forth; the
+benchmark fails if it does not step down and back up, or if it changes
+direction within a phase.
+
+Usage:
+    python benchmarks/quality_governor.py [frames]
+"""
+
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.main_game import MainGame
+from scenes.policies import reflex_policy
+from scenes.quality import QualityGovernor, QUALITY_LEVELS
+
+# Simulated machine: (seconds, cost of a "high" frame as a multiple of the frame budget)
+LOAD_PHASES = ((20.0, 0.3), (40.0, 1.5), (60.0, 0.3))
+NOISE = 0.25  # Frame times vary by up to +-25%
+
+
+def level_costs(frames):
+    """Seconds per drawn frame at each quality level"""
+    costs = []
+    game = MainGame(adaptive_quality=True, verbose=False)
+    simulation = game.simulation
+    for index in range(len(QUALITY_LEVELS)):
+        game.governor.set_level(index)
+        simulation.new_game(0)
+        simulation.start()
+        draw_time = 0.0
+        for _ in range(frames):
+            if not simulation.game_running:
+                simulation.new_game(0)
+                simulation.start()
+            simulation.step(simulation.FIXED_DELTA, reflex_policy(simulation))
+            game.background.update(simulation.FIXED_DELTA, simulation.speed)
+            start = time.perf_counter()
+            game.draw(0.5)
+            draw_time += time.perf_counter() - start
+        costs.append(draw_time / frames)
+    return costs
+
+
+def trace(costs, target_fps):
+    """Run the governor over the simulated load; returns [(time, phase, old index, new index)] changes"""
+    rng = random.Random(0)
+    budget = 1.0 / target_fps
+    relative = [cost / costs[0] for cost in costs]
+    governor = QualityGovernor(lambda level: None, target_fps)
+    changes = []
+    now = 0.0
+    for phase, (duration, load) in enumerate(LOAD_PHASES):
+        end = now + duration
+        while now < end:
+            work = budget * load * relative[governor.index] * rng.uniform(1.0 - NOISE, 1.0 + NOISE)
+            elapsed = max(work, budget)  # Frame limiter sleeps the rest of the frame
+            now += elapsed
+            old = governor.index
+            if governor.record(work, elapsed):
+                changes.append((now, phase, old, governor.index))
+    return changes
+
+
+def problems(changes):
+    """What the governor did wrong over the simulated load"""
+    found = []
+    if not any(new > old for _, _, old, new in changes):
+        found.append("never stepped down")
+    if not any(new < old for _, _, old, new in changes):
+        found.append("never stepped back up")
+    for phase in range(len(LOAD_PHASES)):
+        directions = {new > old for _, changed_phase, old, new in changes if changed_phase == phase}
+        if len(directions) > 1:
+            found.append(f"oscillated in phase {phase}")
+    return found
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    costs = level_costs(frames)
+    pygame.quit()
+
+    print(f"Draw time per frame ({frames} frames per level):")
+    for level, cost in zip(QUALITY_LEVELS, costs):
+        print(f"  {level.name:<8}{cost * 1000:8.3f} ms")
+
+    target_fps = MainGame.TARGET_FPS
+    changes = trace(costs, target_fps)
+    print(f"Governor on a simulated machine (phases {LOAD_PHASES}, target {target_fps} FPS):")
+    for when, _, _, index in changes:
+        print(f"  {when:6.1f}s -> {QUALITY_LEVELS[index].name}")
+    print(f"  {len(changes)} level changes")
+    found = problems(changes)
+    for problem in found:
+        print(f"  Governor {problem}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for replays: file size, headless fast-forward and seeking.
+
+Size: records 10-minute sessions of the reflex policy. It rarely lives that
+long, so the dino is kept invincible; the input stream still has the
+density of real play, which is all the size depends on (such a replay does
+not verify, as the simulation that plays it back can die).
+
+Fast-forward: records real reflex runs and re-simulates them headless with
+scenes.replay.simulate(), checking every result, and reports how much
+faster than real time that is.
+
+Seeking: seeks a ReplayPlayer to random points of the longest run, with
+keyframes every ReplayPlayer.KEYFRAME_INTERVAL seconds (after one pass
+through the run has kept them) and with a single keyframe at the start.
+
+Usage:
+    python benchmarks/replay_playback.py [runs]
+"""
+
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.simulation import Simulation
+from scenes.policies import reflex_policy
+from scenes.replay import ReplayPlayer, ReplayRecorder, simulate
+
+SESSION_SECONDS = 600
+SEEKS = 200
+
+
+def record(simulation, seed, max_ticks, invincible=False):
+    """Play one reflex run and return its Replay"""
+    recorder = ReplayRecorder()
+    simulation.new_game(seed)
+    simulation.start()
+    while simulation.game_running and simulation.ticks < max_ticks:
+        if invincible:
+            simulation.is_invincible = True  # Again after every godmode powerup expires
+        tick_input = reflex_policy(simulation)
+        simulation.step(simulation.FIXED_DELTA, tick_input)
+        recorder.record(simulation, tick_input)
+    recorder.replay.set_result(simulation)
+    return recorder.replay
+
+
+def seek_time(replay, keyframes):
+    """Mean seconds per seek to a random tick"""
+    player = ReplayPlayer(replay, Simulation())
+    if not keyframes:
+        player.keyframe_ticks = replay.ticks + 1  # Only the keyframe at tick 0
+    player.start()
+    player.seek(replay.ticks)  # One pass keeps every keyframe
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(SEEKS):
+        player.seek(rng.randrange(replay.ticks))
+    return (time.perf_counter() - start) / SEEKS
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    simulation = Simulation()
+    sizes = [len(record(simulation, seed, SESSION_SECONDS * Simulation.TICK_RATE, invincible=True).to_bytes())
+             for seed in range(3)]
+    replays = [record(simulation, seed, 60 * 60 * 10) for seed in range(runs)]
+
+    start = time.perf_counter()
+    mismatches = sum(not replay.matches(simulate(replay, simulation)) for replay in replays)
+    elapsed = time.perf_counter() - start
+    ticks = sum(replay.ticks for replay in replays)
+    total_bytes = sum(len(replay.to_bytes()) for replay in replays)
+
+    print(f"{SESSION_SECONDS // 60}-minute session: {min(sizes)}-{max(sizes)} bytes")
+    print(f"{runs} reflex runs: {ticks / Simulation.TICK_RATE / 60:.1f} minutes of play in {total_bytes} bytes "
+          f"({total_bytes / (ticks / Simulation.TICK_RATE / 60):.0f} bytes/minute)")
+    print(f"Fast-forward: {ticks / elapsed:.0f} ticks/s, {ticks / Simulation.TICK_RATE / elapsed:.0f}x real time, "
+          f"{mismatches} mismatches")
+
+    longest = max(replays, key=lambda replay: replay.ticks)
+    print(f"Seek in a {longest.duration:.0f}s run ({SEEKS} random seeks):")
+    print(f"  keyframes every {ReplayPlayer.KEYFRAME_INTERVAL:.0f}s  {seek_time(longest, True) * 1000:7.2f} ms")
+    print(f"  from the start            {seek_time(longest, False) * 1000:7.2f} ms")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the replay verification service (tools/verify_replays.py).
+
+Records reflex runs, writes them to a temporary queue with every
+TAMPER_EVERY-th replay claiming a higher score than it earned, runs the
+service over it with --once and checks that exactly the tampered replays
+were rejected. The service's own report gives the throughput
+(replays/min) and how much faster than real time it simulated.
+
+Usage:
+    python benchmarks/replay_verification.py [replays] [--workers N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from scenes.simulation import Simulation
+from scenes.policies import reflex_policy
+from scenes.replay import ReplayRecorder
+
+TAMPER_EVERY = 10
+MAX_TICKS = 60 * 60 * 10
+
+
+def record(simulation, seed):
+    """Play one reflex run and return its Replay"""
+    recorder = ReplayRecorder()
+    simulation.new_game(seed)
+    simulation.start()
+    while simulation.game_running and simulation.ticks < MAX_TICKS:
+        tick_input = reflex_policy(simulation)
+        simulation.step(simulation.FIXED_DELTA, tick_input)
+        recorder.record(simulation, tick_input)
+    recorder.replay.set_result(simulation)
+    return recorder.replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the replay verification service")
+    parser.add_argument("replays", type=int, nargs="?", default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as queue:
+        incoming = os.path.join(queue, "incoming")
+        os.makedirs(incoming)
+        simulation = Simulation()
+        tampered = set()
+        for seed in range(args.replays):
+            replay = record(simulation, seed)
+            name = f"{seed:06d}.replay"
+            if seed % TAMPER_EVERY == TAMPER_EVERY - 1:
+                replay.score += 1000
+                tampered.add(name)
+            replay.save(os.path.join(incoming, name))
+
+        print(f"Verifying {args.replays} replays ({len(tampered)} tampered) with {args.workers} worker(s), "
+              f"{os.cpu_count()} CPU(s)")
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, os.path.join(ROOT, "tools", "verify_replays.py"), queue, "--once",
+                                 "--workers", str(args.workers)], stdout=subprocess.PIPE, text=True)
+        elapsed = time.perf_counter() - start
+        print(result.stdout.strip().splitlines()[-1])
+        print(f"Wall time with start-up: {elapsed:.2f}s, {args.replays / elapsed * 60:.0f} replays/min")
+
+        rejected = set(os.listdir(os.path.join(queue, "rejected")))
+        accepted = len(os.listdir(os.path.join(queue, "accepted")))
+        wrong = rejected ^ tampered
+        print(f"{accepted} accepted, {len(rejected)} rejected, {len(wrong)} wrongly judged")
+    return 1 if wrong or result.returncode else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the run history (RunStore in scenes/run_store.py).
+
+Fills a temporary database with synthetic runs spread over a year through
+RunStore.record(), reporting what a call costs the game thread and how
+many runs a second the writer thread stores. For comparison, a run is then
+written the old way: a synchronous insert and commit in the calling thread.
+Finally times the leaderboard queries (top 10 overall, of one day and with
+assisted runs, the best score, a month of daily summaries) with their SQLite
+query plans.
+
+Usage:
+    python benchmarks/run_store.py [runs]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.run_store import INSERT, RunRecord, RunStore, day_of
+
+SEED = 1
+DAYS = 365
+CAUSES = ("rock", "stump", "barrel", "bird")
+POWERUPS = ((), (("doublegold", 1),), (("halfspeed", 1),), (("godmode", 1), ("doublegold", 2)))
+QUERY_REPEATS = 1000  # Summaries read every run of their days and repeat less
+
+
+def synthetic_runs(count, now):
+    rng = random.Random(SEED)
+    for _ in range(count):
+        duration = rng.expovariate(1 / 40)
+        yield RunRecord(now - rng.random() * DAYS * 86400, int(duration * 300 + rng.random() * 100), int(duration / 4),
+                        duration, rng.choice(CAUSES), rng.choice(POWERUPS), rng.getrandbits(32), rng.random() < 0.05)
+
+
+def per_call(function, repeats=QUERY_REPEATS):
+    """Milliseconds per call, best of three batches"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / repeats * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    now = time.time()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "runs.db")
+        store = RunStore(path)
+        runs = list(synthetic_runs(count, now))
+
+        start = time.perf_counter()
+        for run in runs:
+            store.record(run)
+        queued = time.perf_counter() - start
+        store.flush()
+        written = time.perf_counter() - start
+        print(f"{count:,} runs: record() {queued / count * 1e6:.2f} us per call on the game thread, "
+              f"writer stored {count / written:,.0f} runs/s in {store.writes:,} transactions")
+        print(f"Database: {os.path.getsize(path) / 2**20:.0f} MiB (+{os.path.getsize(path + '-wal') / 2**20:.0f} MiB WAL)")
+
+        connection = store.connection
+        run = runs[0]
+        start = time.perf_counter()
+        for _ in range(100):
+            with connection:
+                connection.execute(INSERT, (day_of(run.ended_at), run.ended_at, run.score, run.coins, run.duration,
+                                            run.death_cause, "", run.seed, 0))
+        print(f"Synchronous insert and commit: {(time.perf_counter() - start) / 100 * 1000:.2f} ms per run")
+
+        today = day_of(now)
+        month_ago = day_of(now - 30 * 86400)
+        queries = (
+            ("top(10)", lambda: store.top(10), QUERY_REPEATS, "SELECT * FROM runs WHERE assisted = 0 ORDER BY score DESC LIMIT 10"),
+            ("top(10, day)", lambda: store.top(10, today), QUERY_REPEATS,
+             f"SELECT * FROM runs WHERE day = '{today}' AND assisted = 0 ORDER BY score DESC LIMIT 10"),
+            ("top(10, assisted)", lambda: store.top(10, assisted=True), QUERY_REPEATS,
+             "SELECT * FROM (SELECT * FROM runs WHERE assisted = 0 ORDER BY score DESC LIMIT 10) UNION ALL "
+             "SELECT * FROM (SELECT * FROM runs WHERE assisted = 1 ORDER BY score DESC LIMIT 10) ORDER BY score DESC LIMIT 10"),
+            ("best_score()", store.best_score, QUERY_REPEATS, "SELECT MAX(score) FROM runs WHERE assisted = 0"),
+            ("daily(30 days)", lambda: store.daily(month_ago, today), 5,
+             f"SELECT day, COUNT(*), MAX(score), SUM(coins) FROM runs WHERE day BETWEEN '{month_ago}' AND '{today}' GROUP BY day"),
+        )
+        for name, function, repeats, sql in queries:
+            plan = "; ".join(row[-1] for row in connection.execute("EXPLAIN QUERY PLAN " + sql))
+            print(f"  {name:17s} {per_call(function, repeats):8.3f} ms   ({plan})")
+        best = store.top(1)[0]
+        print(f"Best run: score {best.score}, {best.duration:.0f}s, {best.coins} coins, {best.death_cause}")
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
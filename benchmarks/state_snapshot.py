@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark for game state snapshots and the rewind buffer.
+
+Snapshot and restore: times Simulation.save_state()/restore_state() and
+MainGame.save_state()/restore_state() (simulation plus background scroll)
+in microseconds, one second and one minute into a run.
+Restores are timed both to the tick before (the objects on screen are
+the same, as when rewinding or searching ahead) and to a state two seconds
+away (objects come from and go back to the pools).
+
+Rewind: plays the same ticks of the minute-old run through MainGame with
+and without filling the rewind buffer (restoring a saved state before each
+pass) and reports the cost per tick, then the memory a full buffer
+(MainGame.REWIND_SECONDS of states) holds.
+
+Usage:
+    python benchmarks/state_snapshot.py
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.main_game import MainGame
+from scenes.policies import reflex_policy
+from scenes.simulation import Simulation
+
+SEED = 11
+REPEATS = 20000
+FAR_TICKS = 2 * Simulation.TICK_RATE
+SCENARIOS = (("1s into a run", 1), ("60s into a run", 60))
+
+
+def per_call(function, argument=None):
+    """Microseconds per call, best of three batches"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        if argument is None:
+            for _ in range(REPEATS):
+                function()
+        else:
+            for _ in range(REPEATS):
+                function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best / REPEATS * 1e6
+
+
+def start_run(game, seconds):
+    """Play the first seconds of a seeded run"""
+    simulation = game.simulation
+    simulation.new_game(SEED)
+    simulation.start()
+    game.hud.hide_start_label()
+    play(game, seconds * Simulation.TICK_RATE - FAR_TICKS)
+
+
+def new_game():
+    return MainGame(verbose=False)
+
+
+def play(game, ticks):
+    simulation = game.simulation
+    game.read_input = lambda: reflex_policy(simulation)
+    for _ in range(ticks):
+        simulation.is_invincible = True  # Again after every godmode powerup expires
+        game.advance(simulation.FIXED_DELTA)
+
+
+def snapshot_costs(name, seconds):
+    game = new_game()
+    start_run(game, seconds)
+    simulation = game.simulation
+    far = simulation.save_state()
+    play(game, FAR_TICKS - 1)
+    near = simulation.save_state()
+    game_near = game.save_state()
+    play(game, 1)
+    print(f"{name} ({len(simulation.obstacle_manager.obstacles)} obstacles, {len(simulation.token_manager.tokens)} tokens):")
+    print(f"  Simulation.save_state      {per_call(simulation.save_state):7.1f} us")
+    print(f"  Simulation.restore (near)  {per_call(simulation.restore_state, near):7.1f} us")
+    print(f"  Simulation.restore (far)   {per_call(lambda: (simulation.restore_state(far), simulation.restore_state(near))) / 2:7.1f} us")
+    print(f"  MainGame.save_state        {per_call(game.save_state):7.1f} us")
+    print(f"  MainGame.restore (near)    {per_call(game.restore_state, game_near):7.1f} us")
+
+
+def rewind_costs(seconds):
+    game = new_game()
+    start_run(game, seconds)
+    start = game.save_state()
+    ticks = game.rewind.capacity
+    timings = {}
+    for rewind in (False, True, False, True):
+        game.restore_state(start)
+        game.rewind.clear()
+        push = game.rewind.push
+        if not rewind:
+            game.rewind.push = lambda state: None
+        begin = time.perf_counter()
+        play(game, ticks)
+        elapsed = (time.perf_counter() - begin) / ticks * 1e6
+        timings[rewind] = min(timings.get(rewind, elapsed), elapsed)
+        game.rewind.push = push
+    print(f"Tick with the rewind buffer: {timings[True]:.1f} us, without: {timings[False]:.1f} us "
+          f"(+{timings[True] - timings[False]:.1f} us)")
+
+    # Memory held by a full buffer: traced while it fills, freed by clear()
+    game.restore_state(start)
+    game.rewind.clear()
+    gc.collect()
+    tracemalloc.start()
+    play(game, ticks)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    rng_states = len({id(state.simulation.rng_state) for state in game.rewind.states})
+    game.rewind.clear()
+    gc.collect()
+    held -= tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"Full rewind buffer ({game.rewind.capacity} states, {MainGame.REWIND_SECONDS:.0f}s): {held / 1024:.0f} KiB, "
+          f"{held / game.rewind.capacity:.0f} B/state, {rng_states} distinct rng states")
+
+
+def main():
+    for name, seconds in SCENARIOS:
+        snapshot_costs(name, seconds)
+    rewind_costs(SCENARIOS[-1][1])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark suite with seeded scenarios and regression thresholds.
+
+Plays each scenario through MainGame under SDL's dummy video and audio
+drivers, one simulation tick and one drawn frame at a time, and reports the
+update, draw and whole-frame time distributions (mean, p50, p95, p99, max)
+and the Python memory allocated per frame. Scenarios:
+
+    idle       start screen, nothing running
+    early      the first seconds of a run at start speed
+    max_speed  a run at Simulation.MAX_SPEED
+    powerups   doublegold, halfspeed and godmode active at once
+    stress     obstacles and tokens spawned several times as densely
+
+Every scenario is seeded and driven by the same scripted policy, so two
+runs do the same work. Timings are taken without tracemalloc; allocations
+are counted in a separate, shorter pass with it on. Each scenario runs
+REPEATS times and the repeat with the lowest median frame time is kept.
+
+--save writes the results as a JSON baseline. --check compares against it
+and exits with 1 when a checked metric of any scenario is worse than the
+baseline by more than --threshold (relative, with an absolute slack so
+near-zero values do not trip on noise). Baselines only mean something on
+the machine that recorded them; the machine is stored with the results
+and a mismatch is reported.
+
+Usage:
+    python benchmarks/suite.py [--frames N] [--scenario NAME ...]
+    python benchmarks/suite.py --save [--baseline FILE]
+    python benchmarks/suite.py --check [--baseline FILE] [--threshold 0.25]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.main_game import MainGame
+from scenes.profiler import FrameProfiler
+from scenes.policies import idle_policy, reflex_policy
+from scenes.simulation import Simulation
+
+SEED = 11
+WARMUP = 120  # Frames played before measuring (pools, caches, glyphs)
+FRAMES = 600
+ALLOCATION_FRAMES = 200
+REPEATS = 3
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# Metrics compared by --check: name -> absolute slack in the metric's unit
+CHECKED_METRICS = {
+    "frame_p50_ms": 0.05,
+    "frame_p95_ms": 0.1,
+    "update_p50_ms": 0.02,
+    "draw_p50_ms": 0.05,
+    "alloc_bytes_per_frame": 512,
+}
+
+# Score at which the base speed reaches MAX_SPEED
+MAX_SPEED_SCORE = (Simulation.MAX_SPEED - Simulation.START_SPEED) * Simulation.SPEED_MODIFIER
+
+
+def setup_idle(game):
+    """Start screen: the dino idles, nothing scrolls"""
+    game.simulation.new_game(SEED)
+    return idle_policy
+
+
+def start_run(game, score=0):
+    simulation = game.simulation
+    simulation.new_game(SEED)
+    simulation.start()
+    simulation.score = score
+    game.hud.hide_start_label()
+
+
+def setup_early(game):
+    start_run(game)
+    return reflex_policy
+
+
+def setup_max_speed(game):
+    start_run(game, MAX_SPEED_SCORE)
+    # Invincible without the godmode powerup, so no flash and no powerup HUD line
+    game.simulation.is_invincible = True
+    return reflex_policy
+
+
+def setup_powerups(game):
+    start_run(game, 1500)
+    for effect in ("doublegold", "halfspeed", "godmode"):
+        game.simulation.activate_powerup(effect, 1e9, effect)
+    return reflex_policy
+
+
+def setup_stress(game):
+    simulation = game.simulation
+    obstacles = simulation.obstacle_manager
+    obstacles.min_group_spacing = obstacles.max_group_spacing = 90
+    tokens = simulation.token_manager
+    tokens.min_spawn_interval = tokens.max_spawn_interval = 0.15
+    tokens.min_powerup_interval = tokens.max_powerup_interval = 0.5
+    tokens.min_distance_from_obstacles = 0  # Otherwise most spawns find no room between the obstacles
+    start_run(game, MAX_SPEED_SCORE)
+    simulation.is_invincible = True
+    return reflex_policy
+
+
+SCENARIOS = {
+    "idle": setup_idle,
+    "early": setup_early,
+    "max_speed": setup_max_speed,
+    "powerups": setup_powerups,
+    "stress": setup_stress,
+}
+
+
+def play(game, policy, frames, on_frame=None):
+    """Tick and draw frames; returns (update seconds, draw seconds) per frame"""
+    simulation = game.simulation
+    game.read_input = lambda: policy(simulation)
+    tick = simulation.FIXED_DELTA
+    update_times = []
+    draw_times = []
+    for i in range(frames):
+        start = time.perf_counter()
+        game.advance(tick)
+        updated = time.perf_counter()
+        game.draw((i % 4) / 4)
+        end = time.perf_counter()
+        update_times.append(updated - start)
+        draw_times.append(end - updated)
+        if on_frame:
+            on_frame()
+        if not simulation.game_running and simulation.game_ended:
+            # A death in a timed scenario: play on from the same state
+            start_run(game, simulation.score)
+    return update_times, draw_times
+
+
+def measure_allocations(game, policy, frames):
+    """Peak Python bytes allocated per frame, and blocks still held per frame at the end"""
+    allocated = []
+    gc.collect()
+    tracemalloc.start()
+    before = sys.getallocatedblocks()
+
+    def frame_start():
+        tracemalloc.reset_peak()
+        frame_start.before = tracemalloc.get_traced_memory()[0]
+
+    def frame_end():
+        allocated.append(tracemalloc.get_traced_memory()[1] - frame_start.before)
+        frame_start()
+
+    frame_start()
+    play(game, policy, frames, frame_end)
+    tracemalloc.stop()
+    gc.collect()
+    held = sys.getallocatedblocks() - before
+    return sum(allocated) / frames, held / frames
+
+
+def distribution(prefix, samples):
+    p50, p95, p99 = FrameProfiler.percentiles(samples, (50, 95, 99))
+    return {
+        f"{prefix}_mean_ms": round(sum(samples) / len(samples) * 1000, 4),
+        f"{prefix}_p50_ms": round(p50 * 1000, 4),
+        f"{prefix}_p95_ms": round(p95 * 1000, 4),
+        f"{prefix}_p99_ms": round(p99 * 1000, 4),
+        f"{prefix}_max_ms": round(max(samples) * 1000, 4),
+    }
+
+
+def run_scenario(name, frames):
+    """Results dict of one scenario"""
+    best = None
+    for _ in range(REPEATS):
+        game = MainGame(verbose=False)
+        game.high_score = 0  # The saved high score would change the HUD text
+        policy = SCENARIOS[name](game)
+        play(game, policy, WARMUP)
+        update_times, draw_times = play(game, policy, frames)
+        frame_times = [update + draw for update, draw in zip(update_times, draw_times)]
+        result = {"frames": frames}
+        result.update(distribution("frame", frame_times))
+        result.update(distribution("update", update_times))
+        result.update(distribution("draw", draw_times))
+        result["obstacles"] = len(game.obstacle_manager.obstacles)
+        result["tokens"] = len(game.token_manager.tokens)
+        if best is None or result["frame_p50_ms"] < best["frame_p50_ms"]:
+            best = result
+    alloc_bytes, held_blocks = measure_allocations(game, policy, ALLOCATION_FRAMES)
+    best["alloc_bytes_per_frame"] = round(alloc_bytes, 1)
+    best["held_blocks_per_frame"] = round(held_blocks, 3)
+    return best
+
+
+def machine():
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Regressions as (scenario, metric, baseline value, value) tuples"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline["scenarios"].get(name)
+        if reference is None:
+            print(f"  {name}: no baseline")
+            continue
+        for metric, slack in CHECKED_METRICS.items():
+            if metric not in reference:
+                continue
+            limit = reference[metric] * (1.0 + threshold) + slack
+            if result[metric] > limit:
+                regressions.append((name, metric, reference[metric], result[metric]))
+    return regressions
+
+
+def print_results(results):
+    print(f"{'scenario':<11}{'frame p50':>10}{'p95':>8}{'p99':>8}{'max':>8}"
+          f"{'update p50':>11}{'p95':>8}{'draw p50':>9}{'p95':>8}{'alloc/f':>10}{'held/f':>8}{'objects':>9}")
+    for name, r in results.items():
+        print(f"{name:<11}{r['frame_p50_ms']:>8.3f}ms{r['frame_p95_ms']:>6.2f}ms{r['frame_p99_ms']:>6.2f}ms{r['frame_max_ms']:>6.2f}ms"
+              f"{r['update_p50_ms']:>9.3f}ms{r['update_p95_ms']:>6.3f}ms{r['draw_p50_ms']:>7.3f}ms{r['draw_p95_ms']:>6.3f}ms"
+              f"{r['alloc_bytes_per_frame']:>9.0f}B{r['held_blocks_per_frame']:>8.2f}{r['obstacles']:>5d}+{r['tokens']:<3d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark suite with regression thresholds")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="measured frames per scenario")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="run only these (repeatable)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results to the baseline")
+    parser.add_argument("--check", action="store_true", help="exit with 1 if a scenario regressed past the threshold")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed relative slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    names = args.scenario or list(SCENARIOS)
+    print(f"{args.frames} frames per scenario after {WARMUP} warm-up frames, best of {REPEATS}")
+    results = {}
+    for name in names:
+        results[name] = run_scenario(name, args.frames)
+    pygame.quit()
+    print_results(results)
+
+    status = 0
+    if args.check:
+        try:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading baseline: {e}")
+            return 2
+        if baseline.get("machine") != machine():
+            print(f"Warning: baseline recorded on another machine ({baseline.get('machine')})")
+        print(f"Checking against {args.baseline} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, reference, value in regressions:
+            print(f"  REGRESSION {name} {metric}: {reference} -> {value} ({value / max(reference, 1e-9) - 1:+.0%})")
+        if regressions:
+            status = 1
+        else:
+            print("  no regressions")
+
+    if args.save:
+        baseline = {"machine": machine(), "scenarios": {}}
+        # Scenarios not run this time keep their old baseline
+        if os.path.exists(args.baseline):
+            try:
+                with open(args.baseline, "r") as f:
+                    baseline["scenarios"] = json.load(f).get("scenarios", {})
+            except (OSError, ValueError) as e:
+                print(f"Error loading baseline: {e}")
+        baseline["scenarios"].update(results)
+        try:
+            with open(args.baseline, "w") as f:
+                json.dump(baseline, f, indent=2)
+            print(f"Baseline written to {args.baseline}")
+        except OSError as e:
+            print(f"Error writing baseline: {e}")
+            status = status or 2
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark for HUD and game over text.
+
+Compares the old text path (font.render for the shadow and again for the
+text, every string, every frame) against the text cache with digit atlases,
+per frame, while the score, coins, powerup timers and FPS keep changing.
+
+Usage:
+    python benchmarks/text_rendering.py [frames]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from scenes.game_over import GameOver
+from scenes.hud import HUD
+from scenes.text import text_cache
+
+SCREEN_SIZE = (1152, 648)
+DELTA_TIME = 1.0 / 60.0
+
+
+def legacy_draw_text(owner, screen, text, font, x, y, color=None, shadow_offset=2):
+    """draw_text_with_shadow as it was before the text cache"""
+    if color is None:
+        color = owner.text_color
+    shadow_surface = font.render(text, True, owner.shadow_color)
+    screen.blit(shadow_surface, (x + shadow_offset, y + shadow_offset))
+    text_surface = font.render(text, True, color)
+    screen.blit(text_surface, (x, y))
+    return text_surface.get_width(), text_surface.get_height()
+
+
+def measure(draw, frames):
+    """Average seconds per frame for draw(frame)"""
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw(frame)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    hud = HUD(*SCREEN_SIZE)
+    game_over = GameOver(*SCREEN_SIZE)
+
+    def draw_hud(frame):
+        powerups = {"halfspeed": 5.0 - frame * DELTA_TIME % 5.0, "godmode": 3.0 - frame * DELTA_TIME % 3.0}
+        hud.draw(screen, 1000 + frame * 7, 98765, True, frame // 20, powerups, fps=200 + frame % 40)
+
+    def draw_game_over(frame):
+        for line in game_over.layout(54321, 98765):
+            game_over.draw_text_with_shadow(screen, *line, 3)
+
+    results = []
+    for label, owner, draw in (("HUD while playing", hud, draw_hud), ("game over text", game_over, draw_game_over)):
+        cached = measure(draw, frames)
+        owner.draw_text_with_shadow = lambda *args, owner=owner: legacy_draw_text(owner, *args)
+        legacy = measure(draw, frames)
+        del owner.draw_text_with_shadow
+        results.append((label, legacy, cached))
+
+    print(f"Frames: {frames}")
+    print(f"{'':20}{'legacy':>12}{'cached':>12}")
+    for label, legacy, cached in results:
+        print(f"{label:20}{legacy * 1e6:>10.1f}us{cached * 1e6:>10.1f}us  {legacy / cached:5.1f}x")
+    print(f"Text cache: {text_cache.stats()}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
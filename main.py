@@ -7,6 +7,23 @@ Controls:
 - SPACE: Jump / Start Game
 - DOWN ARROW: Duck (while running)
 - ESC: Quit Game
+- F: FPS counter, P: frame profiler overlay, T: start/stop recording a trace
+- While a replay plays: SPACE pause, LEFT/RIGHT seek 5 s, HOME restart,
+  0-9 jump to 0-90% of the run
+
+Options:
+- --low-res: render the scene at native pixel-art resolution and upscale it
+- --background=high|medium|low: fewer, merged parallax layers on weak machines
+- --full-redraw: redraw and flip the whole window every frame (no dirty rects)
+- --fixed-quality: keep the starting quality instead of adapting it to the
+  frame rate (implied by --low-res and --background)
+- --pipelined: run the simulation on its own thread, drawing snapshots of it
+- --profile: start with the frame profiler overlay shown
+- --trace=FILE: record a trace of the whole session into FILE (Chrome trace
+  JSON, opens in chrome://tracing or Perfetto)
+- --record[=DIR]: save a replay of every finished run into DIR (default
+  "replays")
+- --replay=FILE: watch a recorded run instead of playing
 
 This is a Python remake of the original Godot version.
 """
@@ -19,6 +36,8 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from scenes.main_game import MainGame
+from scenes.replay import Replay
+from scenes.path_utils import get_save_path
 
 def main():
     """Main entry point for the game"""
@@ -27,7 +46,40 @@ def main():
         pygame.init()
         
         # Create and run the game
-        game = MainGame()
+        args = sys.argv[1:]
+        background_quality = None
+        trace_path = None
+        replay_dir = None
+        replay_path = None
+        for arg in args:
+            if arg.startswith("--background="):
+                background_quality = arg.split("=", 1)[1]
+            elif arg.startswith("--trace="):
+                trace_path = arg.split("=", 1)[1]
+            elif arg == "--record":
+                replay_dir = get_save_path("replays")
+            elif arg.startswith("--record="):
+                replay_dir = arg.split("=", 1)[1]
+            elif arg.startswith("--replay="):
+                replay_path = arg.split("=", 1)[1]
+        low_res = "--low-res" in args
+        # Quality chosen on the command line is kept as it is
+        adaptive_quality = not (low_res or background_quality or "--fixed-quality" in args)
+        game = MainGame(low_res=low_res, background_quality=background_quality or "high",
+                        dirty_rects="--full-redraw" not in args, adaptive_quality=adaptive_quality,
+                        pipelined="--pipelined" in args, run_store_path=get_save_path("runs.db"))
+        if "--profile" in args:
+            game.set_profiler_visible(True)
+        if trace_path:
+            game.trace_path = trace_path
+            game.toggle_trace()
+        game.replay_dir = replay_dir
+        if replay_path:
+            try:
+                game.start_replay(Replay.load(replay_path))
+            except (OSError, ValueError) as e:
+                print(f"Error loading replay {replay_path}: {e}")
+                sys.exit(1)
         game.run()
         
     except ImportError:
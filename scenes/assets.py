@@ -0,0 +1,228 @@
+import pygame
+from collections import OrderedDict
+
+class AssetCache:
+    """Process-wide cache of decoded, converted and scaled surfaces
+
+    Entries are keyed by (path, scale, frame geometry). Single images use a
+    geometry of None, sprite sheets use (frame_width, frame_height, frame_count)
+    and are stored as a tuple of pre-scaled frames. Cached surfaces are shared
+    between every game object, so they must never be drawn onto.
+
+    render_factor > 1 builds every surface that many times smaller than its
+    logical (game-world) size, for drawing into a low-resolution scene
+    surface that is upscaled once per frame. Game logic must take sizes from
+    get_size() and frame_size(), which always return logical sizes.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes  # Optional LRU memory cap (None = unlimited)
+        self.entries = OrderedDict()  # key -> (asset, size in bytes)
+        self.render_factor = 1  # Logical pixels per surface pixel
+        self.source_sizes = {}  # path -> unscaled image size
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        """Approximate memory used by a surface's pixel data"""
+        return surface.get_pitch() * surface.get_height()
+
+    @staticmethod
+    def load_image(path):
+        """Decode an image from disk and convert it for fast blitting
+
+        Without a display (headless simulation) the image is kept in its
+        decoded format, which is all collision sizes need.
+        """
+        image = pygame.image.load(path)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+
+    def set_render_factor(self, factor):
+        """Build surfaces at 1/factor of their logical size from now on
+
+        Cached surfaces were built for the old factor, so they are dropped;
+        objects holding surfaces must reload them.
+        """
+        factor = max(1, int(factor))
+        if factor != self.render_factor:
+            self.render_factor = factor
+            self.clear()
+
+    def get_size(self, path, scale=1.0):
+        """Logical size of an image at a scale, independent of render_factor"""
+        size = self.source_sizes.get(path)
+        if size is None:
+            size = self.source_sizes[path] = pygame.image.load(path).get_size()
+        return (int(size[0] * scale), int(size[1] * scale))
+
+    @staticmethod
+    def frame_size(frame_width, frame_height, scale=1.0):
+        """Logical size of one sprite sheet frame at a scale"""
+        return (int(frame_width * scale), int(frame_height * scale))
+
+    @staticmethod
+    def resize(surface, size):
+        """Scale a surface, keeping pixel art crisp
+
+        Whole-number scale steps use nearest neighbour. Shrinking by an
+        uneven ratio (large painted sprites such as tokens) is filtered
+        instead, which keeps those from looking torn.
+        """
+        width, height = surface.get_size()
+        if size[0] < width and width % size[0]:
+            try:
+                return pygame.transform.smoothscale(surface, size)
+            except ValueError:
+                pass  # smoothscale needs 24 or 32 bit surfaces
+        return pygame.transform.scale(surface, size)
+
+    def _lookup(self, key):
+        """Return a cached asset and mark it as recently used"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def _store(self, key, asset, size):
+        """Store an asset and evict least recently used entries over the cap"""
+        self.entries[key] = (asset, size)
+        self.bytes += size
+        if self.max_bytes is not None:
+            # Never evict the entry that was just stored
+            while self.bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+        return asset
+
+    def get_image(self, path, scale=1.0):
+        """Get a converted image scaled by the given factor"""
+        key = (path, scale, None)
+        image = self._lookup(key)
+        if image is not None:
+            return image
+
+        image = self.load_image(path)
+        self.source_sizes[path] = image.get_size()
+        factor = self.render_factor
+        width = max(1, int(image.get_width() * scale) // factor)
+        height = max(1, int(image.get_height() * scale) // factor)
+        if (width, height) != image.get_size():
+            image = self.resize(image, (width, height))
+        return self._store(key, image, self.surface_bytes(image))
+
+    def get_frames(self, path, frame_width, frame_height, frame_count, scale=1.0):
+        """Get a sprite sheet sliced into a tuple of pre-scaled frames"""
+        key = (path, scale, (frame_width, frame_height, frame_count))
+        frames = self._lookup(key)
+        if frames is not None:
+            return frames
+
+        sheet = self.load_image(path)
+        frames = self.build_frames(sheet, frame_width, frame_height, frame_count, scale, self.render_factor)
+        size = sum(self.surface_bytes(frame) for frame in frames)
+        return self._store(key, frames, size)
+
+    def get_tinted_frames(self, path, frame_width, frame_height, frame_count, scale, tint):
+        """Get a colour-tinted copy of a sprite sheet's frame table
+
+        The tint is multiplied into the RGB channels of every frame, so no
+        extra image file is needed.
+        """
+        return self.get_effect_frames(path, frame_width, frame_height, frame_count, scale, ("tint", tint))
+
+    def get_effect_frames(self, path, frame_width, frame_height, frame_count, scale, effect):
+        """Get a copy of a sprite sheet's frame table with a visual effect baked in
+
+        effect is (kind, value):
+            ("tint", rgb)  multiply the colour into RGB
+            ("alpha", a)   scale per-pixel opacity by a / 255
+        Each frame takes a single blend fill, once; drawing the effect is then
+        just a matter of blitting a different frame.
+        """
+        kind, value = effect
+        if kind == "tint":
+            fill, flags = tuple(value), pygame.BLEND_RGB_MULT
+        elif kind == "alpha":
+            fill, flags = (255, 255, 255, value), pygame.BLEND_RGBA_MULT
+        else:
+            raise ValueError(f"Unknown frame effect: {kind}")
+
+        key = (path, scale, (frame_width, frame_height, frame_count, kind, fill))
+        frames = self._lookup(key)
+        if frames is not None:
+            return frames
+
+        base_frames = self.get_frames(path, frame_width, frame_height, frame_count, scale)
+        frames = []
+        for base_frame in base_frames:
+            frame = base_frame.copy()
+            frame.fill(fill, special_flags=flags)
+            frames.append(frame)
+        frames = tuple(frames)
+        size = sum(self.surface_bytes(frame) for frame in frames)
+        return self._store(key, frames, size)
+
+    @staticmethod
+    def build_frames(sheet, frame_width, frame_height, frame_count, scale=1.0, factor=1):
+        """Slice a sprite sheet into a tuple of (optionally scaled) frames"""
+        frames = []
+        sheet_width = sheet.get_width()
+        width, height = AssetCache.frame_size(frame_width, frame_height, scale)
+        scaled_size = (max(1, width // factor), max(1, height // factor))
+        for frame_index in range(frame_count):
+            frame_x = (frame_index * frame_width) % sheet_width
+            frame_y = ((frame_index * frame_width) // sheet_width) * frame_height
+            frame_rect = pygame.Rect(frame_x, frame_y, frame_width, frame_height)
+            frame = sheet.subsurface(frame_rect).copy()
+            if scaled_size != (frame_width, frame_height):
+                frame = AssetCache.resize(frame, scaled_size)
+            frames.append(frame)
+        return tuple(frames)
+
+    def preload(self, images=(), sheets=()):
+        """Load assets up front so gameplay only hits the cache
+
+        Args:
+            images: iterable of (path, scale)
+            sheets: iterable of (path, frame_width, frame_height, frame_count, scale)
+        """
+        for path, scale in images:
+            try:
+                self.get_image(path, scale)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error preloading image {path}: {e}")
+        for path, frame_width, frame_height, frame_count, scale in sheets:
+            try:
+                self.get_frames(path, frame_width, frame_height, frame_count, scale)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error preloading sprite sheet {path}: {e}")
+
+    def stats(self):
+        """Get cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "render_factor": self.render_factor,
+        }
+
+    def clear(self):
+        """Drop every cached asset (counters are kept)"""
+        self.entries.clear()
+        self.bytes = 0
+
+# Shared registry used by all game objects
+asset_cache = AssetCache()
@@ -1,56 +1,164 @@
+import math
+import time
 import pygame
+from .assets import asset_cache
 from .path_utils import get_resource_path
 
 class Background:
-    """Manages the parallax scrolling background"""
+    """Manages the parallax scrolling background
     
-    def __init__(self, screen_width, screen_height):
+    Layers are flattened into surfaces without per-pixel alpha: the back
+    layer is fully opaque and the others only use fully opaque or fully
+    clear pixels, so a colorkey gives the same picture with much cheaper
+    blits. Each strip is drawn with a fixed number of blits.
+    
+    Quality levels pre-composite neighbouring layers (their scroll speeds
+    differ by only 0.1) into one strip that scrolls at the speed of its
+    middle layer:
+        high    5 strips, every layer at its own speed
+        medium  2 strips (back three layers, front two layers)
+        low     1 strip with every layer merged
+    """
+    
+    GROUND_IMAGE_PATH = "assets/img/background/ground.png"
+    FALLBACK_GROUND_HEIGHT = 100
+    
+    # Layer indices merged into each strip, back to front
+    QUALITY_GROUPS = {
+        "high": ((0,), (1,), (2,), (3,), (4,)),
+        "medium": ((0, 1, 2), (3, 4)),
+        "low": ((0, 1, 2, 3, 4),),
+    }
+    COLORKEY = (255, 0, 255)  # Unused by the background art
+    
+    @staticmethod
+    def compute_ground_y(screen_height):
+        """Get the ground surface Y without creating any display surfaces"""
+        try:
+            ground_height = asset_cache.get_size(get_resource_path(Background.GROUND_IMAGE_PATH))[1]
+        except (pygame.error, FileNotFoundError):
+            ground_height = Background.FALLBACK_GROUND_HEIGHT
+        return screen_height - ground_height
+    
+    def __init__(self, screen_width, screen_height, quality="high"):
         self.screen_width = screen_width
         self.screen_height = screen_height
         
+        # Positions and widths are in logical pixels; surfaces are built at
+        # 1/render_factor of that size and placed by dividing when drawn
+        self.render_factor = asset_cache.render_factor
+        factor = self.render_factor
+        
         # Load background layers
         self.layers = []
+        self.layer_widths = []
         self.layer_speeds = [1.5, 1.6, 1.7, 1.8, 1.9]  # Different scroll speeds for parallax
         
         # Load parallax layers
         for i in range(1, 6):
             try:
-                layer_image = pygame.image.load(get_resource_path(f"assets/img/background/plx-{i}.png")).convert_alpha()
+                layer_path = get_resource_path(f"assets/img/background/plx-{i}.png")
                 # Scale to screen height
-                scale_factor = screen_height / layer_image.get_height()
-                width = int(layer_image.get_width() * scale_factor)
-                height = int(layer_image.get_height() * scale_factor)
-                layer_image = pygame.transform.scale(layer_image, (width, height))
-                self.layers.append(layer_image)
-            except pygame.error:
+                scale_factor = screen_height / asset_cache.get_size(layer_path)[1]
+                self.layers.append(asset_cache.get_image(layer_path, scale_factor))
+                self.layer_widths.append(asset_cache.get_size(layer_path, scale_factor)[0])
+            except (pygame.error, FileNotFoundError):
                 # Create a fallback colored layer if image doesn't load
-                fallback = pygame.Surface((screen_width, screen_height))
+                fallback = pygame.Surface((screen_width // factor, screen_height // factor))
                 fallback.fill((100 + i * 20, 150 + i * 10, 200 + i * 5))
                 self.layers.append(fallback)
+                self.layer_widths.append(screen_width)
         
         # Ground
         self.ground_image = None
         try:
-            self.ground_image = pygame.image.load(get_resource_path("assets/img/background/ground.png")).convert_alpha()
-        except pygame.error:
+            ground_path = get_resource_path(self.GROUND_IMAGE_PATH)
+            self.ground_image = asset_cache.get_image(ground_path)
+            self.ground_width, ground_height = asset_cache.get_size(ground_path)
+        except (pygame.error, FileNotFoundError):
             # Create fallback ground
-            self.ground_image = pygame.Surface((screen_width, 100))
+            self.ground_image = pygame.Surface((screen_width // factor, self.FALLBACK_GROUND_HEIGHT // factor))
             self.ground_image.fill((139, 69, 19))  # Brown color
+            self.ground_width, ground_height = screen_width, self.FALLBACK_GROUND_HEIGHT
             
-        self.ground_y = screen_height - self.ground_image.get_height()
+        self.ground_y = screen_height - ground_height
+        self.ground_image = self.flatten([self.ground_image])
+        self.ground_copies = math.ceil(screen_width / self.ground_width) + 1
+        
+        # Strips to draw for the current quality: (surface, driving layer index, blit count)
+        self.strips = []
+        self.opaque = False  # True when the strips cover the whole screen (no clear needed)
+        self.quality = None
+        self.set_quality(quality)
+        self.draw_time = 0.0  # Seconds spent in the last draw()
         
         # Track positions for infinite scrolling
         self.layer_positions = [0] * len(self.layers)
         self.ground_positions = [0, screen_width]
         self.ground_speed = 3.0  # Ground moves faster than other layers
+        self.last_scroll = 0.0  # speed * delta_time of the last update (for interpolation)
+        
+    @staticmethod
+    def alpha_kind(surface):
+        """Classify a surface's alpha as opaque, binary (only 0 or 255) or alpha"""
+        if not surface.get_flags() & pygame.SRCALPHA:
+            return "opaque"
+        visible = pygame.mask.from_surface(surface, 0).count()
+        solid = pygame.mask.from_surface(surface, 254).count()
+        if solid == surface.get_width() * surface.get_height():
+            return "opaque"
+        return "binary" if solid == visible else "alpha"
+        
+    @classmethod
+    def flatten(cls, surfaces):
+        """Composite surfaces (back to front) into one without per-pixel alpha when possible"""
+        kinds = [cls.alpha_kind(surface) for surface in surfaces]
+        size = surfaces[0].get_size()
+        has_display = pygame.display.get_surface() is not None
+        if "alpha" in kinds and kinds[0] != "opaque":
+            # Real translucency: keep per-pixel alpha
+            result = pygame.Surface(size, pygame.SRCALPHA)
+            if has_display:
+                result = result.convert_alpha()
+        else:
+            result = pygame.Surface(size)
+            if has_display:
+                result = result.convert()
+            if kinds[0] != "opaque":
+                result.fill(cls.COLORKEY)
+        for surface in surfaces:
+            result.blit(surface, (0, 0))
+        if kinds[0] != "opaque" and not result.get_flags() & pygame.SRCALPHA:
+            result.set_colorkey(cls.COLORKEY, pygame.RLEACCEL)
+        return result
+        
+    def set_quality(self, quality):
+        """Rebuild the layer strips for a quality level ("high", "medium" or "low")"""
+        if quality not in self.QUALITY_GROUPS:
+            raise ValueError(f"Unknown background quality: {quality}")
+        if quality == self.quality:
+            return
+        self.quality = quality
+        self.strips = []
+        for group in self.QUALITY_GROUPS[quality]:
+            index = group[len(group) // 2]  # Middle layer drives the merged strip
+            surface = self.flatten([self.layers[i] for i in group])
+            copies = math.ceil(self.screen_width / self.layer_widths[index]) + 1
+            self.strips.append((surface, index, copies))
+        back = self.strips[0][0]
+        self.opaque = (back.get_colorkey() is None and not back.get_flags() & pygame.SRCALPHA
+                       and self.layer_widths[self.strips[0][1]] >= self.screen_width
+                       and back.get_height() * self.render_factor >= self.screen_height)
         
     def update(self, delta_time, speed):
         """Update background scrolling"""
+        self.last_scroll = speed * delta_time
+        
         # Update parallax layers
         for i, layer_speed in enumerate(self.layer_speeds):
             self.layer_positions[i] -= speed * layer_speed * delta_time
             # Reset position for infinite scrolling
-            if self.layer_positions[i] <= -self.layers[i].get_width():
+            if self.layer_positions[i] <= -self.layer_widths[i]:
                 self.layer_positions[i] = 0
                 
         # Update ground with increased speed
@@ -58,24 +166,66 @@ class Background:
             self.ground_positions[i] -= speed * self.ground_speed * delta_time
             
         # Reset ground positions for infinite scrolling
-        if self.ground_positions[0] <= -self.ground_image.get_width():
-            self.ground_positions[0] = self.ground_positions[1] + self.ground_image.get_width()
-        if self.ground_positions[1] <= -self.ground_image.get_width():
-            self.ground_positions[1] = self.ground_positions[0] + self.ground_image.get_width()
+        if self.ground_positions[0] <= -self.ground_width:
+            self.ground_positions[0] = self.ground_positions[1] + self.ground_width
+        if self.ground_positions[1] <= -self.ground_width:
+            self.ground_positions[1] = self.ground_positions[0] + self.ground_width
             
-    def draw(self, screen):
-        """Draw the background"""
-        # Draw parallax layers
-        for i, layer in enumerate(self.layers):
-            x = self.layer_positions[i]
-            # Draw multiple copies to ensure full coverage
-            while x < self.screen_width:
-                screen.blit(layer, (x, 0))
-                x += layer.get_width()
+    def scroll_state(self):
+        """Scroll positions after the last update, as an immutable tuple for draw()"""
+        return (tuple(self.layer_positions), tuple(self.ground_positions), self.last_scroll)
+        
+    def restore_scroll(self, scroll):
+        """Go back to a scroll_state()"""
+        layer_positions, ground_positions, self.last_scroll = scroll
+        self.layer_positions = list(layer_positions)
+        self.ground_positions = list(ground_positions)
+        
+    def draw_state(self, alpha=1.0, scroll=None):
+        """Everything draw() depends on, for detecting when the picture changes"""
+        layer_positions, ground_positions, last_scroll = scroll or self.scroll_state()
+        lag = (1.0 - alpha) * last_scroll
+        return (self.quality, layer_positions, ground_positions, lag)
+        
+    def draw(self, screen, alpha=1.0, scroll=None):
+        """Draw the background
+        
+        alpha is how far the renderer is into the next tick (0..1); layers
+        are drawn that fraction of the way between the last two updates.
+        scroll is a scroll_state() to draw instead of the current positions
+        (a snapshot taken on another thread).
+        """
+        start = time.perf_counter()
+        if scroll is None:
+            layer_positions, ground_positions, last_scroll = self.layer_positions, self.ground_positions, self.last_scroll
+        else:
+            layer_positions, ground_positions, last_scroll = scroll
+        
+        # Distance still to scroll before reaching the simulated position
+        lag = (1.0 - alpha) * last_scroll
+        factor = self.render_factor
+        
+        # Draw parallax strips (enough copies to cover the screen at any offset)
+        for surface, i, copies in self.strips:
+            width = self.layer_widths[i]
+            x = layer_positions[i] + lag * self.layer_speeds[i]
+            if x > 0:
+                x -= width
+            for _ in range(copies):
+                screen.blit(surface, (x / factor, 0))
+                x += width
                 
         # Draw ground
-        for ground_x in self.ground_positions:
-            screen.blit(self.ground_image, (ground_x, self.ground_y))
+        ground_width = self.ground_width
+        ground_top = self.ground_y / factor
+        x = min(ground_positions) + lag * self.ground_speed
+        if x > 0:
+            x -= ground_width
+        for _ in range(self.ground_copies):
+            screen.blit(self.ground_image, (x / factor, ground_top))
+            x += ground_width
+            
+        self.draw_time = time.perf_counter() - start
             
     def get_ground_y(self):
         """Get the Y position of the ground surface"""
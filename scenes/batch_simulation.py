@@ -0,0 +1,457 @@
+import math
+import random
+import numpy as np
+from .assets import asset_cache
+from .background import Background
+from .dino import Dino
+from .obstacles import ObstacleFactory, ObstacleManager, Bird
+from .simulation import Simulation
+from .tokens import Token, TokenManager
+from .path_utils import get_resource_path
+
+# Dino states
+STATE_IDLE = 0
+STATE_RUN = 1
+STATE_JUMP = 2
+STATE_DUCK = 3
+
+# Obstacle types (index into the size tables)
+OBSTACLE_TYPES = ("stump", "rock", "barrel", "bird")
+BIRD = 3
+
+# Token types (index into the size tables); powerup slots use the same codes
+TOKEN_TYPES = ("coin", "halfspeed", "doublegold", "godmode")
+COIN = 0
+HALFSPEED = 1
+DOUBLEGOLD = 2
+GODMODE = 3
+POWERUP_DURATIONS = np.array([0.0, 10.0, 10.0, 8.0])
+
+
+def lround(value):
+    """Round half away from zero, like pygame does when assigning Rect.center"""
+    return int(math.floor(value + 0.5)) if value >= 0 else -int(math.floor(-value + 0.5))
+
+
+def lround_array(values):
+    """Vectorized lround"""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int32)
+
+
+class BatchSimulation:
+    """N independent games stepped in lockstep with NumPy structure-of-arrays
+
+    Mirrors Simulation tick for tick: dino gravity/jump/ground snapping,
+    obstacle and token movement, token bobbing, powerup timers and rect
+    collisions. Per-tick physics and collision run as array operations over
+    every game; spawning is rare, so it runs per game with the same seeded
+    random.Random call sequence as ObstacleManager/TokenManager. The same
+    seed and inputs therefore give the same outcome as the scalar engine.
+
+    Obstacle and token slots are stored as (num_games, capacity) arrays with
+    an active mask; capacity grows automatically when a game runs out.
+    """
+
+    def __init__(self, num_games, screen_width=1152, screen_height=648, ground_y=None, capacity=8):
+        self.num_games = num_games
+        self.screen_width = screen_width
+        if ground_y is None:
+            ground_y = Background.compute_ground_y(screen_height)
+        self.ground_y = ground_y
+
+        # Layout constants shared with the scalar engine
+        scalar = Simulation
+        self.start_speed = scalar.START_SPEED
+        self.max_speed = scalar.MAX_SPEED
+        self.speed_modifier = scalar.SPEED_MODIFIER
+        self.max_difficulty = scalar.MAX_DIFFICULTY
+        self.ground_offset = 40
+        self.dino_x = float(scalar.DINO_START_POS[0])
+        self.camera_x = self.dino_x - 200
+        self.speed_multiplier = 3.0
+
+        # Sprite sizes drive every collision rect
+        dino_size = int(Dino.FRAME_SIZE * Dino.SCALE)
+        self.dino_half = dino_size // 2
+        self.dino_rect_left = lround(self.dino_x) - self.dino_half
+        self.dino_size = dino_size
+        self.dino_ground = self.ground_y + self.ground_offset - self.dino_half
+        self.obstacle_sizes = np.array(self._obstacle_sizes(), dtype=np.int64)
+        self.token_sizes = np.array(self._token_sizes(), dtype=np.int64)
+
+        # Spawn parameters (read from the scalar managers so they stay in sync)
+        obstacle_manager = ObstacleManager(screen_width, self.ground_y, random.Random(0))
+        self.min_group_spacing = obstacle_manager.min_group_spacing
+        self.max_group_spacing = obstacle_manager.max_group_spacing
+        self.bird_probability = obstacle_manager.bird_probability
+        manager = TokenManager(screen_width, self.ground_y, random.Random(0))
+        self.token_heights = list(manager.token_heights)
+        self.min_spawn_interval = manager.min_spawn_interval
+        self.max_spawn_interval = manager.max_spawn_interval
+        self.min_powerup_interval = manager.min_powerup_interval
+        self.max_powerup_interval = manager.max_powerup_interval
+        self.doublegold_probability = manager.doublegold_probability
+        self.halfspeed_min_score = manager.halfspeed_min_score
+        self.godmode_min_score = manager.godmode_min_score
+        self.godmode_probability = manager.godmode_probability
+        self.safe_dx = manager.min_distance_from_obstacles
+        self.safe_dy = manager.vertical_safe_zone
+
+        self.capacity = capacity
+        self.token_capacity = capacity
+        self.rngs = [random.Random() for _ in range(num_games)]
+        self.reset()
+
+    def _obstacle_sizes(self):
+        """(width, height) per obstacle type, from the scaled sprites"""
+        sizes = []
+        for cls in ObstacleFactory.GROUND_OBSTACLES:
+            sizes.append(asset_cache.get_size(get_resource_path(cls.IMAGE_PATH), cls.SCALE))
+        sizes.append(asset_cache.frame_size(Bird.FRAME_SIZE, Bird.FRAME_SIZE, Bird.SCALE))
+        return sizes
+
+    def _token_sizes(self):
+        """(width, height) per token type, from the sprites at scale 1"""
+        return [asset_cache.get_size(get_resource_path(Token.SPRITE_PATHS[name]), 1) for name in TOKEN_TYPES]
+
+    def reset(self, seeds=None):
+        """Start a new run in every game
+
+        Args:
+            seeds: one seed per game (random seeds when None)
+        """
+        n = self.num_games
+        self.seeds = [0] * n
+
+        # Per-game state
+        self.alive = np.ones(n, dtype=bool)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n)
+        self.token_score = np.zeros(n, dtype=np.int64)
+        self.speed = np.full(n, self.start_speed)
+        self.base_speed = np.full(n, self.start_speed)
+        self.difficulty = np.zeros(n, dtype=np.int64)
+        self.dino_y = np.full(n, float(self.dino_ground))
+        self.dino_vy = np.zeros(n)
+        self.dino_state = np.full(n, STATE_IDLE, dtype=np.int8)
+        self.on_ground = np.ones(n, dtype=bool)
+        self.death_cause = np.full(n, -1, dtype=np.int8)  # Obstacle type that ended the run
+        self.powerups = np.zeros((n, len(TOKEN_TYPES)))  # Remaining seconds per powerup slot
+        self.coin_multiplier = np.ones(n, dtype=np.int64)
+
+        # Obstacle slots
+        c = self.capacity
+        self.obs_active = np.zeros((n, c), dtype=bool)
+        self.obs_x = np.zeros((n, c))
+        self.obs_top = np.zeros((n, c), dtype=np.int32)
+        self.obs_width = np.zeros((n, c), dtype=np.int32)
+        self.obs_height = np.zeros((n, c), dtype=np.int32)
+        self.obs_type = np.zeros((n, c), dtype=np.int8)
+        self.last_obstacle_x = np.zeros(n)
+
+        # Token slots
+        t = self.token_capacity
+        self.tok_active = np.zeros((n, t), dtype=bool)
+        self.tok_x = np.zeros((n, t))
+        self.tok_y = np.zeros((n, t))
+        self.tok_initial_y = np.zeros((n, t))
+        self.tok_bob = np.zeros((n, t))
+        self.tok_width = np.zeros((n, t), dtype=np.int32)
+        self.tok_height = np.zeros((n, t), dtype=np.int32)
+        self.tok_type = np.zeros((n, t), dtype=np.int8)
+
+        # Spawn timers
+        self.spawn_timer = np.zeros(n)
+        self.powerup_timer = np.zeros(n)
+        self.next_spawn_time = np.zeros(n)
+        self.next_powerup_time = np.zeros(n)
+
+        self.reset_games(np.arange(n), seeds)
+
+    def reset_games(self, games, seeds=None):
+        """Start a new run in some games only (keeps a training batch full)
+
+        Args:
+            games: indices of the games to restart
+            seeds: one seed per restarted game (random seeds when None)
+        """
+        games = np.asarray(games, dtype=np.int64)
+        if seeds is None:
+            seeds = [random.getrandbits(32) for _ in range(len(games))]
+
+        self.alive[games] = True
+        self.ticks[games] = 0
+        self.score[games] = 0.0
+        self.token_score[games] = 0
+        self.speed[games] = self.start_speed
+        self.base_speed[games] = self.start_speed
+        self.difficulty[games] = 0
+        self.dino_y[games] = float(self.dino_ground)
+        self.dino_vy[games] = 0.0
+        self.dino_state[games] = STATE_IDLE
+        self.on_ground[games] = True
+        self.death_cause[games] = -1
+        self.powerups[games] = 0.0
+        self.coin_multiplier[games] = 1
+        self.obs_active[games] = False
+        self.last_obstacle_x[games] = 0.0
+        self.tok_active[games] = False
+        self.spawn_timer[games] = 0.0
+        self.powerup_timer[games] = 0.0
+
+        # Seeding then drawing the timers mirrors Simulation.new_game
+        for g, seed in zip(games.tolist(), seeds):
+            self.seeds[g] = seed
+            rng = self.rngs[g]
+            rng.seed(seed)
+            self.next_spawn_time[g] = rng.uniform(self.min_spawn_interval, self.max_spawn_interval)
+            self.next_powerup_time[g] = rng.uniform(self.min_powerup_interval, self.max_powerup_interval)
+
+    # Slot management
+    def _grow(self, arrays, capacity):
+        """Double the slot capacity of a group of (num_games, capacity) arrays"""
+        grown = []
+        for array in arrays:
+            bigger = np.zeros((self.num_games, capacity * 2), dtype=array.dtype)
+            bigger[:, :capacity] = array
+            grown.append(bigger)
+        return grown
+
+    def _free_obstacle_slot(self, g):
+        free = np.flatnonzero(~self.obs_active[g])
+        if len(free) == 0:
+            (self.obs_active, self.obs_x, self.obs_top, self.obs_width, self.obs_height, self.obs_type) = self._grow(
+                (self.obs_active, self.obs_x, self.obs_top, self.obs_width, self.obs_height, self.obs_type), self.capacity)
+            self.capacity *= 2
+            free = np.flatnonzero(~self.obs_active[g])
+        return free[0]
+
+    def _free_token_slot(self, g):
+        free = np.flatnonzero(~self.tok_active[g])
+        if len(free) == 0:
+            (self.tok_active, self.tok_x, self.tok_y, self.tok_initial_y, self.tok_bob,
+             self.tok_width, self.tok_height, self.tok_type) = self._grow(
+                (self.tok_active, self.tok_x, self.tok_y, self.tok_initial_y, self.tok_bob,
+                 self.tok_width, self.tok_height, self.tok_type), self.token_capacity)
+            self.token_capacity *= 2
+            free = np.flatnonzero(~self.tok_active[g])
+        return free[0]
+
+    # Spawning (per game, same random call order as the scalar managers)
+    def _spawn_obstacle(self, g):
+        rng = self.rngs[g]
+        score = self.score[g]
+        group_spacing = rng.randint(self.min_group_spacing, self.max_group_spacing)
+        if self.last_obstacle_x[g] == 0:
+            obs_x = self.screen_width + score + (group_spacing * 0.75)
+        else:
+            obs_x = self.last_obstacle_x[g] + group_spacing
+
+        if rng.random() >= self.bird_probability:
+            obstacle_type = ("stump", "rock", "barrel").index(rng.choice(['stump', 'rock', 'barrel']))
+            height = self.obstacle_sizes[obstacle_type, 1]
+            top = (self.ground_y - height // 2) - height // 2
+        else:
+            obstacle_type = BIRD
+            top = 400 - self.obstacle_sizes[BIRD, 1] // 2
+
+        slot = self._free_obstacle_slot(g)
+        self.obs_active[g, slot] = True
+        self.obs_x[g, slot] = obs_x
+        self.obs_top[g, slot] = top
+        self.obs_width[g, slot] = self.obstacle_sizes[obstacle_type, 0]
+        self.obs_height[g, slot] = self.obstacle_sizes[obstacle_type, 1]
+        self.obs_type[g, slot] = obstacle_type
+        self.last_obstacle_x[g] = obs_x
+
+    def _is_safe_spawn_position(self, g, x, y):
+        active = self.obs_active[g]
+        if not active.any():
+            return True
+        width = self.obs_width[g, active]
+        height = self.obs_height[g, active]
+        left = lround_array(self.obs_x[g, active]) - width // 2 - self.safe_dx
+        top = self.obs_top[g, active] - self.safe_dy
+        right = left + width + self.safe_dx * 2
+        bottom = top + height + self.safe_dy * 2
+        token_left = int(x - 20)
+        token_top = int(y - 20)
+        overlap = (token_left < right) & (token_left + 40 > left) & (token_top < bottom) & (token_top + 40 > top)
+        return not overlap.any()
+
+    def _add_token(self, g, x, y, token_type):
+        rng = self.rngs[g]
+        slot = self._free_token_slot(g)
+        self.tok_active[g, slot] = True
+        self.tok_x[g, slot] = x
+        self.tok_y[g, slot] = y
+        self.tok_initial_y[g, slot] = y
+        self.tok_bob[g, slot] = rng.uniform(0, 2 * math.pi)
+        self.tok_width[g, slot] = self.token_sizes[token_type, 0]
+        self.tok_height[g, slot] = self.token_sizes[token_type, 1]
+        self.tok_type[g, slot] = token_type
+
+    def _spawn_token(self, g, token_type, near, far):
+        rng = self.rngs[g]
+        for _ in range(10):
+            x = self.camera_x + self.screen_width + rng.randint(*near)
+            y = rng.choice(self.token_heights)
+            if self._is_safe_spawn_position(g, x, y):
+                self._add_token(g, x, y, token_type)
+                return
+        x = self.camera_x + self.screen_width + rng.randint(*far)
+        y = rng.choice(self.token_heights)
+        self._add_token(g, x, y, token_type)
+
+    def _spawn_powerup(self, g):
+        rng = self.rngs[g]
+        score = self.score[g]
+        available = []
+        if rng.random() < self.doublegold_probability:
+            available.append(DOUBLEGOLD)
+        if score >= self.halfspeed_min_score:
+            available.append(HALFSPEED)
+        if score >= self.godmode_min_score and rng.random() < self.godmode_probability:
+            available.append(GODMODE)
+        if not available:
+            return
+        self._spawn_token(g, rng.choice(available), (200, 500), (600, 800))
+
+    def step(self, jump, duck, delta_time=Simulation.FIXED_DELTA):
+        """Advance every live game by one tick
+
+        Args:
+            jump: bool array (num_games,) of jump inputs
+            duck: bool array (num_games,) of duck inputs
+
+        Returns:
+            bool array of games that ended on this tick
+        """
+        alive = self.alive
+        self.ticks += alive
+
+        # Powerup timers
+        active_powerups = (self.powerups > 0) & alive[:, None]
+        self.powerups = np.where(active_powerups, self.powerups - delta_time, self.powerups)
+        expired = active_powerups & (self.powerups <= 0)
+        self.powerups[expired] = 0.0
+        self.coin_multiplier[expired[:, DOUBLEGOLD]] = 1
+
+        # Speed, difficulty and score
+        base_speed = np.minimum(self.start_speed + self.score / self.speed_modifier, self.max_speed)
+        self.base_speed = np.where(alive, base_speed, self.base_speed)
+        speed = np.where(self.powerups[:, HALFSPEED] > 0, self.base_speed * 0.7, self.base_speed)
+        self.speed = np.where(alive, speed, self.speed)
+        difficulty = np.minimum((self.score / self.speed_modifier).astype(np.int64), self.max_difficulty)
+        self.difficulty = np.where(alive, difficulty, self.difficulty)
+        self.score = np.where(alive, self.score + self.base_speed * delta_time, self.score)
+
+        # Dino physics (Dino.update)
+        vy = self.dino_vy + Dino.GRAVITY * delta_time
+        y = self.dino_y
+        on_ground = y >= self.dino_ground
+        y = np.where(on_ground, float(self.dino_ground), y)
+        vy = np.where(on_ground, 0.0, vy)
+        jumping = on_ground & jump
+        ducking = on_ground & ~jump & duck
+        vy = np.where(jumping, float(Dino.JUMP_SPEED), vy)
+        state = np.where(ducking, STATE_DUCK, np.where(on_ground & ~jumping, STATE_RUN, STATE_JUMP))
+        y = y + vy * delta_time
+        self.dino_y = np.where(alive, y, self.dino_y)
+        self.dino_vy = np.where(alive, vy, self.dino_vy)
+        self.on_ground = np.where(alive, on_ground, self.on_ground)
+        self.dino_state = np.where(alive, state, self.dino_state).astype(np.int8)
+
+        # Obstacles move, despawn and spawn (ObstacleManager.update). Slots of
+        # finished games keep moving; they are never read again before a reset.
+        step_x = (-self.speed * self.speed_multiplier) * delta_time
+        self.obs_x += step_x[:, None]
+        self.obs_active &= self.obs_x >= self.camera_x - self.screen_width
+        needs_obstacle = alive & (~self.obs_active.any(axis=1) | (self.last_obstacle_x < self.screen_width + self.score))
+        for g in np.flatnonzero(needs_obstacle):
+            self._spawn_obstacle(g)
+
+        # Token spawning (TokenManager.update)
+        self.spawn_timer += delta_time
+        for g in np.flatnonzero(alive & (self.spawn_timer >= self.next_spawn_time)):
+            self._spawn_token(g, COIN, (100, 300), (400, 600))
+            self.spawn_timer[g] = 0.0
+            difficulty_factor = max(0.5, 1.0 - (self.difficulty[g] * 0.2))
+            self.next_spawn_time[g] = self.rngs[g].uniform(
+                self.min_spawn_interval * difficulty_factor,
+                self.max_spawn_interval * difficulty_factor
+            )
+        self.powerup_timer += delta_time
+        for g in np.flatnonzero(alive & (self.powerup_timer >= self.next_powerup_time)):
+            self._spawn_powerup(g)
+            self.powerup_timer[g] = 0.0
+            self.next_powerup_time[g] = self.rngs[g].uniform(self.min_powerup_interval, self.max_powerup_interval)
+
+        # Tokens move and bob, then despawn
+        self.tok_bob += 3.0 * delta_time
+        np.multiply(np.sin(self.tok_bob), 5, out=self.tok_y)
+        self.tok_y += self.tok_initial_y
+        self.tok_x += step_x[:, None]
+        self.tok_active &= self.tok_x >= self.camera_x - 100
+
+        # Token collection against the dino sprite rect
+        dino_top = (lround_array(self.dino_y) - self.dino_half)[:, None]
+        token_width = self.tok_width
+        token_height = self.tok_height
+        token_left = lround_array(self.tok_x) - token_width // 2
+        token_top = lround_array(self.tok_y) - token_height // 2
+        collected = ((token_left < self.dino_rect_left + self.dino_size)
+                     & (token_left + token_width > self.dino_rect_left)
+                     & (token_top < dino_top + self.dino_size)
+                     & (token_top + token_height > dino_top))
+        collected &= self.tok_active
+        collected &= alive[:, None]
+        if collected.any():
+            self.tok_active &= ~collected
+            coins = (collected & (self.tok_type == COIN)).sum(axis=1)
+            self.token_score += coins * self.coin_multiplier
+            for powerup in (HALFSPEED, DOUBLEGOLD, GODMODE):
+                picked = (collected & (self.tok_type == powerup)).any(axis=1)
+                self.powerups[picked, powerup] = POWERUP_DURATIONS[powerup]
+                if powerup == DOUBLEGOLD:
+                    self.coin_multiplier[picked] = 2
+
+        # Obstacle collisions against the dino collision rect (Dino.get_collision_rect)
+        ducked = self.dino_state == STATE_DUCK
+        hit_left = lround(self.dino_x - 8) - 40
+        hit_top = np.where(ducked, lround_array(self.dino_y + 8) - 56, lround_array(self.dino_y) - 64)
+        hit_bottom = hit_top + np.where(ducked, 112, 128)
+        obstacle_left = lround_array(self.obs_x) - self.obs_width // 2
+        hits = ((obstacle_left < hit_left + 80)
+                & (obstacle_left + self.obs_width > hit_left)
+                & (self.obs_top < hit_bottom[:, None])
+                & (self.obs_top + self.obs_height > hit_top[:, None]))
+        hits &= self.obs_active
+        invincible = self.powerups[:, GODMODE] > 0
+        died = alive & ~invincible & hits.any(axis=1)
+        if died.any():
+            dead = np.flatnonzero(died)
+            self.death_cause[dead] = self.obs_type[dead, hits[dead].argmax(axis=1)]
+        self.alive = alive & ~died
+        return died
+
+    def run(self, policy, seeds=None, max_ticks=None):
+        """Play every game to the end
+
+        Args:
+            policy: callable taking the batch and returning (jump, duck) bool arrays
+            seeds: one seed per game
+            max_ticks: optional tick limit
+
+        Returns:
+            int array of ticks survived per game
+        """
+        self.reset(seeds)
+        tick = 0
+        while self.alive.any():
+            jump, duck = policy(self)
+            self.step(jump, duck)
+            tick += 1
+            if max_ticks is not None and tick >= max_ticks:
+                break
+        return self.ticks
@@ -1,6 +1,7 @@
 import pygame
 import random
 from .game_object import GameObject
+from .assets import asset_cache
 from .path_utils import get_resource_path
 
 class Dino(GameObject):
@@ -10,21 +11,44 @@ class Dino(GameObject):
     GRAVITY = 4500
     JUMP_SPEED = -1500  # Increased from -1800 for 2x farther jump distance
     
-    def __init__(self, x, y):
+    # Sprite sheet geometry (576x24 = 24 frames of 24x24) with original 8x scale
+    FRAME_SIZE = 24
+    FRAME_COUNT = 24
+    SCALE = 8.0
+    ANIMATION_SPEED = 10.0  # Frames per second (original value)
+    
+    # Skins generated from the base sheet by multiplying in a tint colour: name -> (r, g, b)
+    TINTED_SKINS = {}
+    
+    # Per-state visual effects: name -> (frame effect baked by asset_cache,
+    # toggles per second of game time (0 = steady), skins it is built for).
+    # Effect frames are built up front, so drawing one never copies a surface;
+    # on any other skin the effect is not drawn.
+    EFFECTS = {
+        "invincible": (("alpha", 128), 4, ("god",)),  # Godmode flash at half opacity
+    }
+    
+    def __init__(self, x, y, verbose=False):
         super().__init__(x, y)
+        self.verbose = verbose  # Print skin changes
         
         # Sprite sheet management
         self.current_sprite_sheet = "base"
         self.sprite_sheets = {
             "base": get_resource_path("assets/img/dino/mort-base.png"),
             "slow": get_resource_path("assets/img/dino/mort-slow.png"), 
-            # "fast": get_resource_path("assets/img/dino/mort-fast.png"),  # Temporarily commented out
             "gold": get_resource_path("assets/img/dino/mort-gold.png"),
             "god": get_resource_path("assets/img/dino/mort-god.png")
         }
         
         # Load sprite sheet (576x24 = 24 frames of 24x24) with original 8x scale
-        self.load_sprite_sheet(get_resource_path("assets/img/dino/mort-base.png"), 24, 24, 24, 8.0)  # Original scale
+        self.load_sprite_sheet(self.sprite_sheets["base"], self.FRAME_SIZE, self.FRAME_SIZE, self.FRAME_COUNT, self.SCALE)
+        
+        # Decode, slice and scale every skin once so switching is a pointer swap
+        self.skins = self.load_skins()
+        self.effect_frames = self.load_effects()
+        self.effect = None  # Active entry of EFFECTS
+        self.effect_time = 0.0  # Game time since the effect started
         
         # Animation states and frame ranges (matching original Godot mapping)
         self.state = "idle"  # idle, run, jump, duck
@@ -39,7 +63,7 @@ class Dino(GameObject):
         }
         
         # Animation settings (matching original)
-        self.animation_speed = 10.0  # Frames per second (original value)
+        self.animation_speed = self.ANIMATION_SPEED
         self.state_frame_index = 0
         self.animation_timer = 0.0
         
@@ -47,34 +71,92 @@ class Dino(GameObject):
         self.run_rect = None
         self.duck_rect = None
         
-        # Jump sound
-        self.jump_sound = None
-        try:
-            self.jump_sound = pygame.mixer.Sound(get_resource_path("assets/sound/jump.wav"))
-            self.jump_sound.set_volume(0.5)
-        except pygame.error:
-            pass
-            
+        # Set on the tick a jump starts (the game layer plays the jump sound)
+        self.jumped = False
+        
         # Set up collision rectangles (matching original Godot collision shapes)
         if self.rect:
             # Original: RunCol shape = 10x16 at scale 8 = 80x128
             self.run_rect = pygame.Rect(0, 0, 80, 128)
             # Original: DuckCol shape = 10x14 at scale 8 = 80x112  
             self.duck_rect = pygame.Rect(0, 0, 80, 112)
+        self.collision_rect = pygame.Rect(0, 0, 0, 0)  # Reused by get_collision_rect()
+    
+    def load_skins(self):
+        """Build the frame table of every skin (file based and tinted)"""
+        skins = {}
+        for sheet_type, sheet_path in self.sprite_sheets.items():
+            try:
+                skins[sheet_type] = asset_cache.get_frames(sheet_path, self.FRAME_SIZE, self.FRAME_SIZE, self.FRAME_COUNT, self.SCALE)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error loading dino skin {sheet_type}: {e}")
+                
+        if "base" in skins:
+            for sheet_type, tint in self.TINTED_SKINS.items():
+                skins[sheet_type] = asset_cache.get_tinted_frames(
+                    self.sprite_sheets["base"], self.FRAME_SIZE, self.FRAME_SIZE, self.FRAME_COUNT, self.SCALE, tint
+                )
+        return skins
+    
+    def load_effects(self):
+        """Build the frame tables of every effect: (effect, skin) -> frames"""
+        effect_frames = {}
+        for effect, (frame_effect, rate, sheet_types) in self.EFFECTS.items():
+            for sheet_type in sheet_types:
+                try:
+                    effect_frames[(effect, sheet_type)] = asset_cache.get_effect_frames(
+                        self.sprite_sheets[sheet_type], self.FRAME_SIZE, self.FRAME_SIZE, self.FRAME_COUNT, self.SCALE, frame_effect
+                    )
+                except (pygame.error, FileNotFoundError) as e:
+                    print(f"Error loading dino effect {effect} for {sheet_type}: {e}")
+        return effect_frames
+    
+    def reload_sprites(self):
+        """Rebuild every skin and effect table for the current render factor"""
+        self.skins = self.load_skins()
+        self.effect_frames = self.load_effects()
+        self.frames = self.skins.get(self.current_sprite_sheet, self.frames)
+        self.sprite = self.get_frame(self.current_frame)
+        
+    def set_effect(self, effect, delta_time):
+        """Select the visual effect for this tick and advance its clock"""
+        if effect != self.effect:
+            self.effect = effect
+            self.effect_time = 0.0
+        elif effect:
+            self.effect_time += delta_time
     
     def change_sprite_sheet(self, sheet_type):
-        """Change the sprite sheet based on type (base, slow, fast)"""
-        if sheet_type in self.sprite_sheets and sheet_type != self.current_sprite_sheet:
+        """Change the sprite sheet based on type (base, slow, gold, god)"""
+        if sheet_type in self.skins and sheet_type != self.current_sprite_sheet:
             self.current_sprite_sheet = sheet_type
-            # Reload sprite sheet with the new image
-            self.load_sprite_sheet(self.sprite_sheets[sheet_type], 24, 24, 24, 8.0)
+            # Swap to the preloaded frame table
+            self.frames = self.skins[sheet_type]
             # Reset animation to avoid flickering
             self.state_frame_index = 0
             self.animation_timer = 0.0
-            print(f"Dino sprite changed to: {sheet_type}")
+            if self.verbose:
+                print(f"Dino sprite changed to: {sheet_type}")
+        
+    def save_state(self):
+        """GameObject state plus the dino's animation state, skin and effect"""
+        return (super().save_state(), self.state, self.on_ground, self.jumped, self.current_sprite_sheet,
+                self.state_frame_index, self.effect, self.effect_time)
+        
+    def restore_state(self, state):
+        object_state, self.state, self.on_ground, self.jumped, sheet_type, self.state_frame_index, self.effect, self.effect_time = state
+        self.current_sprite_sheet = sheet_type
+        self.frames = self.skins.get(sheet_type, self.frames)
+        super().restore_state(object_state)
+        
+    def update(self, delta_time, game_running, ground_y, active_powerups=None, score=0, tick_input=None):
+        """Update dinosaur physics and animation
+        
+        tick_input is the player's TickInput (jump/duck) for this tick;
+        None means no buttons are held.
+        """
+        self.store_previous_position()
         
-    def update(self, delta_time, game_running, ground_y, active_powerups=None, score=0):
-        """Update dinosaur physics and animation"""
         # Check sprite sheet conditions based on active powerups
         if active_powerups:
             if "godmode" in active_powerups:
@@ -98,6 +180,8 @@ class Dino(GameObject):
             #     self.change_sprite_sheet("base")
             self.change_sprite_sheet("base")  # Always use base when no powerups
             
+        self.set_effect("invincible" if active_powerups and "godmode" in active_powerups else None, delta_time)
+            
         # Apply gravity
         self.velocity.y += self.GRAVITY * delta_time
         
@@ -111,20 +195,18 @@ class Dino(GameObject):
             self.on_ground = False
             
         # Handle input and set state
-        keys = pygame.key.get_pressed()
-        
         old_state = self.state
+        self.jumped = False
         
         if self.on_ground:
             if not game_running:
                 self.state = "idle"
             else:
-                if keys[pygame.K_SPACE] or keys[pygame.K_UP]:
+                if tick_input and tick_input.jump:
                     self.velocity.y = self.JUMP_SPEED
                     self.state = "jump"
-                    if self.jump_sound:
-                        self.jump_sound.play()
-                elif keys[pygame.K_DOWN]:
+                    self.jumped = True
+                elif tick_input and tick_input.duck:
                     self.state = "duck"
                 else:
                     self.state = "run"
@@ -156,42 +238,46 @@ class Dino(GameObject):
             # Get current frame for this state
             current_frame = frames[self.state_frame_index % len(frames)]
             self.sprite = self.get_frame(current_frame)
+            self.current_frame = current_frame
         
     def get_collision_rect(self):
-        """Get the appropriate collision rectangle based on state"""
+        """Get the appropriate collision rectangle based on state
+
+        The same Rect is updated and returned on every call; copy it to keep it.
+        """
+        rect = self.collision_rect
         if self.state == "duck" and self.duck_rect:
-            rect = self.duck_rect.copy()
+            rect.width = self.duck_rect.width
+            rect.height = self.duck_rect.height
             # Position duck collision (original had position offset of -1, 1 at scale 8)
             rect.centerx = self.position.x - 8  # -1 * 8 scale
             rect.centery = self.position.y + 8   # +1 * 8 scale
             return rect
         elif self.run_rect:
-            rect = self.run_rect.copy()
+            rect.width = self.run_rect.width
+            rect.height = self.run_rect.height
             # Position run collision (original had position offset of -1, 0 at scale 8)
             rect.centerx = self.position.x - 8  # -1 * 8 scale
             rect.centery = self.position.y       # 0 offset
             return rect
         return self.rect
         
-    def draw(self, screen, is_invincible=False):
+    def get_draw_sprite(self, is_invincible=False):
+        """The surface draw() blits this frame (the sprite or an effect frame)"""
+        effect = self.effect or ("invincible" if is_invincible else None)
+        if effect:
+            frame_effect, rate, sheet_types = self.EFFECTS[effect]
+            effect_frames = self.effect_frames.get((effect, self.current_sprite_sheet))
+            # Flashing effects show the plain sprite every other toggle
+            if effect_frames and self.current_frame < len(effect_frames) and (not rate or int(self.effect_time * rate) % 2):
+                return effect_frames[self.current_frame]
+        return self.sprite
+        
+    def draw(self, screen, is_invincible=False, alpha=1.0):
         """Draw the dinosaur with proper animation"""
         if self.visible and self.sprite:
-            # Update rect position to match current position
-            self.rect.center = (self.position.x, self.position.y)
-            
-            # Apply visual effect if invincible (flashing/transparent)
-            if is_invincible:
-                # Create a semi-transparent version for invincibility effect
-                import time
-                flash_rate = 4  # flashes per second
-                alpha = 128 if int(time.time() * flash_rate) % 2 else 255
-                
-                # Create a copy of the sprite with alpha
-                temp_sprite = self.sprite.copy()
-                temp_sprite.set_alpha(alpha)
-                screen.blit(temp_sprite, self.rect)
-            else:
-                screen.blit(self.sprite, self.rect)
+            # Interpolated position between the last two simulation ticks
+            screen.blit(self.get_draw_sprite(is_invincible), self.get_render_rect(alpha))
             
             # Debug: Draw collision rectangles (remove in final version)
             # collision_rect = self.get_collision_rect()
@@ -0,0 +1,163 @@
+import os
+import numpy as np
+import pygame
+from .simulation import Simulation, TickInput, NO_INPUT
+from .obstacles import Bird
+
+# Discrete actions
+ACTION_NONE = 0
+ACTION_JUMP = 1
+ACTION_DUCK = 2
+ACTION_INPUTS = (NO_INPUT, TickInput(True, False), TickInput(False, True))
+
+DINO_STATES = ("idle", "run", "jump", "duck")
+POWERUPS = ("halfspeed", "doublegold", "godmode")
+
+class DinoEnv:
+    """Gym-style environment around Simulation for bots
+
+    reset() -> observation
+    step(action) -> (observation, reward, done, info)
+
+    Observation modes:
+    - "vector": float32 feature vector (see observation_size)
+        dino y, dino vertical velocity, on_ground, one-hot state (4),
+        speed, then (dx, y, width, height, is_bird) for the next k
+        obstacles ahead of the dino, then the remaining seconds of each
+        powerup (halfspeed, doublegold, godmode).
+    - "pixels": (H // downsample, W // downsample, 3) uint8 RGB view of the
+        render surface. The view shares memory with the surface (no copy),
+        so it is overwritten by the next step; copy it to keep it.
+
+    Reward is +1 per tick survived plus the coins collected on that tick.
+
+    Performance target: with rendering off ("vector" mode) the environment
+    must sustain at least 20,000 steps per second on one core; check with
+    python benchmarks/environment_steps.py.
+    """
+
+    def __init__(self, observation="vector", k_obstacles=3, downsample=4, render=None, seed=None,
+                 screen_width=1152, screen_height=648):
+        if observation not in ("vector", "pixels"):
+            raise ValueError(f"Unknown observation mode: {observation}")
+        self.observation_mode = observation
+        self.k_obstacles = k_obstacles
+        self.downsample = downsample
+        self.render_enabled = observation == "pixels" if render is None else render
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+
+        # Rendering needs a display for convert_alpha; SDL's dummy driver works without a screen
+        self.background = None
+        self.render_surface = None
+        self.pixel_buffer = None
+        if self.render_enabled:
+            self._init_rendering()
+
+        ground_y = self.background.get_ground_y() if self.background else None
+        self.simulation = Simulation(screen_width, screen_height, ground_y, seed)
+        self.observation_size = 1 + 1 + 1 + len(DINO_STATES) + 1 + 5 * k_obstacles + len(POWERUPS)
+        self._vector = np.zeros(self.observation_size, dtype=np.float32)
+
+    def _init_rendering(self):
+        """Create the render surface on top of a numpy buffer we own"""
+        from .background import Background
+
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        if not pygame.display.get_init():
+            pygame.display.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))
+
+        # Blitting into a surface created from our buffer updates the array in
+        # place, so pixel observations are strided views, not copies
+        self.pixel_buffer = np.zeros((self.screen_height, self.screen_width, 4), dtype=np.uint8)
+        self.render_surface = pygame.image.frombuffer(self.pixel_buffer, (self.screen_width, self.screen_height), "BGRA")
+        self.background = Background(self.screen_width, self.screen_height)
+
+    def reset(self, seed=None):
+        """Start a new run and return the first observation"""
+        self.simulation.new_game(seed)
+        self.simulation.start()
+        if self.render_enabled:
+            self.render()
+        return self.observation()
+
+    def step(self, action):
+        """Advance one tick with a discrete action (ACTION_NONE/JUMP/DUCK)"""
+        simulation = self.simulation
+        coins_before = simulation.token_score
+        simulation.step(Simulation.FIXED_DELTA, ACTION_INPUTS[action])
+        if self.render_enabled:
+            self.background.update(Simulation.FIXED_DELTA, simulation.speed)
+            self.render()
+
+        done = not simulation.game_running
+        reward = (0.0 if done else 1.0) + (simulation.token_score - coins_before)
+        info = {
+            "score": int(simulation.score),
+            "coins": simulation.token_score,
+            "ticks": simulation.ticks,
+            "seed": simulation.seed,
+        }
+        return self.observation(), reward, done, info
+
+    def observation(self):
+        """Build the observation for the current tick"""
+        if self.observation_mode == "pixels":
+            return self.pixels()
+        return self.vector()
+
+    def vector(self):
+        """Compact feature vector (reuses one array between calls)"""
+        simulation = self.simulation
+        dino = simulation.dino
+        vector = self._vector
+        vector[:] = 0.0
+        vector[0] = dino.position.y
+        vector[1] = dino.velocity.y
+        vector[2] = dino.on_ground
+        vector[3 + DINO_STATES.index(dino.state)] = 1.0
+        index = 3 + len(DINO_STATES)
+        vector[index] = simulation.speed
+        index += 1
+
+        # Next k obstacles whose right edge is still ahead of the dino's left edge (the list is x-sorted)
+        dino_left = dino.get_collision_rect().left
+        slot = 0
+        for obstacle in simulation.obstacle_manager.obstacles:
+            rect = obstacle.rect
+            if rect.right <= dino_left:
+                continue
+            base = index + slot * 5
+            vector[base] = rect.left - dino_left
+            vector[base + 1] = rect.top
+            vector[base + 2] = rect.width
+            vector[base + 3] = rect.height
+            vector[base + 4] = isinstance(obstacle, Bird)
+            slot += 1
+            if slot == self.k_obstacles:
+                break
+        index += 5 * self.k_obstacles
+
+        for slot, name in enumerate(POWERUPS):
+            vector[index + slot] = simulation.active_powerups.get(name, 0.0)
+        return vector
+
+    def pixels(self):
+        """Downsampled RGB view of the last rendered frame (no copy)"""
+        if self.pixel_buffer is None:
+            raise RuntimeError("Pixel observations need render=True")
+        step = self.downsample
+        # Buffer is BGRA; reversing the first three channels gives RGB
+        return self.pixel_buffer[::step, ::step, 2::-1]
+
+    def render(self):
+        """Draw the current simulation state to the render surface"""
+        surface = self.render_surface
+        simulation = self.simulation
+        self.background.draw(surface)
+        simulation.obstacle_manager.draw(surface)
+        simulation.token_manager.draw(surface)
+        simulation.dino.draw(surface, simulation.is_invincible)
+        return surface
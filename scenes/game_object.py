@@ -1,18 +1,23 @@
 import pygame
 import math
+from .assets import asset_cache
 
 class GameObject:
     """Base class for all game objects"""
     
     def __init__(self, x=0, y=0):
         self.position = pygame.math.Vector2(x, y)
+        self.previous_position = pygame.math.Vector2(x, y)  # Position at the start of the last tick
         self.velocity = pygame.math.Vector2(0, 0)
         self.sprite = None
+        self.sprite_path = None
         self.rect = None
+        self.render_rect = pygame.Rect(0, 0, 0, 0)  # Reused for interpolated drawing
         self.visible = True
         
         # Animation support
-        self.sprite_sheet = None
+        self.sprite_sheet_path = None
+        self.frames = ()  # Pre-scaled frame table shared with other instances
         self.current_frame = 0
         self.frame_count = 1
         self.frame_width = 0
@@ -24,13 +29,12 @@ class GameObject:
     def load_sprite(self, image_path, scale=1.0):
         """Load and scale a sprite"""
         try:
-            self.sprite = pygame.image.load(image_path).convert_alpha()
+            # Shared, already converted surface from the asset cache
+            self.sprite = asset_cache.get_image(image_path, scale)
+            self.sprite_path = image_path
             self.scale = scale
-            if scale != 1.0:
-                width = int(self.sprite.get_width() * scale)
-                height = int(self.sprite.get_height() * scale)
-                self.sprite = pygame.transform.scale(self.sprite, (width, height))
-            self.rect = self.sprite.get_rect()
+            # Collision size is the logical size, whatever resolution the sprite is drawn at
+            self.rect = pygame.Rect((0, 0), asset_cache.get_size(image_path, scale))
             self.rect.center = (self.position.x, self.position.y)
         except pygame.error as e:
             print(f"Error loading sprite {image_path}: {e}")
@@ -38,64 +42,111 @@ class GameObject:
     def load_sprite_sheet(self, image_path, frame_width, frame_height, frame_count, scale=1.0):
         """Load a sprite sheet for animation"""
         try:
-            self.sprite_sheet = pygame.image.load(image_path).convert_alpha()
+            # Frames are sliced and scaled once per sheet/scale, then shared
+            self.frames = asset_cache.get_frames(image_path, frame_width, frame_height, frame_count, scale)
+            self.sprite_sheet_path = image_path
             self.frame_width = frame_width
             self.frame_height = frame_height
             self.frame_count = frame_count
             self.scale = scale
             self.current_frame = 0
             
-            # Extract and scale the first frame as default sprite
-            frame_rect = pygame.Rect(0, 0, frame_width, frame_height)
-            self.sprite = self.sprite_sheet.subsurface(frame_rect).copy()
+            # First frame is the default sprite
+            self.sprite = self.frames[0]
             
-            if scale != 1.0:
-                scaled_width = int(frame_width * scale)
-                scaled_height = int(frame_height * scale)
-                self.sprite = pygame.transform.scale(self.sprite, (scaled_width, scaled_height))
-                
-            self.rect = self.sprite.get_rect()
+            self.rect = pygame.Rect((0, 0), asset_cache.frame_size(frame_width, frame_height, scale))
             self.rect.center = (self.position.x, self.position.y)
         except pygame.error as e:
             print(f"Error loading sprite sheet {image_path}: {e}")
             
-    def get_frame(self, frame_index):
-        """Get a specific frame from the sprite sheet"""
-        if not self.sprite_sheet or frame_index >= self.frame_count:
-            return self.sprite
+    def reload_sprites(self):
+        """Fetch sprites again after asset_cache.set_render_factor() dropped them"""
+        if self.sprite_sheet_path:
+            self.frames = asset_cache.get_frames(self.sprite_sheet_path, self.frame_width, self.frame_height, self.frame_count, self.scale)
+            self.sprite = self.get_frame(self.current_frame)
+        elif self.sprite_path:
+            self.sprite = asset_cache.get_image(self.sprite_path, self.scale)
             
-        frame_x = (frame_index * self.frame_width) % self.sprite_sheet.get_width()
-        frame_y = ((frame_index * self.frame_width) // self.sprite_sheet.get_width()) * self.frame_height
-        
-        frame_rect = pygame.Rect(frame_x, frame_y, self.frame_width, self.frame_height)
-        frame = self.sprite_sheet.subsurface(frame_rect).copy()
+    def reset(self, x=0, y=0):
+        """Return a recycled object to its freshly created state at (x, y)"""
+        self.position.update(x, y)
+        self.previous_position.update(x, y)
+        self.velocity.update(0, 0)
+        self.visible = True
+        self.current_frame = 0
+        self.animation_timer = 0.0
+        if self.frames:
+            self.sprite = self.frames[0]
+        if self.rect:
+            self.rect.center = (x, y)
+            
+    def save_state(self):
+        """Moving and animation state as a tuple for restore_state()"""
+        position, previous, velocity = self.position, self.previous_position, self.velocity
+        return (position.x, position.y, previous.x, previous.y, velocity.x, velocity.y,
+                self.visible, self.current_frame, self.animation_timer)
         
-        if self.scale != 1.0:
-            scaled_width = int(self.frame_width * self.scale)
-            scaled_height = int(self.frame_height * self.scale)
-            frame = pygame.transform.scale(frame, (scaled_width, scaled_height))
+    def restore_state(self, state):
+        """Put back a save_state() tuple (the sprite and rect follow from it)"""
+        x, y, previous_x, previous_y, velocity_x, velocity_y, self.visible, self.current_frame, self.animation_timer = state
+        self.position.update(x, y)
+        self.previous_position.update(previous_x, previous_y)
+        self.velocity.update(velocity_x, velocity_y)
+        if self.frames:
+            self.sprite = self.get_frame(self.current_frame)
+        if self.rect:
+            self.rect.center = (x, y)
             
-        return frame
+    def get_frame(self, frame_index):
+        """Get a specific frame from the pre-scaled frame table"""
+        if frame_index >= len(self.frames):
+            return self.sprite
+        return self.frames[frame_index]
         
     def update_animation(self, delta_time):
         """Update animation frame"""
-        if self.sprite_sheet and self.frame_count > 1:
+        if self.frame_count > 1 and self.frames:
             self.animation_timer += delta_time
             if self.animation_timer >= 1.0 / self.animation_speed:
                 self.current_frame = (self.current_frame + 1) % self.frame_count
-                self.sprite = self.get_frame(self.current_frame)
+                self.sprite = self.frames[self.current_frame]
                 self.animation_timer = 0.0
             
+    def store_previous_position(self):
+        """Remember where the object was before this tick (for interpolation)"""
+        self.previous_position.update(self.position)
+        
+    def snapshot_positions(self):
+        """(previous, current) centre as tuples, for drawing from a FrameSnapshot"""
+        return (self.previous_position.x, self.previous_position.y), (self.position.x, self.position.y)
+        
+    def get_render_rect(self, alpha=1.0):
+        """Get the sprite rect at a point between the last two ticks
+        
+        alpha is how far the renderer is into the next tick (0..1); 1.0 draws
+        at the current simulated position. The rect is in render target
+        pixels (world position divided by asset_cache.render_factor).
+        """
+        x = self.previous_position.x + (self.position.x - self.previous_position.x) * alpha
+        y = self.previous_position.y + (self.position.y - self.previous_position.y) * alpha
+        factor = asset_cache.render_factor
+        self.render_rect.size = self.sprite.get_size()
+        self.render_rect.center = (x / factor, y / factor)
+        return self.render_rect
+            
     def update(self, delta_time):
         """Update the game object"""
-        self.position += self.velocity * delta_time
+        # Per component, so no Vector2 is built every tick
+        position, velocity = self.position, self.velocity
+        position.x += velocity.x * delta_time
+        position.y += velocity.y * delta_time
         if self.rect:
             self.rect.center = (self.position.x, self.position.y)
             
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         """Draw the game object"""
         if self.visible and self.sprite:
-            screen.blit(self.sprite, self.rect)
+            screen.blit(self.sprite, self.get_render_rect(alpha))
             
     def get_rect(self):
         """Get the collision rectangle"""
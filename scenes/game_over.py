@@ -1,8 +1,17 @@
 import pygame
 from .path_utils import get_resource_path
+from .text import text_cache
 
 class GameOver:
-    """Game over screen"""
+    """Game over screen
+    
+    Nothing under the screen changes while it is up, so the first draw after
+    show() takes a snapshot of the frame beneath it and bakes the darkened
+    snapshot and the text into one opaque surface. Every later draw is a
+    single blit; the surface is rebuilt only if the scores change.
+    """
+    
+    SHADOW_OFFSET = 3
     
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
@@ -22,6 +31,7 @@ class GameOver:
         # Colors
         self.text_color = (255, 255, 255)
         self.shadow_color = (0, 0, 0)
+        self.shadow_offset = self.SHADOW_OFFSET  # 0 turns text shadows off
         self.background_color = (0, 0, 0, 128)  # Semi-transparent black
         
         # Create semi-transparent overlay
@@ -29,50 +39,67 @@ class GameOver:
         self.overlay.set_alpha(128)
         self.overlay.fill((0, 0, 0))
         
+        # Cached composite (see class docstring)
+        self.snapshot = None  # Last game frame, taken by the first draw
+        self.composite = None
+        self.composite_scores = None  # (final_score, high_score) baked into the composite
+        
     def show(self):
         """Show the game over screen"""
         self.visible = True
+        self.snapshot = None
+        self.composite = None
         
     def hide(self):
         """Hide the game over screen"""
         self.visible = False
+        self.snapshot = None
+        self.composite = None
         
-    def draw_text_with_shadow(self, screen, text, font, x, y, color=None, shadow_offset=3):
-        """Draw text with shadow effect"""
-        if color is None:
-            color = self.text_color
-            
-        # Draw shadow
-        shadow_surface = font.render(text, True, self.shadow_color)
-        screen.blit(shadow_surface, (x + shadow_offset, y + shadow_offset))
+    def set_shadow_offset(self, shadow_offset):
+        """Change the text shadow (0 for none); the composite is rebuilt on the next draw"""
+        if shadow_offset != self.shadow_offset:
+            self.shadow_offset = shadow_offset
+            self.composite = None
         
-        # Draw main text
-        text_surface = font.render(text, True, color)
-        screen.blit(text_surface, (x, y))
+    def is_built(self, final_score, high_score):
+        """True when draw() will only blit the cached composite (the frame beneath is not needed)"""
+        return self.visible and self.composite is not None and self.composite_scores == (final_score, high_score)
         
-        return text_surface.get_width(), text_surface.get_height()
+    def build(self, final_score, high_score):
+        """Bake the darkened snapshot and the text into the composite"""
+        composite = self.snapshot.copy()
+        composite.blit(self.overlay, (0, 0))
+        for text, font, x, y, color in self.layout(final_score, high_score):
+            self.draw_text_with_shadow(composite, text, font, x, y, color)
+        self.composite = composite
+        self.composite_scores = (final_score, high_score)
         
-    def draw(self, screen, final_score, high_score):
-        """Draw the game over screen"""
-        if not self.visible:
-            return
-            
-        # Draw overlay
-        screen.blit(self.overlay, (0, 0))
+    def draw_text_with_shadow(self, screen, text, font, x, y, color=None, shadow_offset=None):
+        """Draw text with a shadow effect (rendered once and cached, digits from an atlas)"""
+        if color is None:
+            color = self.text_color
+        if shadow_offset is None:
+            shadow_offset = self.shadow_offset
+        return text_cache.draw(screen, text, font, x, y, color, self.shadow_color, shadow_offset)
+        
+    def layout(self, final_score, high_score):
+        """Text to draw as (text, font, x, y, color) tuples"""
+        lines = []
         
         # Game Over text
         game_over_text = "GAME OVER"
         text_width, text_height = self.large_font.size(game_over_text)
         x = (self.screen_width - text_width) // 2
         y = self.screen_height // 2 - 100
-        self.draw_text_with_shadow(screen, game_over_text, self.large_font, x, y)
+        lines.append((game_over_text, self.large_font, x, y, self.text_color))
         
         # Final score
         score_text = f"FINAL SCORE: {final_score // 10}"
         score_width, score_height = self.font.size(score_text)
         score_x = (self.screen_width - score_width) // 2
         score_y = y + text_height + 30
-        self.draw_text_with_shadow(screen, score_text, self.font, score_x, score_y)
+        lines.append((score_text, self.font, score_x, score_y, self.text_color))
         
         # High score
         if final_score > high_score:
@@ -85,18 +112,30 @@ class GameOver:
         hs_width, hs_height = self.font.size(high_score_text)
         hs_x = (self.screen_width - hs_width) // 2
         hs_y = score_y + score_height + 20
-        self.draw_text_with_shadow(screen, high_score_text, self.font, hs_x, hs_y, hs_color)
+        lines.append((high_score_text, self.font, hs_x, hs_y, hs_color))
         
         # Restart instruction
         restart_text = "PRESS SPACE TO RESTART"
         restart_width, restart_height = self.font.size(restart_text)
         restart_x = (self.screen_width - restart_width) // 2
         restart_y = hs_y + hs_height + 40
-        self.draw_text_with_shadow(screen, restart_text, self.font, restart_x, restart_y)
+        lines.append((restart_text, self.font, restart_x, restart_y, self.text_color))
         
         # Quit instruction
         quit_text = "PRESS ESC TO QUIT"
         quit_width, quit_height = self.font.size(quit_text)
         quit_x = (self.screen_width - quit_width) // 2
         quit_y = restart_y + restart_height + 20
-        self.draw_text_with_shadow(screen, quit_text, self.font, quit_x, quit_y)
+        lines.append((quit_text, self.font, quit_x, quit_y, self.text_color))
+        return lines
+        
+    def draw(self, screen, final_score, high_score):
+        """Draw the game over screen over the frame already on screen"""
+        if not self.visible:
+            return
+            
+        if not self.is_built(final_score, high_score):
+            if self.snapshot is None:
+                self.snapshot = screen.copy()
+            self.build(final_score, high_score)
+        screen.blit(self.composite, (0, 0))
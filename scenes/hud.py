@@ -1,9 +1,12 @@
 import pygame
 from .path_utils import get_resource_path
+from .text import text_cache
 
 class HUD:
     """Heads-up display for showing score and UI elements"""
     
+    SHADOW_OFFSET = 2
+    
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -21,38 +24,43 @@ class HUD:
         # Colors
         self.text_color = (255, 255, 255)  # White
         self.shadow_color = (0, 0, 0)     # Black shadow
+        self.shadow_offset = self.SHADOW_OFFSET  # 0 turns text shadows off
+        self.replay_color = (255, 80, 80)
+        
+        # Score, coins, FPS and timers draw their digits from pre-rendered atlases
+        for color in (self.text_color, (255, 215, 0), (128, 0, 128), (255, 165, 0), (0, 255, 0), self.replay_color):
+            text_cache.get_atlas(self.font, color, self.shadow_color, self.shadow_offset)
         
         # UI state
         self.show_start_label = True
         
-    def draw_text_with_shadow(self, screen, text, font, x, y, color=None, shadow_offset=2):
-        """Draw text with a shadow effect"""
+    def draw_text_with_shadow(self, screen, text, font, x, y, color=None, shadow_offset=SHADOW_OFFSET):
+        """Draw text with a shadow effect (rendered once and cached, digits from an atlas)"""
         if color is None:
             color = self.text_color
-            
-        # Draw shadow
-        shadow_surface = font.render(text, True, self.shadow_color)
-        screen.blit(shadow_surface, (x + shadow_offset, y + shadow_offset))
+        return text_cache.draw(screen, text, font, x, y, color, self.shadow_color, shadow_offset)
         
-        # Draw main text
-        text_surface = font.render(text, True, color)
-        screen.blit(text_surface, (x, y))
+    def layout(self, score, high_score, game_running, token_score=0, active_powerups=None, fps=None, quality=None, replay=None, rewind=None, autopilot=False):
+        """Text to draw this frame as (text, font, x, y, color) tuples
         
-        return text_surface.get_width(), text_surface.get_height()
+        quality is the name of the current render quality level, shown next
+        to the FPS. replay is the playback position while a replay plays,
+        rewind the seconds left to rewind while rewinding. autopilot shows
+        that the autopilot is playing.
+        """
+        lines = []
         
-    def draw(self, screen, score, high_score, game_running, token_score=0, active_powerups=None, fps=None):
-        """Draw the HUD elements"""
         # Score
         score_text = f"SCORE: {score // 10}"  # Match original SCORE_MODIFIER
-        self.draw_text_with_shadow(screen, score_text, self.font, 20, 20)
+        lines.append((score_text, self.font, 20, 20, self.text_color))
         
         # High Score
         high_score_text = f"HIGH SCORE: {high_score // 10}"
-        self.draw_text_with_shadow(screen, high_score_text, self.font, 20, 50)
+        lines.append((high_score_text, self.font, 20, 50, self.text_color))
         
         # Coin Score
         coin_text = f"COINS: {token_score}"
-        self.draw_text_with_shadow(screen, coin_text, self.font, 20, 80, (255, 215, 0))  # Gold color
+        lines.append((coin_text, self.font, 20, 80, (255, 215, 0)))  # Gold color
 
         # FPS display (top-right)
         if fps is not None:
@@ -60,11 +68,22 @@ class HUD:
                 fps_text = f"FPS: {int(fps)}"
             except Exception:
                 fps_text = f"FPS: {fps:.1f}"
+            if quality:
+                fps_text += f" ({quality.upper()})"
             text_width, text_height = self.font.size(fps_text)
             x = self.screen_width - text_width - 20
             y = 20
-            self.draw_text_with_shadow(screen, fps_text, self.font, x, y, (255, 255, 255))
+            lines.append((fps_text, self.font, x, y, (255, 255, 255)))
         
+        # Replay position or rewind (top-right, under the FPS)
+        if replay or rewind is not None:
+            replay_text = f"REPLAY {replay}" if replay else f"REWIND {rewind:.1f}s"
+            text_width, text_height = self.font.size(replay_text)
+            lines.append((replay_text, self.font, self.screen_width - text_width - 20, 50, self.replay_color))
+        if autopilot:
+            text_width, text_height = self.font.size("AUTOPILOT")
+            lines.append(("AUTOPILOT", self.font, self.screen_width - text_width - 20, 80, self.replay_color))
+            
         # Active Powerups
         if active_powerups and len(active_powerups) > 0:
             y_offset = 110
@@ -82,7 +101,7 @@ class HUD:
                     powerup_text = f"{powerup_name.upper()}: {remaining_time:.1f}s"
                     color = (255, 255, 255)  # White
                 
-                self.draw_text_with_shadow(screen, powerup_text, self.font, 20, y_offset, color)
+                lines.append((powerup_text, self.font, 20, y_offset, color))
                 y_offset += 30
         
         # Start label
@@ -91,7 +110,7 @@ class HUD:
             text_width, text_height = self.font.size(start_text)
             x = (self.screen_width - text_width) // 2
             y = (self.screen_height - text_height) // 2
-            self.draw_text_with_shadow(screen, start_text, self.large_font, x, y)
+            lines.append((start_text, self.large_font, x, y, self.text_color))
             
             # Instructions
             instructions = [
@@ -103,7 +122,22 @@ class HUD:
                 inst_width, inst_height = self.font.size(instruction)
                 inst_x = (self.screen_width - inst_width) // 2
                 inst_y = y + text_height + 40 + (i * 30)
-                self.draw_text_with_shadow(screen, instruction, self.font, inst_x, inst_y)
+                lines.append((instruction, self.font, inst_x, inst_y, self.text_color))
+                
+        return lines
+        
+    def text_rect(self, line):
+        """Screen area covered by a layout line, shadow included"""
+        text, font, x, y, color = line
+        width, height = font.size(text)
+        return pygame.Rect(x, y, width + self.shadow_offset, height + self.shadow_offset)
+        
+    def draw(self, screen, score, high_score, game_running, token_score=0, active_powerups=None, fps=None, quality=None, lines=None, replay=None, rewind=None, autopilot=False):
+        """Draw the HUD elements (lines: a layout() result to reuse)"""
+        if lines is None:
+            lines = self.layout(score, high_score, game_running, token_score, active_powerups, fps, quality, replay, rewind, autopilot)
+        for text, font, x, y, color in lines:
+            self.draw_text_with_shadow(screen, text, font, x, y, color, self.shadow_offset)
                 
     def hide_start_label(self):
         """Hide the start label when game begins"""
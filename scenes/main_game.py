@@ -1,66 +1,157 @@
 import pygame
 import sys
-import json
 import os
 import random
-from .dino import Dino
-from .obstacles import ObstacleManager
-from .tokens import TokenManager
+import sqlite3
+import threading
+import time
+from .obstacles import ObstacleFactory
+from .tokens import Token
+from .simulation import Simulation, TickInput
 from .background import Background
 from .hud import HUD
 from .game_over import GameOver
+from .renderer import DirtyRectRenderer
+from .pipeline import FramePipeline, FrameSnapshot, LatencyTracker, SpriteState, sprite_rect
+from .profiler import FrameProfiler, ProfilerOverlay
+from .quality import QualityGovernor
+from .policies import LookaheadPolicy
+from .replay import ReplayPlayer, ReplayRecorder
+from .rewind import GameState, RewindBuffer
+from .run_store import RunStore, run_record
+from .dino import Dino
+from .assets import asset_cache
 from .path_utils import get_resource_path, get_save_path
 
 class MainGame:
-    """Main game class managing the entire game state"""
+    """Main game class: window, input, audio and rendering on top of Simulation"""
+    
+    # Constants for game settings (the simulation owns the values)
+    DINO_START_POS = Simulation.DINO_START_POS
+    START_SPEED = Simulation.START_SPEED
+    MAX_SPEED = Simulation.MAX_SPEED
+    SPEED_MODIFIER = Simulation.SPEED_MODIFIER
+    SCORE_MODIFIER = Simulation.SCORE_MODIFIER
+    MAX_DIFFICULTY = Simulation.MAX_DIFFICULTY
+    
+    # Render loop settings (the simulation always ticks at Simulation.TICK_RATE)
+    MAX_FPS = 240
+    MAX_FRAME_TIME = 0.25
+    
+    # Low-resolution mode: the art is drawn at 3x, so the scene is rendered at
+    # 1/3 size with unscaled sprites and upscaled once per frame
+    LOW_RES_FACTOR = 3
+    
+    # Frame rate the adaptive quality governor budgets for
+    TARGET_FPS = 60
+    
+    # Pipelined mode: seconds between input polls while waiting for the next
+    # tick, and the longest wait for a due tick to run on fresh input
+    INPUT_POLL = 0.001
+    TICK_WAIT = 0.002
     
-    # Constants for game settings
-    DINO_START_POS = (150, 485)
-    START_SPEED = 200.0  # Higher starting speed
-    MAX_SPEED = 1000.0  # Much higher max speed
-    SPEED_MODIFIER = 50  # Lower modifier means faster speed gain
-    SCORE_MODIFIER = 10
-    MAX_DIFFICULTY = 2
+    # Keys the simulation reads (jump and duck)
+    JUMP_KEYS = (pygame.K_SPACE, pygame.K_UP)
+    DUCK_KEYS = (pygame.K_DOWN,)
     
-    def __init__(self, screen_width=1152, screen_height=648):
+    # Replay playback: seconds LEFT and RIGHT seek by
+    REPLAY_SEEK_STEP = 5.0
+    
+    # Rewind: hold REWIND_KEY to run the last REWIND_SECONDS backwards
+    REWIND_SECONDS = 10.0
+    REWIND_KEY = pygame.K_r
+    
+    # Autopilot: AUTOPILOT_KEY toggles a LookaheadPolicy playing in place of the keys;
+    # each decision searches for at most AUTOPILOT_TIME_BUDGET seconds
+    AUTOPILOT_KEY = pygame.K_a
+    AUTOPILOT_TIME_BUDGET = 0.004
+    
+    def __init__(self, screen_width=1152, screen_height=648, low_res=False, background_quality="high", dirty_rects=True, adaptive_quality=False, pipelined=False, run_store_path=None, verbose=True):
         pygame.init()
         pygame.mixer.init()
+        self.verbose = verbose  # Print game events and asset loading (benchmarks turn it off)
 
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.screen = pygame.display.set_mode((screen_width, screen_height))
         pygame.display.set_caption("Dino Run")
+        
+        # Scene render target: the window itself, or a native low-res surface
+        self.render_factor = self.LOW_RES_FACTOR if low_res else 1
+        asset_cache.set_render_factor(self.render_factor)
+        if self.render_factor > 1:
+            self.scene_surface = pygame.Surface((screen_width // self.render_factor, screen_height // self.render_factor)).convert()
+        else:
+            self.scene_surface = self.screen
+
+        # Per-phase frame timings ('P' shows them, 'T' records a trace); sections
+        # cost next to nothing while it is off
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = None  # Built the first time it is shown
+        self.show_profiler = False
+        self.trace_path = None  # Where toggle_trace() writes; a timestamped file when None
+        
+        # Only redraw and present what changed (static screens present nothing)
+        self.renderer = DirtyRectRenderer(self.screen, self.render_factor, self.profiler.section("present"))
+        self.renderer.enabled = dirty_rects
 
         self.clock = pygame.time.Clock()
         self.running = True
-        self.game_running = False
+        
+        # Pipelined mode runs the simulation on its own thread (see run_pipelined);
+        # state_lock is held by whatever changes game state
+        self.pipelined = pipelined
+        self.pipeline = None
+        self.state_lock = threading.Lock()
+        self.tick_count = 0  # Every simulation tick, idle ones too
+        
+        # Input: keys held down (from key events) and press-to-screen latency
+        self.held_keys = set()
+        self.latency = LatencyTracker()
+        
+        # Every run's inputs are recorded; written at game over when replay_dir is set (--record)
+        self.recorder = ReplayRecorder()
+        self.replay_dir = None
+        self.replay_player = None  # Set while playing a replay (start_replay)
+        self.paused = False
+        
+        # States of the last REWIND_SECONDS of running ticks
+        self.rewind = RewindBuffer(int(self.REWIND_SECONDS * Simulation.TICK_RATE))
+        self.rewinding = False  # REWIND_KEY is held
+        self.autopilot = LookaheadPolicy(time_budget=self.AUTOPILOT_TIME_BUDGET)
+        self.autopilot_on = False
+        self.assisted = False  # Rewind or the autopilot was used this run, so it sets no high score
+        
         # Toggle for showing FPS (press 'F' to toggle during runtime)
         self.show_fps = False
 
-        # Game variables
-        self.score = 0
-        self.token_score = 0  # Separate score for tokens collected
+        # Every finished run goes into the run history at run_store_path (written on a
+        # background thread); without one, runs and the high score are not kept
+        self.run_store = self.open_run_store(run_store_path) if run_store_path else None
         self.high_score = self.load_high_score()
-        self.speed = self.START_SPEED
-        self.base_speed = self.START_SPEED  # Store original speed for powerup calculations
-        self.difficulty = 0
-        self.camera_x = 0
+        # RunRecord of the run on the game over screen. Rewind can still take it back
+        # into play, so it is only recorded when the next run starts or the game quits
+        self.finished_run = None
 
-        # Powerup effects
-        self.active_powerups = {}  # Dictionary to track active powerups
-        self.coin_multiplier = 1  # Multiplier for coin collection (doublegold effect)
-        self.is_invincible = False  # God mode invincibility state
+        # Decode and scale every spawnable sprite up front so spawns never touch disk
+        ObstacleFactory.preload_assets()
+        Token.preload_assets()
+        if self.verbose:
+            print(f"Assets preloaded: {asset_cache.stats()}")
 
         # Initialize game objects
-        self.background = Background(screen_width, screen_height)
+        self.background = Background(screen_width, screen_height, background_quality)
         self.ground_y = self.background.get_ground_y()
 
-        # Create dino and position it properly on the ground (a bit lower)
-        self.ground_offset = 40
-        self.dino = Dino(self.DINO_START_POS[0], self.ground_y - self.ground_offset)
-        # Set a ground offset so the dino stays lower
-        self.obstacle_manager = ObstacleManager(screen_width, self.ground_y)
-        self.token_manager = TokenManager(screen_width, self.ground_y)
+        # Game logic (dino, obstacles, tokens, powerups, score) lives in the simulation
+        self.simulation = Simulation(screen_width, screen_height, self.ground_y, verbose=verbose)
+        # Pool obstacles and tokens up front so spawning never allocates mid-run
+        self.simulation.obstacle_manager.prewarm()
+        self.simulation.token_manager.prewarm()
+        # The simulation knows nothing about profiling; its phases are wrapped while profiling is on
+        self.profiler.wrap(self.simulation.dino, "update", "dino.update")
+        self.profiler.wrap(self.simulation.obstacle_manager, "update", "obstacles.update")
+        self.profiler.wrap(self.simulation.token_manager, "update", "tokens.update")
         self.hud = HUD(screen_width, screen_height)
         self.game_over_screen = GameOver(screen_width, screen_height)
 
@@ -68,32 +159,82 @@ class MainGame:
         self.bg_music = None
         self.game_over_sounds = []
         self.coin_sound = None
+        self.jump_sound = None
         self.game_over_played = False  # Flag to prevent repeated game over sound
         self.load_sounds()
 
+        # Adaptive quality: steps render quality down on slow frames, up when there is room
+        self.governor = QualityGovernor(self.apply_quality, self.TARGET_FPS)
+        self.governor.enabled = adaptive_quality
+        if adaptive_quality:
+            self.apply_quality(self.governor.level)
+
         # Initialize new game
         self.new_game()
         
-    def load_high_score(self):
-        """Load high score from file"""
+    # Game state is owned by the simulation; these keep the old attribute names
+    @property
+    def dino(self):
+        return self.simulation.dino
+    
+    @property
+    def obstacle_manager(self):
+        return self.simulation.obstacle_manager
+    
+    @property
+    def token_manager(self):
+        return self.simulation.token_manager
+    
+    @property
+    def game_running(self):
+        return self.simulation.game_running
+    
+    @property
+    def score(self):
+        return self.simulation.score
+    
+    @property
+    def token_score(self):
+        return self.simulation.token_score
+    
+    @property
+    def speed(self):
+        return self.simulation.speed
+    
+    @property
+    def active_powerups(self):
+        return self.simulation.active_powerups
+    
+    @property
+    def is_invincible(self):
+        return self.simulation.is_invincible
+        
+    def open_run_store(self, path):
+        """Open the run history, importing a high_score.json next to it the first time (None if it cannot be opened)"""
         try:
-            score_file = get_save_path("high_score.json")
-            if os.path.exists(score_file):
-                with open(score_file, "r") as f:
-                    data = json.load(f)
-                    return data.get("high_score", 0)
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
-        return 0
-        
-    def save_high_score(self):
-        """Save high score to file"""
+            store = RunStore(path)
+            if store.migrate_high_score(os.path.join(os.path.dirname(os.path.abspath(path)), "high_score.json")) and self.verbose:
+                print("Imported high_score.json into the run history")
+            return store
+        except sqlite3.Error as e:
+            print(f"Error opening the run history: {e}")
+            return None
+        
+    def load_high_score(self):
+        """Best score in the run history"""
+        if self.run_store is None:
+            return 0
         try:
-            score_file = get_save_path("high_score.json")
-            with open(score_file, "w") as f:
-                json.dump({"high_score": self.high_score}, f)
-        except Exception as e:
-            print(f"Error saving high score: {e}")
+            return self.run_store.best_score()
+        except sqlite3.Error as e:
+            print(f"Error loading high score: {e}")
+            return 0
+        
+    def record_run(self):
+        """Queue the finished run (if any) for the run history, once it can no longer be rewound"""
+        if self.finished_run is not None and self.run_store is not None:
+            self.run_store.record(self.finished_run)
+        self.finished_run = None
     
     def load_sounds(self):
         """Load game sounds"""
@@ -101,11 +242,19 @@ class MainGame:
             # Load background music
             self.bg_music = get_resource_path("assets/sound/background.wav")
             
+            # Load jump sound
+            try:
+                self.jump_sound = pygame.mixer.Sound(get_resource_path("assets/sound/jump.wav"))
+                self.jump_sound.set_volume(0.5)
+            except pygame.error as e:
+                print(f"Warning: Could not load jump sound: {e}")
+            
             # Load coin collection sound
             try:
                 self.coin_sound = pygame.mixer.Sound(get_resource_path("assets/sound/coin.wav"))
                 self.coin_sound.set_volume(0.3)
-                print("Coin sound loaded successfully")
+                if self.verbose:
+                    print("Coin sound loaded successfully")
             except pygame.error as e:
                 print(f"Warning: Could not load coin sound: {e}")
             
@@ -120,7 +269,8 @@ class MainGame:
                 except pygame.error as e:
                     print(f"Warning: Could not load {sound_file}: {e}")
             
-            print(f"Loaded {len(self.game_over_sounds)} game over sounds")
+            if self.verbose:
+                print(f"Loaded {len(self.game_over_sounds)} game over sounds")
             
         except Exception as e:
             print(f"Error loading sounds: {e}")
@@ -132,7 +282,8 @@ class MainGame:
                 pygame.mixer.music.load(self.bg_music)
                 pygame.mixer.music.set_volume(0.1)  # Set volume
                 pygame.mixer.music.play(-1)  # -1 means loop indefinitely
-                print("Background music started")
+                if self.verbose:
+                    print("Background music started")
         except pygame.error as e:
             print(f"Error playing background music: {e}")
     
@@ -151,7 +302,8 @@ class MainGame:
                 sound.set_volume(0.5)  # Set volume to 50%
                 sound.play()  # Play once only
                 self.game_over_played = True
-                print("Game over sound played")
+                if self.verbose:
+                    print("Game over sound played")
         except Exception as e:
             print(f"Error playing game over sound: {e}")
     
@@ -161,32 +313,14 @@ class MainGame:
             
     def new_game(self):
         """Reset the game for a new run"""
-        # Reset variables
-        self.score = 0
-        self.token_score = 0
-        self.game_running = False
-        self.difficulty = 0
-        self.speed = self.START_SPEED
-        self.base_speed = self.START_SPEED
-        self.camera_x = 0
-        
-        # Reset powerups
-        self.active_powerups.clear()
-        self.coin_multiplier = 1
-        self.is_invincible = False
+        self.record_run()
+        self.simulation.new_game()
+        self.rewind.clear()
+        self.assisted = False
         
         # Reset game over sound flag
         self.game_over_played = False
         
-        # Reset game objects
-        self.dino.position.x = self.DINO_START_POS[0]
-        self.dino.position.y = self.ground_y + self.ground_offset - self.dino.rect.height // 2  # Use consistent offset
-        self.dino.velocity.x = 0
-        self.dino.velocity.y = 0
-        self.dino.state = "idle"
-        
-        self.obstacle_manager.clear()
-        self.token_manager.clear()
         self.hud.show_start_label_again()
         self.game_over_screen.hide()
         
@@ -199,80 +333,137 @@ class MainGame:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # The window contents were lost; the next frame must repaint everything
+                self.renderer.invalidate()
+            elif event.type == pygame.KEYUP:
+                self.held_keys.discard(event.key)
+                if event.key == self.REWIND_KEY:
+                    self.rewinding = False
             elif event.type == pygame.KEYDOWN:
+                if event.key in self.JUMP_KEYS or event.key in self.DUCK_KEYS:
+                    self.held_keys.add(event.key)
+                    # Events posted by benchmarks carry the time the key was pressed
+                    self.latency.press(getattr(event, "pressed_at", time.perf_counter()))
+                if self.replay_player and self.handle_replay_key(event.key):
+                    continue
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                 elif event.key == pygame.K_SPACE or event.key == pygame.K_UP:
-                    if not self.game_running and not self.game_over_screen.visible:
-                        self.game_running = True
-                        self.hud.hide_start_label()
-                    elif self.game_over_screen.visible:
-                        self.new_game()
+                    with self.state_lock:
+                        if not self.game_running and not self.game_over_screen.visible:
+                            self.simulation.start()
+                            self.hud.hide_start_label()
+                        elif self.game_over_screen.visible:
+                            self.new_game()
                 elif event.key == pygame.K_f:
                     # Toggle FPS display for testing
                     self.show_fps = not getattr(self, 'show_fps', False)
                     print(f"Show FPS: {self.show_fps}")
+                elif event.key == pygame.K_p:
+                    self.set_profiler_visible(not self.show_profiler)
+                elif event.key == pygame.K_t:
+                    self.toggle_trace()
+                elif event.key == self.REWIND_KEY and not self.replay_player:
+                    self.rewinding = True
+                elif event.key == self.AUTOPILOT_KEY and not self.replay_player:
+                    self.set_autopilot(not self.autopilot_on)
+                    
+    def read_input(self):
+        """Sample the held keys into a TickInput for the simulation (the recorded input during a replay)"""
+        if self.replay_player:
+            return self.replay_player.next_input()
+        if self.autopilot_on and self.game_running:
+            self.assisted = True
+            return self.autopilot(self.simulation)
+        held = self.held_keys
+        return TickInput(any(key in held for key in self.JUMP_KEYS), any(key in held for key in self.DUCK_KEYS))
                         
+    def set_autopilot(self, on):
+        """Let the autopilot play (the keys only start and restart runs) or give control back"""
+        with self.state_lock:
+            self.autopilot_on = on
+            self.autopilot.reset()
+        print(f"Autopilot: {on}")
+        
     def update(self, delta_time):
-        """Update game logic"""
+        """Advance the simulation and react to its events"""
+        self.advance(delta_time)
+        self.handle_simulation_events(self.simulation.events)
+        
+    def advance(self, delta_time):
+        """Run one simulation tick with the current input and scroll the background"""
+        if self.replay_player and self.replay_player.at_end:
+            self.paused = self.game_running  # Recording stopped mid-run: hold the last frame
+        if self.paused:
+            self.simulation.events = []
+            return
+        self.tick_count += 1
+        self.latency.consume(self.tick_count)
+        if self.rewinding:
+            self.rewind_tick()
+            return
+        tick_input = self.read_input()
+        running = self.game_running
+        if running and not self.replay_player:
+            self.rewind.push(self.save_state())
+        self.simulation.step(delta_time, tick_input)
         if self.game_running:
-            # Update powerups first
-            self.update_powerups(delta_time)
-            
-            # Calculate base speed for scoring (always normal speed)
-            self.base_speed = self.START_SPEED + self.score / self.SPEED_MODIFIER
-            if self.base_speed > self.MAX_SPEED:
-                self.base_speed = self.MAX_SPEED
-                
-            # Movement speed (can be affected by halfspeed powerup)
-            if "halfspeed" in self.active_powerups:
-                self.speed = self.base_speed * 0.7 # Slower movement for obstacles/background
-            else:
-                self.speed = self.base_speed
-                
-            self.difficulty = int(self.score / self.SPEED_MODIFIER)
-            if self.difficulty > self.MAX_DIFFICULTY:
-                self.difficulty = self.MAX_DIFFICULTY
-                
-            # Update camera position (following dino)
-            self.camera_x = self.dino.position.x - 200
+            with self.profiler.section("background.update"):
+                self.background.update(delta_time, self.speed)
+        if self.replay_player:
+            self.replay_player.tick_done()
+        elif running:
+            self.recorder.record(self.simulation, tick_input)
             
-            # Update score (always use base_speed, not affected by halfspeed powerup)
-            self.score += self.base_speed * delta_time
-            
-            # Update game objects
-            self.dino.update(delta_time, self.game_running, self.ground_y + self.ground_offset, self.active_powerups, self.score)
-            self.background.update(delta_time, self.speed)
-            self.obstacle_manager.update(delta_time, self.speed, self.score, self.difficulty, self.camera_x)
-            self.token_manager.update(delta_time, self.speed, self.score, self.difficulty, self.camera_x, self.obstacle_manager)
+    def save_state(self):
+        """The run as it is now, as a GameState for restore_state()"""
+        return GameState(self.simulation.save_state(), self.background.scroll_state())
+        
+    def restore_state(self, state):
+        """Go back to a save_state() (the screens and music are left as they are)"""
+        self.simulation.restore_state(state.simulation)
+        self.background.restore_scroll(state.scroll)
+        
+    def rewind_tick(self):
+        """Go back one tick, to the newest state in the rewind buffer"""
+        state = self.rewind.pop()
+        if state is None:
+            self.simulation.events = []
+            return
+        ended = self.simulation.game_ended
+        self.restore_state(state)
+        self.assisted = True
+        replay = self.recorder.replay
+        if replay is not None and replay.seed == self.simulation.seed:
+            del replay.inputs[self.simulation.ticks:]  # The recording goes on from here
+        if ended:
+            self.simulation.events.append(("resumed", None))
             
-            # Check token collisions (collect tokens and powerups)
-            coin_value, powerup_effects = self.token_manager.check_collision(self.dino)
-            if coin_value > 0:
-                # Apply coin multiplier from doublegold powerup
-                actual_coins = coin_value * self.coin_multiplier
-                self.token_score += actual_coins
-                if self.coin_multiplier > 1:
-                    print(f"Doublegold active! Collected {coin_value} coin(s) -> {actual_coins} coins!")
+    def handle_simulation_events(self, events):
+        """Play sounds and show the game over screen for simulation events"""
+        for event_name, data in events:
+            if event_name == "jump":
+                if self.jump_sound:
+                    self.jump_sound.play()
+            elif event_name == "coin":
                 # Play coin collection sound
                 if self.coin_sound:
                     self.coin_sound.play()
-            
-            # Handle powerup effects
-            for powerup in powerup_effects:
-                self.activate_powerup(powerup["effect"], powerup["duration"], powerup["type"])
-            
-            # Check obstacle collisions (game over) - only if not invincible
-            if not self.is_invincible and self.obstacle_manager.check_collision(self.dino):
+            elif event_name == "game_over":
                 self.game_over()
-        else:
-            # Update dino in idle state
-            self.dino.update(delta_time, self.game_running, self.ground_y + self.ground_offset, self.active_powerups, self.score)
+            elif event_name == "resumed":
+                # Rewound from the game over screen back into the run; it is recorded at its next death
+                self.finished_run = None
+                self.match_screens()
             
     def game_over(self):
         """Handle game over"""
-        self.check_high_score()
-        self.game_running = False
+        if not self.replay_player:
+            if not self.assisted:
+                self.check_high_score()
+            self.finished_run = run_record(self.simulation, self.assisted)
+            self.save_replay()
         self.game_over_screen.show()
         
         # Stop background music and play game over sound
@@ -283,73 +474,379 @@ class MainGame:
         """Check and update high score"""
         if self.score > self.high_score:
             self.high_score = int(self.score)
-            self.save_high_score()
-    
-    def update_powerups(self, delta_time):
-        """Update active powerup timers"""
-        expired_powerups = []
-        
-        for powerup_name, remaining_time in self.active_powerups.items():
-            remaining_time -= delta_time
-            if remaining_time <= 0:
-                expired_powerups.append(powerup_name)
+            
+    def save_replay(self):
+        """Write the replay of the run that just ended into replay_dir (if set)"""
+        replay = self.recorder.replay
+        if not self.replay_dir or replay is None:
+            return
+        replay.set_result(self.simulation, self.assisted)
+        path = os.path.join(self.replay_dir, f"run-{time.strftime('%Y%m%d-%H%M%S')}-{replay.score // 10}.replay")
+        try:
+            os.makedirs(self.replay_dir, exist_ok=True)
+            replay.save(path)
+            print(f"Replay saved to {path}")
+        except OSError as e:
+            print(f"Error saving replay: {e}")
+            
+    def start_replay(self, replay):
+        """Play a recorded run from the start instead of taking keyboard input"""
+        if (replay.screen_width, replay.screen_height) != (self.screen_width, self.screen_height):
+            raise ValueError(f"Replay was recorded at {replay.screen_width}x{replay.screen_height}")
+        with self.state_lock:
+            self.record_run()
+            self.replay_player = ReplayPlayer(replay, self.simulation, self.background)
+            self.replay_player.start()
+            self.paused = False
+            self.rewind.clear()
+            self.hud.hide_start_label()
+        self.replay_seeked()
+        
+    def handle_replay_key(self, key):
+        """Replay controls; returns True if the key was one of them
+        
+        SPACE pauses (or restarts at the end), LEFT/RIGHT seek by
+        REPLAY_SEEK_STEP, HOME goes back to the start and 0-9 jump to
+        0-90% of the run.
+        """
+        player = self.replay_player
+        step = int(self.REPLAY_SEEK_STEP * self.simulation.TICK_RATE)
+        if key == pygame.K_SPACE:
+            if player.at_end:
+                self.paused = False
+                self.seek_replay(0)
             else:
-                self.active_powerups[powerup_name] = remaining_time
-        
-        # Remove expired powerups and reset their effects
-        for powerup_name in expired_powerups:
-            del self.active_powerups[powerup_name]
-            if powerup_name == "doublegold":
-                self.coin_multiplier = 1
-                print("Doublegold powerup expired!")
-            elif powerup_name == "halfspeed":
-                print("Halfspeed powerup expired!")
-            elif powerup_name == "godmode":
-                self.is_invincible = False
-                print("God mode powerup expired!")
-    
-    def activate_powerup(self, effect, duration, powerup_type):
-        """Activate a powerup effect"""
-        if effect == "halfspeed":
-            self.active_powerups["halfspeed"] = duration
-            print(f"Halfspeed activated for {duration} seconds! (Slower gameplay, same scoring)")
-        elif effect == "doublegold":
-            self.active_powerups["doublegold"] = duration
-            self.coin_multiplier = 2
-            print(f"Doublegold activated for {duration} seconds!")
-        elif effect == "godmode":
-            self.active_powerups["godmode"] = duration
-            self.is_invincible = True
-            print(f"God mode activated for {duration} seconds! (Invincible to obstacles)")
+                self.paused = not self.paused
+        elif key == pygame.K_LEFT:
+            self.seek_replay(self.simulation.ticks - step)
+        elif key == pygame.K_RIGHT:
+            self.seek_replay(self.simulation.ticks + step)
+        elif key == pygame.K_HOME:
+            self.seek_replay(0)
+        elif pygame.K_0 <= key <= pygame.K_9:
+            self.seek_replay(player.replay.ticks * (key - pygame.K_0) // 10)
+        else:
+            return False
+        return True
+        
+    def seek_replay(self, tick):
+        """Jump to a tick of the replay being played"""
+        start = time.perf_counter()
+        with self.state_lock:
+            self.replay_player.seek(tick)
+        print(f"Replay at {self.simulation.ticks / self.simulation.TICK_RATE:.1f}s (seek took {(time.perf_counter() - start) * 1000:.1f} ms)")
+        self.replay_seeked()
+        
+    def replay_seeked(self):
+        """Match the screens and music to where the replay now is"""
+        self.match_screens()
+        if self.pipeline:
+            # The published snapshot is from before the jump
+            self.pipeline.publish(self.snapshot())
+        self.renderer.invalidate()
+        
+    def match_screens(self):
+        """Show or hide the game over screen and switch the music to match the simulation"""
+        if self.simulation.game_ended:
+            if not self.game_over_screen.visible:
+                self.game_over_screen.show()
+                self.stop_background_music()
+        else:
+            self.game_over_screen.hide()
+            self.stop_game_over_sound()
+            self.game_over_played = False
+            if not pygame.mixer.music.get_busy():
+                self.play_background_music()
+        
+    def apply_quality(self, level):
+        """Switch every render setting to a QualityLevel"""
+        self.background.set_quality(level.background)
+        Token.draw_bob = level.token_bob
+        self.dino.animation_speed = Dino.ANIMATION_SPEED * level.dino_animation
+        self.hud.shadow_offset = HUD.SHADOW_OFFSET if level.text_shadows else 0
+        self.game_over_screen.set_shadow_offset(GameOver.SHADOW_OFFSET if level.text_shadows else 0)
+        self.set_low_res(level.low_res)
+        self.renderer.invalidate()
+        if self.verbose:
+            print(f"Render quality: {level.name}")
+        
+    def set_profiler_visible(self, visible):
+        """Show or hide the profiler overlay (profiling runs while it is shown or a trace records)"""
+        self.show_profiler = visible
+        if visible and self.profiler_overlay is None:
+            self.profiler_overlay = ProfilerOverlay(self.profiler, self.screen_width, 1.0 / self.TARGET_FPS)
+        self.profiler.set_enabled(visible or self.profiler.tracing)
+        self.renderer.invalidate()
+        print(f"Show profiler: {visible}")
+        
+    def toggle_trace(self, path=None):
+        """Start recording a trace, or stop and write it (Chrome trace JSON)"""
+        profiler = self.profiler
+        if not profiler.tracing:
+            profiler.start_trace()
+            profiler.set_enabled(True)
+            print("Trace recording started")
+            return
+        path = path or self.trace_path or get_save_path(f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            count = profiler.stop_trace(path)
+            print(f"Trace with {count} events written to {path}")
+        except OSError as e:
+            print(f"Error writing trace: {e}")
+        profiler.set_enabled(self.show_profiler)
+        
+    def set_low_res(self, low_res):
+        """Switch the scene render target between window size and native low resolution
+        
+        Every cached surface is rebuilt at the new size, so this takes a
+        moment; it is meant for rare switches, not every frame.
+        """
+        factor = self.LOW_RES_FACTOR if low_res else 1
+        if factor == self.render_factor:
+            return
+        self.render_factor = factor
+        asset_cache.set_render_factor(factor)
+        if factor > 1:
+            self.scene_surface = pygame.Surface((self.screen_width // factor, self.screen_height // factor)).convert()
+        else:
+            self.scene_surface = self.screen
+        self.renderer.align = factor
+        
+        ObstacleFactory.preload_assets()
+        Token.preload_assets()
+        
+        # Same scroll position and quality, new surfaces
+        old_background = self.background
+        self.background = Background(self.screen_width, self.screen_height, old_background.quality)
+        self.background.layer_positions = old_background.layer_positions
+        self.background.ground_positions = old_background.ground_positions
+        self.background.last_scroll = old_background.last_scroll
+        if self.replay_player:
+            self.replay_player.background = self.background
+        
+        objects = [self.dino]
+        objects.extend(self.obstacle_manager.obstacles)
+        objects.extend(self.token_manager.tokens)
+        for pool in (self.obstacle_manager.pool, self.token_manager.pool):
+            for free in pool.free.values():
+                objects.extend(free)
+        for obj in objects:
+            obj.reload_sprites()
+        
+    def snapshot(self):
+        """Freeze what the renderer needs from the current game state into a FrameSnapshot"""
+        sprites = []
+        for obstacle in self.obstacle_manager.obstacles:
+            if obstacle.visible and obstacle.sprite:
+                sprites.append(SpriteState(obstacle, obstacle.sprite, *obstacle.snapshot_positions()))
+        for token in self.token_manager.tokens:
+            if not token.collected and token.visible and token.sprite and token.rect:
+                sprites.append(SpriteState(token, token.sprite, *token.snapshot_positions()))
+        dino = self.dino
+        if dino.visible and dino.sprite:
+            sprites.append(SpriteState(dino, dino.get_draw_sprite(self.is_invincible), *dino.snapshot_positions()))
+        return FrameSnapshot(self.tick_count, time.perf_counter(), tuple(sprites), self.background.scroll_state(),
+                             self.score, self.token_score, dict(self.active_powerups), self.game_running)
+        
+    def draw(self, alpha=1.0, snapshot=None):
+        """Draw all game elements
+        
+        alpha is the fraction of a simulation tick that has elapsed since the
+        last update; moving objects are interpolated by it. snapshot is the
+        FrameSnapshot to draw, taken from the current state when None.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+            
+        # Nothing moves on the start and game over screens: draw the last
+        # simulated state rather than interpolating towards a tick that never comes
+        if not snapshot.game_running or self.paused:
+            alpha = 1.0
             
-    def draw(self):
-        """Draw all game elements"""
-        self.screen.fill((135, 206, 235))  # Sky blue background
-
-        # Draw game objects
-        self.background.draw(self.screen)
-        self.obstacle_manager.draw(self.screen)
-        self.token_manager.draw(self.screen)
-        self.dino.draw(self.screen, self.is_invincible)
-
-        # Draw UI (conditionally include FPS if toggle is enabled)
         fps_to_show = self.clock.get_fps() if self.show_fps else None
-        self.hud.draw(self.screen, int(self.score), self.high_score, self.game_running, self.token_score, self.active_powerups, fps=fps_to_show)
-        self.game_over_screen.draw(self.screen, int(self.score), self.high_score)
+        replay_text = None
+        if self.replay_player:
+            replay_text = f"{self.format_time(self.simulation.ticks)} / {self.format_time(self.replay_player.replay.ticks)}"
+            if self.paused:
+                replay_text += " PAUSED"
+        hud_lines = self.hud.layout(int(snapshot.score), self.high_score, snapshot.game_running, snapshot.token_score, snapshot.powerups,
+                                    fps=fps_to_show, quality=self.governor.level.name if self.governor.enabled else None,
+                                    replay=replay_text,
+                                    rewind=len(self.rewind) / self.simulation.TICK_RATE if self.rewinding else None,
+                                    autopilot=self.autopilot_on and not self.replay_player)
+        
+        if self.show_profiler:
+            self.profiler_overlay.update()
+        
+        if not self.renderer.enabled:
+            self.render(alpha, hud_lines, snapshot)
+            with self.profiler.section("present"):
+                pygame.display.flip()
+            return
+            
+        # Scrolling or an overlay change repaints the whole window; under the
+        # game over screen nothing else is visible
+        game_over = self.game_over_screen
+        backdrop = (self.background.draw_state(alpha, snapshot.scroll), game_over.visible and (int(snapshot.score), self.high_score))
+        items = {} if game_over.visible else self.frame_items(alpha, hud_lines, snapshot)
+        if self.show_profiler:
+            items["profiler"] = (self.profiler_overlay.rect, self.profiler.frame_count)
+        self.renderer.present(backdrop, items, lambda clip: self.render(alpha, hud_lines, snapshot, clip))
+        
+    def format_time(self, ticks):
+        seconds = ticks // self.simulation.TICK_RATE
+        return f"{seconds // 60}:{seconds % 60:02d}"
+        
+    def frame_items(self, alpha, hud_lines, snapshot):
+        """Sprites and HUD text of this frame for the dirty-rect renderer
+        
+        Maps each item to (window rect, signature); the signature holds
+        whatever else changes its pixels (sprite frame, text, colour).
+        """
+        factor = self.render_factor
+        items = {}
+        for sprite in snapshot.sprites:
+            rect = sprite_rect(sprite, alpha, factor)
+            items[sprite.key] = (pygame.Rect(rect.x * factor, rect.y * factor, rect.width * factor, rect.height * factor), sprite.surface)
+        for i, line in enumerate(hud_lines):
+            text, font, x, y, color = line
+            items[("hud", i)] = (self.hud.text_rect(line), (text, color))
+        return items
+        
+    def render(self, alpha, hud_lines, snapshot, clip=None):
+        """Draw a snapshot into the window, limited to clip (a window rect) if given"""
+        scene = self.scene_surface
+        factor = self.render_factor
+        if clip is not None:
+            # Dirty rects are aligned to the low-res pixel grid
+            scene_clip = pygame.Rect(clip.x // factor, clip.y // factor, clip.width // factor, clip.height // factor)
+            scene.set_clip(scene_clip)
+            self.screen.set_clip(clip)
+            
+        # A built game over screen already holds the frame beneath it
+        final_score = int(snapshot.score)
+        profiler = self.profiler
+        if not self.game_over_screen.is_built(final_score, self.high_score):
+            if not self.background.opaque:
+                scene.fill((135, 206, 235))  # Sky blue background
 
-        pygame.display.flip()
+            # Draw game objects (obstacles, tokens, then the dino)
+            with profiler.section("background.draw"):
+                self.background.draw(scene, alpha, snapshot.scroll)
+            with profiler.section("sprites.draw"):
+                for sprite in snapshot.sprites:
+                    scene.blit(sprite.surface, sprite_rect(sprite, alpha, factor))
+            
+            # Low-res mode: one nearest-neighbour upscale fills the window
+            if scene is not self.screen:
+                with profiler.section("upscale"):
+                    if clip is None:
+                        pygame.transform.scale(scene, (self.screen_width, self.screen_height), self.screen)
+                    else:
+                        pygame.transform.scale(scene.subsurface(scene_clip), clip.size, self.screen.subsurface(clip))
+
+            # Draw UI at full resolution
+            with profiler.section("hud.draw"):
+                self.hud.draw(self.screen, final_score, self.high_score, snapshot.game_running, lines=hud_lines)
+        with profiler.section("game_over.draw"):
+            self.game_over_screen.draw(self.screen, final_score, self.high_score)
+        if self.show_profiler:
+            with profiler.section("profiler.draw"):
+                self.profiler_overlay.draw(self.screen)
+        
+        if clip is not None:
+            scene.set_clip(None)
+            self.screen.set_clip(None)
         
     def run(self):
-        """Main game loop"""
-        while self.running:
-            delta_time = self.clock.tick(60) / 1000.0  # Convert to seconds
-            
-            self.handle_events()
-            self.update(delta_time)
-            self.draw()
+        """Main game loop
+        
+        The simulation advances in fixed ticks from an accumulator of real
+        time; rendering runs as fast as MAX_FPS allows and interpolates
+        between the last two ticks.
+        """
+        if self.pipelined:
+            self.run_pipelined()
+        else:
+            tick = self.simulation.FIXED_DELTA
+            accumulator = 0.0
+            while self.running:
+                # Clamp long frames (window drag, breakpoints) to avoid a catch-up spiral
+                frame_time = min(self.clock.tick(self.MAX_FPS) / 1000.0, self.MAX_FRAME_TIME)
+                accumulator += frame_time
+                
+                work_start = time.perf_counter()
+                self.profiler.begin_frame()
+                with self.profiler.section("events"):
+                    self.handle_events()
+                while accumulator >= tick:
+                    self.update(tick)
+                    accumulator -= tick
+                self.draw(accumulator / tick)
+                presented = time.perf_counter()
+                self.profiler.end_frame()
+                self.latency.presented(self.tick_count, presented)
+                # Time spent working this frame, without the frame limiter's sleep
+                self.governor.record(presented - work_start, frame_time)
+                
+        latency = self.latency.stats()
+        if latency:
+            print(f"Input latency: {latency}")
+        if self.profiler.tracing:
+            self.toggle_trace()
+        if self.profiler.enabled:
+            print(f"Frame profile: {self.profiler.summary()}")
             
         # Stop all sounds before quitting
         self.stop_background_music()
         self.stop_game_over_sound()
+        if self.run_store is not None:
+            self.record_run()
+            self.run_store.close()
         pygame.quit()
         sys.exit()
+        
+    def run_pipelined(self):
+        """Main loop with the simulation ticking on its own thread (FramePipeline)
+        
+        This thread handles window events, samples input and draws the
+        newest snapshot. While it waits it polls input every INPUT_POLL
+        seconds, so a tick never reads keys older than that. A new tick is
+        drawn as soon as it is published; between ticks frames are
+        interpolated at up to MAX_FPS.
+        """
+        tick = self.simulation.FIXED_DELTA
+        pipeline = self.pipeline = FramePipeline(self.pipeline_step, tick, self.state_lock)
+        pipeline.start()
+        frame_interval = 1.0 / self.MAX_FPS
+        last_frame = time.perf_counter()
+        shown_tick = None
+        while self.running:
+            with self.profiler.section("events"):
+                self.handle_events()
+            pipeline.sample_input(self.TICK_WAIT)
+            self.handle_simulation_events(pipeline.drain_events())
+            
+            snapshot = pipeline.latest
+            now = time.perf_counter()
+            if snapshot is not None and (snapshot.tick != shown_tick or now - last_frame >= frame_interval):
+                self.profiler.begin_frame()
+                self.draw(min((now - snapshot.time) / tick, 1.0), snapshot)
+                presented = time.perf_counter()
+                self.profiler.end_frame()
+                self.latency.presented(snapshot.tick, presented)
+                self.clock.tick()
+                with self.state_lock:
+                    if self.governor.record(presented - now, now - last_frame):
+                        # Sprites were rebuilt for the new quality; drop the snapshot holding the old ones
+                        pipeline.publish(self.snapshot())
+                last_frame = now
+                shown_tick = snapshot.tick
+                
+            pipeline.wait(min(self.INPUT_POLL, max(0.0, last_frame + frame_interval - time.perf_counter())))
+        pipeline.stop()
+        
+    def pipeline_step(self):
+        """One tick on the simulation thread: (snapshot, events) for FramePipeline"""
+        self.advance(self.simulation.FIXED_DELTA)
+        return self.snapshot(), self.simulation.events
@@ -1,7 +1,10 @@
 import pygame
 import random
 from .game_object import GameObject
+from .assets import asset_cache
 from .path_utils import get_resource_path
+from .spatial import SortedXList
+from .pool import ObjectPool
 
 class Obstacle(GameObject):
     """Base obstacle class"""
@@ -14,40 +17,60 @@ class Obstacle(GameObject):
         
     def update(self, delta_time, speed):
         """Move obstacle left based on game speed"""
+        self.store_previous_position()
         self.velocity.x = -speed * self.speed_multiplier  # Apply same multiplier as ground
         super().update(delta_time)
 
 class Stump(Obstacle):
     """Tree stump obstacle"""
     
+    KIND = "stump"
+    IMAGE_PATH = "assets/img/obstacles/stump.png"
+    SCALE = 3.0  # Original 4x scale
+    
     def __init__(self, x, y):
-        super().__init__(x, y, get_resource_path("assets/img/obstacles/stump.png"), 3.0)  # Original 4x scale
+        super().__init__(x, y, get_resource_path(self.IMAGE_PATH), self.SCALE)
 
 class Rock(Obstacle):
     """Rock obstacle"""
     
+    KIND = "rock"
+    IMAGE_PATH = "assets/img/obstacles/rock.png"
+    SCALE = 3.0  # Original 4x scale
+    
     def __init__(self, x, y):
-        super().__init__(x, y, get_resource_path("assets/img/obstacles/rock.png"), 3.0)  # Original 4x scale
+        super().__init__(x, y, get_resource_path(self.IMAGE_PATH), self.SCALE)
 
 class Barrel(Obstacle):
     """Barrel obstacle"""
     
+    KIND = "barrel"
+    IMAGE_PATH = "assets/img/obstacles/barrel.png"
+    SCALE = 3.0  # Original 4x scale
+    
     def __init__(self, x, y):
-        super().__init__(x, y, get_resource_path("assets/img/obstacles/barrel.png"), 3.0)  # Original 4x scale
+        super().__init__(x, y, get_resource_path(self.IMAGE_PATH), self.SCALE)
 
 class Bird(Obstacle):
     """Flying bird obstacle"""
     
+    KIND = "bird"
+    
+    # Bird sprite sheet (288x32 = 9 frames of 32x32) with original 4x scale
+    SHEET_PATH = "assets/img/obstacles/Bird.png"
+    FRAME_SIZE = 32
+    FRAME_COUNT = 9
+    SCALE = 3.0
+    
     def __init__(self, x, y):
         # Pass None as image_path since we'll load sprite sheet manually
         super().__init__(x, y, None, 3.0)
         
-        # Load bird sprite sheet (288x32 = 9 frames of 32x32) with original 4x scale
+        # Load bird sprite sheet
         try:
-            self.load_sprite_sheet(get_resource_path("assets/img/obstacles/Bird.png"), 32, 32, 9, 3.0)
+            self.load_sprite_sheet(get_resource_path(self.SHEET_PATH), self.FRAME_SIZE, self.FRAME_SIZE, self.FRAME_COUNT, self.SCALE)
             self.animation_speed = 10.0  # Match original Godot speed
             self.speed_multiplier = 3.0  # Set speed multiplier here
-            print(f"Bird created at position ({x}, {y})")
         except Exception as e:
             print(f"ERROR initializing bird: {e}")
         
@@ -67,12 +90,24 @@ class ObstacleFactory:
     
     # Bird heights from original code
     BIRD_HEIGHTS = [200, 390]
+    BIRD_Y = 400
+    
+    GROUND_OBSTACLES = (Stump, Rock, Barrel)
+    GROUND_TYPES = ('stump', 'rock', 'barrel')
     
     @staticmethod
-    def create_ground_obstacle(x, y, obstacle_type=None):
+    def preload_assets():
+        """Load every obstacle sprite into the asset cache before gameplay starts"""
+        asset_cache.preload(
+            images=[(get_resource_path(cls.IMAGE_PATH), cls.SCALE) for cls in ObstacleFactory.GROUND_OBSTACLES],
+            sheets=[(get_resource_path(Bird.SHEET_PATH), Bird.FRAME_SIZE, Bird.FRAME_SIZE, Bird.FRAME_COUNT, Bird.SCALE)]
+        )
+    
+    @staticmethod
+    def create_ground_obstacle(x, y, obstacle_type=None, rng=random):
         """Create a random ground obstacle"""
         if obstacle_type is None:
-            obstacle_type = random.choice(['stump', 'rock', 'barrel'])
+            obstacle_type = rng.choice(ObstacleFactory.GROUND_TYPES)
             
         if obstacle_type == 'stump':
             return Stump(x, y)
@@ -84,34 +119,88 @@ class ObstacleFactory:
             return Stump(x, y)  # Default
             
     @staticmethod
-    def create_bird(x):
+    def create_bird(x, rng=random):
         """Create a bird at random height"""
-        # y = random.choice(ObstacleFactory.BIRD_HEIGHTS)
-        return Bird(x, 400)
+        # y = rng.choice(ObstacleFactory.BIRD_HEIGHTS)
+        return Bird(x, ObstacleFactory.BIRD_Y)
 
 class ObstacleManager:
     """Manages all obstacles in the game"""
     
-    def __init__(self, screen_width, ground_y):
-        self.obstacles = []
+    PREWARM_PER_KIND = 20  # Enough for the longest same-kind streak seen in long runs
+    SPAWN_SETTINGS = ("min_group_spacing", "max_group_spacing", "bird_probability")
+    
+    def __init__(self, screen_width, ground_y, rng=None, verbose=False):
+        self.obstacles = SortedXList()  # Kept in x order; every obstacle moves at the same speed
         self.screen_width = screen_width
         self.ground_y = ground_y
         self.last_obstacle_x = 0
+        self.verbose = verbose  # Print every spawn
+        
+        # Spawn tuning
+        self.min_group_spacing = 175  # Space between groups
+        self.max_group_spacing = 350
+        self.bird_probability = 0.5  # Chance that a spawn is a bird instead of a ground obstacle
+        
+        # Random source for spawning (a seeded random.Random for reproducible runs)
+        self.rng = rng if rng is not None else random.Random()
+        
+        # Despawned obstacles waiting to be reused, per obstacle kind
+        self.pool = ObjectPool()
+        
+    def prewarm(self, count=PREWARM_PER_KIND):
+        """Build pooled obstacles up front so spawning never allocates during play"""
+        for obstacle_type in ObstacleFactory.GROUND_TYPES:
+            self.pool.prewarm(obstacle_type, count, lambda: ObstacleFactory.create_ground_obstacle(0, 0, obstacle_type))
+        self.pool.prewarm(Bird.KIND, count, lambda: ObstacleFactory.create_bird(0))
         
     def clear(self):
         """Remove all obstacles"""
+        for obstacle in self.obstacles:
+            self.pool.release(obstacle.KIND, obstacle)
         self.obstacles.clear()
         self.last_obstacle_x = 0
         
+    def spawn_settings(self):
+        """Spawn tuning by attribute name, for apply_spawn_settings()"""
+        return {name: getattr(self, name) for name in self.SPAWN_SETTINGS}
+        
+    def apply_spawn_settings(self, settings):
+        for name, value in settings.items():
+            setattr(self, name, value)
+        
+    def save_state(self):
+        """Spawn position and every obstacle's state, for restore_state()"""
+        return (self.last_obstacle_x, tuple((obstacle.KIND, obstacle.save_state()) for obstacle in self.obstacles))
+        
+    def restore_state(self, state):
+        """Put back a save_state(); obstacles come from the pool"""
+        last_obstacle_x, obstacles = state
+        current = self.obstacles
+        if len(current) == len(obstacles) and all(obstacle.KIND == kind for obstacle, (kind, _) in zip(current, obstacles)):
+            # Same obstacles as when saved (a nearby tick): restore them in place
+            self.last_obstacle_x = last_obstacle_x
+            for obstacle, (kind, obstacle_state) in zip(current, obstacles):
+                obstacle.restore_state(obstacle_state)
+            return
+        self.clear()
+        self.last_obstacle_x = last_obstacle_x
+        for kind, obstacle_state in obstacles:
+            obstacle = self.pool.acquire(kind)
+            if obstacle is None:
+                obstacle = ObstacleFactory.create_bird(0) if kind == Bird.KIND else ObstacleFactory.create_ground_obstacle(0, 0, kind)
+            obstacle.restore_state(obstacle_state)
+            self.obstacles.add(obstacle)
+        
     def update(self, delta_time, speed, score, difficulty, camera_x):
         """Update all obstacles"""
         # Update existing obstacles
-        for obstacle in self.obstacles[:]:
+        for obstacle in self.obstacles:
             obstacle.update(delta_time, speed)
             
-            # Remove obstacles that are off screen
-            if obstacle.position.x < camera_x - self.screen_width:
-                self.obstacles.remove(obstacle)
+        # Remove obstacles that are off screen (always the leftmost ones) and keep them for reuse
+        for obstacle in self.obstacles.remove_before(camera_x - self.screen_width):
+            self.pool.release(obstacle.KIND, obstacle)
                 
         # Generate new obstacles
         self._generate_obstacles(score, difficulty, camera_x)
@@ -123,7 +212,7 @@ class ObstacleManager:
             # max_obstacles = difficulty + 3  # More obstacles per group
             num_obstacles = 1  # At least 2 obstacles
             
-            group_spacing = random.randint(175, 350)  # Space between groups
+            group_spacing = self.rng.randint(self.min_group_spacing, self.max_group_spacing)  # Space between groups
             
             # Calculate next obstacle position based on last obstacle
             if self.last_obstacle_x == 0:
@@ -131,35 +220,56 @@ class ObstacleManager:
             else:
                 obs_x = self.last_obstacle_x + group_spacing
 
-            if random.random() >= 0.5:
-                print("Creating ground obstacle at", obs_x)
-                obstacle = ObstacleFactory.create_ground_obstacle(obs_x, 0)  # Temp Y position
+            if self.rng.random() >= self.bird_probability:
+                if self.verbose:
+                    print("Creating ground obstacle at", obs_x)
+                obstacle_type = self.rng.choice(ObstacleFactory.GROUND_TYPES)
+                obstacle = self.pool.acquire(obstacle_type)
+                if obstacle is None:
+                    obstacle = ObstacleFactory.create_ground_obstacle(obs_x, 0, obstacle_type)  # Temp Y position
+                else:
+                    obstacle.reset(obs_x, 0)
                 if obstacle.rect:
                     # Position obstacle properly on ground
                     obs_y = self.ground_y - obstacle.rect.height // 2
                     obstacle.position.y = obs_y
                     obstacle.rect.centery = obs_y
+                    obstacle.store_previous_position()
                     
-                self.obstacles.append(obstacle)
+                self.obstacles.add(obstacle)
                 self.last_obstacle_x = obs_x
             else:
-                print("Creating bird at", obs_x)
-                bird = ObstacleFactory.create_bird(obs_x)
-                self.obstacles.append(bird)
+                if self.verbose:
+                    print("Creating bird at", obs_x)
+                bird = self.pool.acquire(Bird.KIND)
+                if bird is None:
+                    bird = ObstacleFactory.create_bird(obs_x, rng=self.rng)
+                else:
+                    bird.reset(obs_x, ObstacleFactory.BIRD_Y)
+                self.obstacles.add(bird)
                 self.last_obstacle_x = obs_x
                     
-    def draw(self, screen):
-        """Draw all obstacles"""
+    def draw(self, screen, alpha=1.0):
+        """Draw all obstacles (alpha interpolates between the last two ticks)"""
         for obstacle in self.obstacles:
-            obstacle.draw(screen)
+            obstacle.draw(screen, alpha)
             
     def check_collision(self, dino):
         """Check collision with dinosaur"""
+        return self.find_collision(dino) is not None
+        
+    def find_collision(self, dino):
+        """Get the first obstacle touching the dinosaur, or None"""
         dino_rect = dino.get_collision_rect()
         if not dino_rect:
-            return False
+            return None
             
-        for obstacle in self.obstacles:
+        # Only obstacles near the dino can touch it
+        items = self.obstacles.items
+        index, stop = self.obstacles.span(dino_rect.left, dino_rect.right)
+        while index < stop:
+            obstacle = items[index]
             if obstacle.rect and dino_rect.colliderect(obstacle.rect):
-                return True
-        return False
+                return obstacle
+            index += 1
+        return None
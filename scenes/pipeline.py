@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+# A drawable object as it was at the end of a tick. key identifies it from
+# frame to frame (for dirty rects); previous and current are its world-space
+# centres after the last two ticks, for interpolation.
+SpriteState = namedtuple("SpriteState", ["key", "surface", "previous", "current"])
+
+# Everything the renderer needs from one simulation tick. Built by whichever
+# thread ran the tick and never changed afterwards, so any thread can draw it.
+FrameSnapshot = namedtuple("FrameSnapshot", [
+    "tick",  # Number of the tick (MainGame counts every tick, idle ones too)
+    "time",  # perf_counter() when the tick finished
+    "sprites",  # SpriteStates back to front
+    "scroll",  # Background.scroll_state()
+    "score",
+    "token_score",
+    "powerups",  # Copy of the active powerups dict
+    "game_running",
+])
+
+def sprite_rect(sprite, alpha, factor):
+    """Rect of a SpriteState at alpha between its last two ticks, in render target pixels"""
+    (x0, y0), (x1, y1) = sprite.previous, sprite.current
+    rect = sprite.surface.get_rect()
+    rect.center = ((x0 + (x1 - x0) * alpha) / factor, (y0 + (y1 - y0) * alpha) / factor)
+    return rect
+
+
+class LatencyTracker:
+    """Input-to-photon latency: from a key press to the first presented frame of the tick that read it
+
+    press() stamps a key press when the game receives it, consume() hands
+    every waiting press to the tick that reads the input, and presented()
+    turns the presses of every tick up to the one on screen into samples.
+    Presses and ticks may come from different threads.
+    """
+
+    def __init__(self, capacity=1000):
+        self.lock = threading.Lock()
+        self.waiting = []  # Press times no tick has read yet
+        self.consumed = deque()  # (tick, press time) waiting to be presented
+        self.samples = deque(maxlen=capacity)  # Latencies in seconds
+
+    def press(self, when):
+        with self.lock:
+            self.waiting.append(when)
+
+    def consume(self, tick):
+        """Called by the tick that reads the input"""
+        if self.waiting:
+            with self.lock:
+                self.consumed.extend((tick, when) for when in self.waiting)
+                self.waiting.clear()
+
+    def presented(self, tick, when):
+        """Called after the frame of a tick reached the screen at perf_counter() time when"""
+        if self.consumed:
+            with self.lock:
+                consumed = self.consumed
+                while consumed and consumed[0][0] <= tick:
+                    self.samples.append(when - consumed.popleft()[1])
+
+    def stats(self):
+        """Latency summary in milliseconds (None before the first sample)"""
+        if not self.samples:
+            return None
+        samples = sorted(self.samples)
+        count = len(samples)
+        return {
+            "presses": count,
+            "mean_ms": round(sum(samples) / count * 1000, 2),
+            "p50_ms": round(samples[count // 2] * 1000, 2),
+            "p95_ms": round(samples[min(count - 1, int(count * 0.95))] * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+
+
+class FramePipeline:
+    """Runs the simulation on its own thread at a fixed tick rate
+
+    step() is called once per tick on the simulation thread, with lock
+    held, and returns (FrameSnapshot, simulation events). The newest
+    snapshot is published in latest for the renderer, and the events queue
+    up for the main thread in events. Anything else that changes game state
+    must hold lock too.
+
+    Window events can only be read on the main thread, so a tick that
+    falls due waits up to INPUT_WAIT ticks for the main thread to sample
+    input (sample_input()) and then runs every due tick on that sample. A
+    main thread stuck presenting or dragging the window therefore delays
+    the simulation by at most INPUT_WAIT ticks, and while it keeps up each
+    press is simulated straight after it is read. When the thread falls more
+    than MAX_LAG behind (a breakpoint, a suspended machine) it drops the
+    missed ticks instead of racing to catch up.
+    """
+
+    INPUT_WAIT = 1.0
+    MAX_LAG = 0.25
+
+    def __init__(self, step, tick_delta, lock=None):
+        self.step = step
+        self.tick_delta = tick_delta
+        self.lock = lock or threading.Lock()
+        self.latest = None  # Newest FrameSnapshot
+        self.events = deque()  # Simulation events not yet handled by the main thread
+        self.published = threading.Event()  # Set when a new snapshot is published
+        self.input_sampled = threading.Event()  # Set by the main thread after reading input
+        self.next_tick = 0.0  # perf_counter() time the next tick is due
+        self.running = False
+        self.thread = None
+
+        # Counters
+        self.ticks = 0
+        self.stale_ticks = 0  # Ticks that ran without waiting for a fresh input sample
+        self.dropped_ticks = 0
+
+    def start(self):
+        """Start ticking on a daemon thread"""
+        if self.running:
+            return
+        self.running = True
+        self.next_tick = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop ticking and wait for the current tick to finish"""
+        self.running = False
+        self.input_sampled.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        tick_delta = self.tick_delta
+        while self.running:
+            delay = self.next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if not self.input_sampled.wait(self.INPUT_WAIT * tick_delta):
+                self.stale_ticks += 1
+            self.input_sampled.clear()
+
+            with self.lock:
+                # Checked once the lock is ours, since waiting for it is the usual way to fall behind
+                behind = time.perf_counter() - self.next_tick
+                if behind > self.MAX_LAG:
+                    dropped = int(behind / tick_delta)
+                    self.dropped_ticks += dropped
+                    self.next_tick += dropped * tick_delta
+
+                while self.running and self.next_tick <= time.perf_counter():
+                    snapshot, events = self.step()
+                    # Published under the lock, so a snapshot built before a change made under it never replaces one built after
+                    self.publish(snapshot)
+                    self.events.extend(events)
+                    self.ticks += 1
+                    self.next_tick += tick_delta
+
+    def sample_input(self, timeout):
+        """Tell the simulation thread input was just read
+
+        When ticks are due they run on this input; this waits up to timeout
+        seconds for them, so the caller can draw the result straight away.
+        Returns True if a new snapshot was published.
+        """
+        # A sample taken before the tick is due would be stale by the time it runs
+        if time.perf_counter() < self.next_tick:
+            return False
+        self.published.clear()
+        self.input_sampled.set()
+        return self.published.wait(timeout)
+
+    def publish(self, snapshot):
+        """Make a snapshot the one the renderer draws next"""
+        self.latest = snapshot
+        self.published.set()
+
+    def wait(self, timeout):
+        """Wait up to timeout seconds for a new snapshot; returns True if one arrived"""
+        arrived = self.published.wait(timeout)
+        self.published.clear()
+        return arrived
+
+    def drain_events(self):
+        """Simulation events published since the last call, oldest first"""
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
@@ -0,0 +1,292 @@
+import random
+import time
+import numpy as np
+from .simulation import Simulation, NO_INPUT, JUMP, DUCK, TickInput
+from .batch_simulation import lround, lround_array
+
+# Scripted players for headless runs. Scalar policies take a Simulation and
+# return a TickInput; batch policies take a BatchSimulation and return
+# (jump, duck) bool arrays with one entry per game.
+
+REACTION_TIME = 0.08  # Seconds of look-ahead before an obstacle reaches the dino
+BIRD_CLEARANCE = 60  # Obstacles whose bottom is this far above the ground are ducked under
+
+
+def idle_policy(simulation):
+    """Never press anything"""
+    return NO_INPUT
+
+
+def reflex_policy(simulation):
+    """Jump over ground obstacles, duck under birds"""
+    dino_rect = simulation.dino.get_collision_rect()
+    # React when an obstacle is about to reach the dino's front edge
+    horizon = simulation.speed * 3.0 * REACTION_TIME
+    for obstacle in simulation.obstacle_manager.obstacles.query(dino_rect.left, dino_rect.right + horizon):
+        distance = obstacle.rect.left - dino_rect.right
+        if -obstacle.rect.width - dino_rect.width < distance < horizon:
+            if obstacle.rect.bottom < simulation.ground_y - BIRD_CLEARANCE:
+                return DUCK
+            return JUMP
+    return NO_INPUT
+
+
+class LookaheadPolicy:
+    """Plans inputs by searching futures on a fork of the simulation
+
+    On ticks the dino starts on the ground it either waits (nothing, or duck
+    when reflex_policy ducks) or jumps, jumping first; a depth-first search
+    over those choices on a private Simulation restored from the game's
+    state (random source included) looks for inputs that survive the next
+    horizon seconds. A plan is followed until half the horizon is left, and
+    a search stops after budget fork ticks with the line that lived longest.
+    With a time_budget (seconds per tick) searches start lead_ticks early
+    and pause when out of time, resuming on the next tick; without one every
+    search finishes on its tick, so headless runs are reproducible. The fork
+    copies the spawn settings of the first simulation it is called with
+    (call reset() after changing them).
+    """
+
+    def __init__(self, horizon=1.5, budget=1000, time_budget=None):
+        self.horizon_ticks = max(2, round(horizon * Simulation.TICK_RATE))
+        self.budget = budget
+        self.time_budget = time_budget
+        self.deadline = None  # perf_counter() time the current slice of a search pauses at
+        # Planned ticks a search starts ahead of, the ticks it may take to finish
+        self.lead_ticks = self.horizon_ticks // 4 if time_budget is not None else 0
+        self.fork = None  # Scratch Simulation, built on the first call
+        self.source = None  # The simulation the fork was built for
+        self.plan = []  # Inputs planned for the coming ticks, in reverse order (next one last)
+        self.plan_tick = -1  # simulation.ticks the next planned input is for
+        self.plan_seed = None
+        self.pending = None  # Paused search (a search() generator), its result extends the plan
+        self.best = []  # Longest line that died in the current search
+        self.search_ticks = 0
+
+        # Counters (for benchmarks)
+        self.decisions = 0
+        self.searches = 0
+        self.forks = 0  # States restored into the fork
+        self.fork_ticks = 0  # Ticks simulated in the fork
+        self.exhausted = 0  # Searches that ran out of budget
+        self.resumes = 0  # Ticks that continued a paused search
+        self.timeouts = 0  # Searches that ran out of time
+
+    def reset(self, seed=None):
+        """Forget the plan and copy the spawn settings again on the next call (the seed is not used)"""
+        self.source = None
+        self.plan = []
+        self.pending = None
+
+    def build_fork(self, simulation):
+        if self.fork is None or (self.fork.screen_width, self.fork.screen_height, self.fork.ground_y) != \
+                (simulation.screen_width, simulation.screen_height, simulation.ground_y):
+            self.fork = Simulation(simulation.screen_width, simulation.screen_height, simulation.ground_y)
+        self.fork.obstacle_manager.apply_spawn_settings(simulation.obstacle_manager.spawn_settings())
+        self.fork.token_manager.apply_spawn_settings(simulation.token_manager.spawn_settings())
+        self.source = simulation
+
+    @staticmethod
+    def reads_input(simulation):
+        """True if the dino starts this tick on the ground, where input counts"""
+        dino = simulation.dino
+        return dino.position.y >= simulation.ground_y + simulation.ground_offset - dino.rect.height // 2
+
+    def out_of_time(self):
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def search(self, state, ticks_left, line):
+        """Generator returning the inputs (in reverse order) that survive ticks_left ticks from state, or None
+
+        Yields before a fork tick past self.deadline; the next call to
+        next() continues from there.
+        line holds the inputs leading to state; the longest line that died
+        is kept in self.best as the fallback.
+        """
+        fork = self.fork
+        fork.restore_state(state)
+        self.forks += 1
+        step = fork.step
+        delta_time = fork.FIXED_DELTA
+        depth = len(line)
+        # Coast through the ticks where input is ignored
+        while ticks_left and fork.game_running and not self.reads_input(fork):
+            if self.out_of_time():
+                yield
+            step(delta_time, NO_INPUT)
+            line.append(NO_INPUT)
+            ticks_left -= 1
+            self.search_ticks += 1
+        if not fork.game_running or not ticks_left or self.search_ticks >= self.budget:
+            if fork.game_running and not ticks_left:
+                plan = line[depth:]
+                plan.reverse()
+                del line[depth:]
+                return plan
+            if len(line) > len(self.best):
+                self.best = line[:]
+            del line[depth:]
+            return None
+
+        branch = fork.save_state()
+        wait = DUCK if reflex_policy(fork) is DUCK else NO_INPUT
+        for choice in (JUMP, wait):
+            if self.out_of_time():
+                yield
+            if choice is wait:
+                fork.restore_state(branch)
+                self.forks += 1
+            step(delta_time, choice)
+            self.search_ticks += 1
+            line.append(choice)
+            if fork.game_running:
+                rest = yield from self.search(fork.save_state(), ticks_left - 1, line)
+                if rest is not None:
+                    rest.extend(reversed(line[depth:]))
+                    del line[depth:]
+                    return rest
+            elif len(line) > len(self.best):
+                self.best = line[:]
+            line.pop()
+        del line[depth:]
+        return None
+
+    def __call__(self, simulation):
+        self.decisions += 1
+        if not simulation.game_running:
+            return NO_INPUT
+        if (self.plan or self.pending) and (simulation.ticks != self.plan_tick or simulation.seed != self.plan_seed):
+            self.plan = []  # A new run, a rewind or ticks played without the autopilot
+            self.pending = None
+        if self.time_budget is not None:
+            self.deadline = time.perf_counter() + self.time_budget
+        if self.pending is not None:
+            self.resumes += 1
+            self.continue_search()
+        elif len(self.plan) < self.horizon_ticks // 2 + self.lead_ticks:
+            dino = simulation.dino
+            dino_rect = dino.get_collision_rect()
+            reach = simulation.speed * 3.0 * self.horizon_ticks * simulation.FIXED_DELTA
+            if simulation.obstacle_manager.obstacles.query(dino_rect.left, dino_rect.right + reach):
+                self.start_search(simulation)
+        self.plan_tick = simulation.ticks + 1
+        self.plan_seed = simulation.seed
+        if self.plan:
+            return self.plan.pop()
+        if not self.reads_input(simulation):
+            return NO_INPUT
+        return DUCK if reflex_policy(simulation) is DUCK else NO_INPUT
+
+    def start_search(self, simulation):
+        """Search inputs for the horizon ticks after the next lead_ticks planned ticks (the rest of the plan is dropped)"""
+        if self.source is not simulation:
+            self.build_fork(simulation)
+        self.searches += 1
+        self.search_ticks = 0
+        self.best = []
+        state = simulation.save_state()
+        plan = self.plan
+        del plan[:max(len(plan) - self.lead_ticks, 0)]
+        if plan:
+            fork = self.fork
+            step = fork.step
+            fork.restore_state(state)
+            ticks = 0
+            while ticks < len(plan) and fork.game_running:
+                step(fork.FIXED_DELTA, plan[-1 - ticks])
+                ticks += 1
+            self.fork_ticks += ticks
+            if not fork.game_running:
+                # A fallback line: keep half of the ticks it survives and search from there
+                del plan[:len(plan) - (ticks - 1) // 2]
+                fork.restore_state(state)
+                for tick_input in reversed(plan):
+                    step(fork.FIXED_DELTA, tick_input)
+                self.fork_ticks += len(plan)
+            state = fork.save_state()
+        self.pending = self.search(state, self.horizon_ticks, [])
+        self.continue_search()
+
+    def continue_search(self):
+        """Run the pending search until it ends or time_budget runs out; an ended search extends the plan
+
+        A search still running when the plan is used up is stopped and
+        its longest-lived line taken.
+        """
+        try:
+            next(self.pending)
+        except StopIteration as done:
+            plan = done.value
+        else:
+            if self.plan:
+                return  # Resumed on the next tick
+            self.pending.close()
+            self.timeouts += 1
+            plan = None
+        self.pending = None
+        self.fork_ticks += self.search_ticks
+        if plan is None:
+            if self.search_ticks >= self.budget:
+                self.exhausted += 1
+            plan = self.best
+            plan.reverse()
+        plan.extend(self.plan)
+        self.plan = plan
+
+
+class RandomPolicy:
+    """Press jump and duck at random (its own RNG, so spawns are unaffected)"""
+
+    def __init__(self, jump_probability=0.03, duck_probability=0.1, seed=None):
+        self.jump_probability = jump_probability
+        self.duck_probability = duck_probability
+        self.rng = random.Random(seed)
+
+    def reset(self, seed):
+        """Reseed for a new run"""
+        self.rng.seed(seed)
+
+    def __call__(self, simulation):
+        rng = self.rng
+        return TickInput(rng.random() < self.jump_probability, rng.random() < self.duck_probability)
+
+
+def batch_idle_policy(batch):
+    """Never press anything, in every game"""
+    nothing = np.zeros(batch.num_games, dtype=bool)
+    return nothing, nothing
+
+
+def batch_reflex_policy(batch):
+    """reflex_policy for every game at once (reacts to the nearest obstacle)"""
+    # Dino collision rect edges, as in BatchSimulation.step (ducking keeps the width)
+    dino_width = 80
+    dino_right = lround(batch.dino_x - 8) - dino_width // 2 + dino_width
+    horizon = batch.speed * batch.speed_multiplier * REACTION_TIME
+
+    obstacle_left = lround_array(batch.obs_x) - batch.obs_width // 2
+    distance = obstacle_left - dino_right
+    near = batch.obs_active & (distance > -batch.obs_width - dino_width) & (distance < horizon[:, None])
+    nearest = np.where(near, distance, np.iinfo(np.int32).max).argmin(axis=1)
+    rows = np.arange(batch.num_games)
+    bottom = batch.obs_top[rows, nearest] + batch.obs_height[rows, nearest]
+    reacting = near.any(axis=1)
+    bird = bottom < batch.ground_y - BIRD_CLEARANCE
+    return reacting & ~bird, reacting & bird
+
+
+class BatchRandomPolicy:
+    """RandomPolicy for every game at once"""
+
+    def __init__(self, jump_probability=0.03, duck_probability=0.1, seed=None):
+        self.jump_probability = jump_probability
+        self.duck_probability = duck_probability
+        self.rng = np.random.default_rng(seed)
+
+    def reset(self, seed):
+        """Reseed for a new batch of runs"""
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, batch):
+        n = batch.num_games
+        return self.rng.random(n) < self.jump_probability, self.rng.random(n) < self.duck_probability
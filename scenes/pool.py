@@ -0,0 +1,63 @@
+class ObjectPool:
+    """Free lists of despawned game objects, one list per kind
+
+    Managers release objects here when they go off screen or are collected
+    and acquire them again on the next spawn of the same kind, so steady
+    play stops creating new objects (and their Vector2s and Rects).
+
+    Counters:
+        prewarmed: objects built up front by prewarm()
+        created: acquire() found no free object (the caller built a new one)
+        reused: acquire() handed back a recycled object
+        released: objects returned to the pool
+    """
+
+    def __init__(self):
+        self.free = {}
+        self.prewarmed = 0
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+
+    def acquire(self, kind):
+        """Pop a recycled object of this kind, or None if the caller must create one
+
+        The caller is responsible for resetting a recycled object.
+        """
+        free = self.free.get(kind)
+        if free:
+            self.reused += 1
+            return free.pop()
+        self.created += 1
+        return None
+
+    def release(self, kind, obj):
+        """Return an object for reuse"""
+        free = self.free.get(kind)
+        if free is None:
+            free = self.free[kind] = []
+        free.append(obj)
+        self.released += 1
+
+    def prewarm(self, kind, count, create):
+        """Build objects with create() until count of this kind are free"""
+        free = self.free.get(kind)
+        if free is None:
+            free = self.free[kind] = []
+        while len(free) < count:
+            free.append(create())
+            self.prewarmed += 1
+            
+    def free_count(self):
+        """Number of objects waiting for reuse"""
+        return sum(len(free) for free in self.free.values())
+
+    def stats(self):
+        """Counters as a dict (for logging and benchmarks)"""
+        return {
+            "prewarmed": self.prewarmed,
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "free": self.free_count(),
+        }
@@ -0,0 +1,336 @@
+import json
+import threading
+import time
+from collections import deque
+import pygame
+from .path_utils import get_resource_path
+from .text import text_cache
+
+class Section:
+    """A with-block timed into one phase of a FrameProfiler
+
+    When profiling is off, entering and leaving costs one attribute check
+    each, so sections can stay in the game loop.
+    """
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.start is not None:
+            self.profiler.record(self.name, self.start, time.perf_counter())
+            self.start = None
+        return False
+
+
+class FrameProfiler:
+    """Per-phase frame timings with rolling percentiles and an optional trace
+
+    Game code marks phases with `with profiler.section(name):`. Methods of
+    objects that should not know about the profiler (the display-free
+    simulation) are timed with wrap(), whose wrappers are only installed
+    while profiling is on.
+
+    begin_frame() and end_frame() bracket the work of one frame. At the end
+    of a frame the time of every phase goes into a ring buffer of HISTORY
+    frames, which percentiles() reads. While a trace is recording every
+    section is also kept as a Chrome trace event, for chrome://tracing or
+    https://ui.perfetto.dev.
+    """
+
+    HISTORY = 600  # Frames kept for percentiles (10 s at 60 FPS)
+    MAX_TRACE_EVENTS = 1000000  # Recording stops growing past this
+
+    def __init__(self, history=HISTORY):
+        self.enabled = False
+        self.history = history
+        self.sections = {}  # Phase name -> Section
+        self.wrapped = {}  # (object id, method name) -> [object, method name, phase, original, had own attribute]
+        self.lock = threading.Lock()  # Simulation phases may be recorded from another thread
+
+        self.frame_start = None
+        self.frame_totals = {}  # Phase -> seconds in the current frame
+        self.samples = {}  # Phase -> seconds per frame over the last history frames
+        self.frames = deque(maxlen=history)  # Seconds of work per frame
+        self.frame_count = 0
+
+        # Trace recording
+        self.trace = None  # Trace events while recording
+        self.trace_start = 0.0
+        self.thread_names = {}  # threading ident -> name, for the trace metadata
+
+    def section(self, name):
+        """The Section for a phase (created on first use and reused)"""
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = Section(self, name)
+        return section
+
+    def wrap(self, obj, method_name, phase):
+        """Time every call of obj.method_name as phase while profiling is on"""
+        key = (id(obj), method_name)
+        if key in self.wrapped:
+            return
+        self.wrapped[key] = [obj, method_name, phase, None, False]
+        if self.enabled:
+            self.install(key)
+
+    def install(self, key):
+        entry = self.wrapped[key]
+        obj, method_name, phase, original, _ = entry
+        if original is not None:
+            return
+        original = getattr(obj, method_name)
+        record = self.record
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record(phase, start, time.perf_counter())
+
+        entry[3:] = original, method_name in vars(obj)
+        setattr(obj, method_name, timed)
+
+    def uninstall(self, key):
+        entry = self.wrapped[key]
+        obj, method_name, phase, original, had_own = entry
+        if original is None:
+            return
+        # Put back an attribute the object had, or let the class method show through again
+        if had_own:
+            setattr(obj, method_name, original)
+        else:
+            delattr(obj, method_name)
+        entry[3:] = None, False
+
+    def set_enabled(self, enabled):
+        """Turn timing on or off (installs or removes the method wrappers)"""
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        for key in list(self.wrapped):
+            if enabled:
+                self.install(key)
+            else:
+                self.uninstall(key)
+        self.frame_start = None
+        self.frame_totals = {}
+
+    def record(self, phase, start, end):
+        """Add one timed span to the current frame (and to the trace)"""
+        with self.lock:
+            self.frame_totals[phase] = self.frame_totals.get(phase, 0.0) + (end - start)
+            trace = self.trace
+            if trace is not None and len(trace) < self.MAX_TRACE_EVENTS:
+                ident = threading.get_ident()
+                if ident not in self.thread_names:
+                    self.thread_names[ident] = threading.current_thread().name
+                trace.append({"name": phase, "ph": "X", "pid": 1, "tid": ident,
+                              "ts": (start - self.trace_start) * 1e6, "dur": (end - start) * 1e6})
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Close the current frame and move its phase times into the history"""
+        if not self.enabled or self.frame_start is None:
+            return
+        now = time.perf_counter()
+        self.record("frame", self.frame_start, now)
+        self.frame_start = None
+        with self.lock:
+            totals = self.frame_totals
+            self.frame_totals = {}
+        self.frames.append(totals.pop("frame"))
+        for phase in totals:
+            if phase not in self.samples:
+                # Zero for the frames before the phase first ran, so every buffer covers the same frames
+                self.samples[phase] = deque([0.0] * len(self.frames), maxlen=self.history)
+        for phase, samples in self.samples.items():
+            samples.append(totals.get(phase, 0.0))
+        self.frame_count += 1
+
+    def last_frame(self):
+        """(frame seconds, {phase: seconds}) of the last finished frame, or None"""
+        if not self.frames:
+            return None
+        return self.frames[-1], {phase: samples[-1] for phase, samples in self.samples.items()}
+
+    @staticmethod
+    def percentiles(samples, points=(50, 95, 99)):
+        """Percentiles of a list of seconds (nearest rank)"""
+        ordered = sorted(samples)
+        if not ordered:
+            return tuple(0.0 for _ in points)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, len(ordered) * point // 100)] for point in points)
+
+    def summary(self):
+        """{phase: {"p50_ms", "p95_ms", "p99_ms"}} over the history, whole frame first"""
+        result = {}
+        for phase, samples in [("frame", self.frames)] + sorted(self.samples.items()):
+            p50, p95, p99 = self.percentiles(samples)
+            result[phase] = {"p50_ms": round(p50 * 1000, 3), "p95_ms": round(p95 * 1000, 3), "p99_ms": round(p99 * 1000, 3)}
+        return result
+
+    def reset(self):
+        """Forget the history"""
+        self.frames.clear()
+        self.samples = {}
+        self.frame_count = 0
+
+    @property
+    def tracing(self):
+        return self.trace is not None
+
+    def start_trace(self):
+        """Start keeping every section as a trace event (profiling must be on to record any)"""
+        with self.lock:
+            self.trace = []
+            self.trace_start = time.perf_counter()
+            self.thread_names = {}
+
+    def stop_trace(self, path):
+        """Stop recording and write the trace as Chrome trace JSON; returns the number of events"""
+        with self.lock:
+            events, self.trace = self.trace, None
+            thread_names = dict(self.thread_names)
+        if events is None:
+            return 0
+        metadata = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": ident, "args": {"name": name}}
+                    for ident, name in thread_names.items()]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+class ProfilerOverlay:
+    """On-screen frame graph and percentile table for a FrameProfiler
+
+    The graph is a stacked bar per frame, one pixel wide, scrolled left as
+    frames finish, so only the newest column is drawn each frame. The line
+    marks the frame budget. The table is rebuilt every REFRESH seconds.
+    """
+
+    # Graph colours, stacked bottom to top; time outside these phases is "other"
+    PHASES = (
+        ("events", (255, 255, 255)),
+        ("dino.update", (0, 200, 0)),
+        ("obstacles.update", (0, 150, 255)),
+        ("tokens.update", (255, 215, 0)),
+        ("background.update", (150, 75, 0)),
+        ("background.draw", (210, 140, 60)),
+        ("sprites.draw", (255, 80, 80)),
+        ("upscale", (255, 0, 255)),
+        ("hud.draw", (0, 255, 255)),
+        ("game_over.draw", (160, 160, 255)),
+        ("profiler.draw", (90, 90, 90)),
+        ("present", (255, 150, 200)),
+    )
+    OTHER_COLOR = (130, 130, 130)
+    GRAPH_HEIGHT = 80
+    GRAPH_BUDGETS = 2  # Frame budgets shown by the graph's height
+    ROW_HEIGHT = 16
+    PADDING = 6
+    REFRESH = 0.5
+
+    def __init__(self, profiler, screen_width, budget=1 / 60):
+        self.profiler = profiler
+        self.budget = budget
+        try:
+            self.font = pygame.font.Font(get_resource_path("assets/fonts/retro.ttf"), 14)
+        except (pygame.error, FileNotFoundError):
+            self.font = pygame.font.Font(None, 16)
+
+        # Name column as wide as the longest phase, then three number columns
+        self.name_width = max(self.font.size(phase.upper())[0] for phase, color in self.PHASES)
+        self.column_width = self.font.size("000.00")[0] + 8
+        self.width = self.PADDING * 2 + 12 + self.name_width + 3 * self.column_width
+        rows = len(self.PHASES) + 2  # Header and the whole frame
+        height = self.PADDING * 3 + self.GRAPH_HEIGHT + rows * self.ROW_HEIGHT
+        self.rect = pygame.Rect(screen_width - self.width - 10, 60, self.width, height)
+        self.panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.graph = pygame.Surface((self.width - self.PADDING * 2, self.GRAPH_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            self.panel = self.panel.convert_alpha()
+            self.graph = self.graph.convert()
+        self.graph.fill((0, 0, 0))
+        self.scale = self.GRAPH_HEIGHT / (self.budget * self.GRAPH_BUDGETS)  # Pixels per second
+        self.shown_frame = 0
+        self.next_refresh = 0.0
+        self.build_panel()
+
+    def update(self):
+        """Add the frames finished since the last call to the graph; refresh the table"""
+        profiler = self.profiler
+        if profiler.frame_count != self.shown_frame:
+            self.shown_frame = profiler.frame_count
+            last = profiler.last_frame()
+            if last:
+                self.add_column(*last)
+        now = time.perf_counter()
+        if now >= self.next_refresh:
+            self.next_refresh = now + self.REFRESH
+            self.build_panel()
+
+    def add_column(self, frame_time, phases):
+        graph = self.graph
+        width, height = graph.get_size()
+        x = width - 1
+        graph.scroll(-1, 0)
+        graph.fill((0, 0, 0), (x, 0, 1, height))
+        bottom = float(height)
+        stacked = 0.0
+        for phase, color in self.PHASES:
+            seconds = phases.get(phase, 0.0)
+            stacked += seconds
+            bottom = self.fill_bar(x, bottom, seconds, color)
+        self.fill_bar(x, bottom, max(0.0, frame_time - stacked), self.OTHER_COLOR)
+        budget_y = height - int(self.budget * self.scale)
+        graph.set_at((x, budget_y), (255, 255, 255))
+
+    def fill_bar(self, x, bottom, seconds, color):
+        """Draw one stacked segment ending at bottom; returns its top"""
+        top = max(0.0, bottom - seconds * self.scale)
+        if int(bottom) > int(top):
+            self.graph.fill(color, (x, int(top), 1, int(bottom) - int(top)))
+        return top
+
+    def build_panel(self):
+        panel = self.panel
+        panel.fill((0, 0, 0, 170))
+        padding = self.PADDING
+        rows = [("PHASE MS", None, ("P50", "P95", "P99"))]
+        profiler = self.profiler
+        for phase, color in (("frame", self.OTHER_COLOR),) + self.PHASES:
+            samples = profiler.frames if phase == "frame" else profiler.samples.get(phase, ())
+            rows.append((phase.upper(), color, tuple(f"{value * 1000:.2f}" for value in profiler.percentiles(samples))))
+
+        y = padding
+        first_column = padding + 12 + self.name_width + 8
+        columns = [first_column + i * self.column_width for i in range(3)]
+        for name, color, values in rows:
+            x = padding
+            if color:
+                panel.fill(color, (x, y + 3, 8, 8))
+            text_cache.draw(panel, name, self.font, x + 12, y, (255, 255, 255), shadow_offset=0)
+            for column, value in zip(columns, values):
+                text_cache.draw(panel, value, self.font, column, y, (255, 255, 255), shadow_offset=0)
+            y += self.ROW_HEIGHT
+        self.graph_top = y + padding
+
+    def draw(self, screen):
+        screen.blit(self.panel, self.rect)
+        screen.blit(self.graph, (self.rect.x + self.PADDING, self.rect.y + self.graph_top))
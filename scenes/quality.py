@@ -0,0 +1,130 @@
+from collections import deque, namedtuple
+
+# One step of render quality; the game applies every field when the level changes
+QualityLevel = namedtuple("QualityLevel", ["name", "background", "token_bob", "dino_animation", "text_shadows", "low_res"])
+
+# Highest to lowest, ordered by measured draw cost. The art is drawn at 3x,
+# so the low-res target is the least visible saving and comes first; with a
+# single merged background strip, drawing at full size is cheaper than the
+# upscale, so the last level goes back to it.
+QUALITY_LEVELS = (
+    QualityLevel("high", "high", True, 1.0, True, False),
+    QualityLevel("medium", "high", True, 1.0, True, True),
+    QualityLevel("low", "medium", False, 0.5, True, True),
+    QualityLevel("lowest", "low", False, 0.5, False, False),
+)
+
+class QualityGovernor:
+    """Steps render quality down when frames miss their budget and back up when they have room
+
+    record() is fed the work time of every frame (input, simulation and
+    drawing, without the frame limiter's sleep) and the wall time that
+    passed. The rolling mean over WINDOW frames is compared to the budget
+    of one frame at target_fps:
+        above DOWNGRADE_AT of the budget for a full window  -> one level down
+        below UPGRADE_AT of the budget for upgrade_hold s   -> one level up
+
+    Hysteresis keeps it from oscillating: the two thresholds are far apart
+    and nothing changes for COOLDOWN seconds after a change. Each downgrade
+    also measures how much cheaper the new level is than the one that
+    failed; an upgrade is only tried when that ratio predicts the level
+    above would fit within UPGRADE_MARGIN of the budget. An upgrade that
+    still has to be undone within RETRY_WINDOW seconds doubles the time
+    the governor waits before the next one.
+    """
+
+    WINDOW = 60
+    DOWNGRADE_AT = 1.0
+    UPGRADE_AT = 0.5
+    UPGRADE_HOLD = 5.0
+    MAX_UPGRADE_HOLD = 80.0
+    COOLDOWN = 2.0
+    RETRY_WINDOW = 10.0
+    UPGRADE_MARGIN = 0.8
+
+    def __init__(self, apply, target_fps=60, level=0, levels=QUALITY_LEVELS):
+        self.apply = apply  # Called with the new QualityLevel on every change
+        self.levels = levels
+        self.budget = 1.0 / target_fps
+        self.index = level
+        self.enabled = True
+
+        self.samples = deque(maxlen=self.WINDOW)
+        self.total = 0.0  # Sum of samples
+        self.clock = 0.0  # Wall seconds seen by record()
+        self.cooldown = 0.0
+        self.under_budget = 0.0  # Seconds the mean has stayed below UPGRADE_AT
+        self.upgrade_hold = self.UPGRADE_HOLD
+        self.last_upgrade = None  # clock of the last upgrade
+        self.cost_ratios = {}  # Level index -> its frame time / the next lower level's
+        self.failed_mean = None  # (index, mean) of the level just left by a downgrade
+        self.changes = 0
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def mean_frame_time(self):
+        """Rolling mean work time per frame in seconds (0 before any sample)"""
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def record(self, work_time, elapsed):
+        """Account one frame; returns True if the quality level changed"""
+        samples = self.samples
+        if len(samples) == samples.maxlen:
+            self.total -= samples[0]
+        samples.append(work_time)
+        self.total += work_time
+        self.clock += elapsed
+
+        if not self.enabled:
+            return False
+        if self.cooldown > 0.0:
+            self.cooldown -= elapsed
+            return False
+
+        mean = self.total / len(samples)
+        window_full = len(samples) == samples.maxlen
+        if window_full and self.failed_mean is not None:
+            index, failed_mean = self.failed_mean
+            self.cost_ratios[index] = failed_mean / max(mean, 1e-6)
+            self.failed_mean = None
+
+        if mean > self.budget * self.DOWNGRADE_AT:
+            self.under_budget = 0.0
+            if window_full and self.index < len(self.levels) - 1:
+                if self.last_upgrade is not None and self.clock - self.last_upgrade < self.RETRY_WINDOW:
+                    # The last upgrade did not hold; wait longer before the next attempt
+                    self.upgrade_hold = min(self.upgrade_hold * 2, self.MAX_UPGRADE_HOLD)
+                self.last_upgrade = None
+                failed = (self.index, mean)
+                changed = self.set_level(self.index + 1)
+                self.failed_mean = failed
+                return changed
+        elif mean < self.budget * self.UPGRADE_AT and self.index > 0:
+            predicted = mean * self.cost_ratios.get(self.index - 1, 1.0)
+            if predicted < self.budget * self.UPGRADE_MARGIN:
+                self.under_budget += elapsed
+            else:
+                self.under_budget = 0.0
+            if self.under_budget >= self.upgrade_hold:
+                self.last_upgrade = self.clock
+                return self.set_level(self.index - 1)
+        else:
+            self.under_budget = 0.0
+        return False
+
+    def set_level(self, index):
+        """Switch to a level now and start measuring afresh; returns True if it changed"""
+        index = max(0, min(index, len(self.levels) - 1))
+        if index == self.index:
+            return False
+        self.index = index
+        self.changes += 1
+        self.samples.clear()
+        self.total = 0.0
+        self.under_budget = 0.0
+        self.cooldown = self.COOLDOWN
+        self.failed_mean = None
+        self.apply(self.level)
+        return True
@@ -0,0 +1,120 @@
+import contextlib
+import pygame
+
+class DirtyRectRenderer:
+    """Presents only the parts of the window that changed since the last frame
+
+    Each frame the game describes what it is about to draw:
+        backdrop  anything that repaints the whole window (background scroll
+                  offsets, overlays); when it changes the frame is redrawn
+                  and flipped in full
+        items     key -> (screen rect, signature) for each sprite or text;
+                  an item is dirty when it appears, disappears, moves or its
+                  signature (sprite, text, colour...) changes
+
+    Dirty areas (old and new rects) are merged into a few regions. The frame
+    is redrawn clipped to each region and only those regions are sent to the
+    display. When nothing changed, nothing is drawn or presented at all, so
+    the start screen and the game over screen cost almost no CPU.
+    """
+
+    MAX_REGIONS = 4  # More scattered regions than this are drawn as one union
+
+    def __init__(self, screen, align=1, present_section=None):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.align = align  # Dirty rects are snapped to this pixel grid (low-res upscale)
+        self.enabled = True
+        self.previous_backdrop = None
+        self.previous_items = {}
+        self.needs_full_redraw = True
+        self.present_section = present_section or contextlib.nullcontext()  # Times sending frames to the display
+
+        # Counters (for the FPS overlay and benchmarks)
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.skipped_frames = 0
+        self.last_update_area = 0  # Pixels sent to the display by the last frame
+
+    def invalidate(self):
+        """Force a full redraw on the next frame (window exposed, mode changed)"""
+        self.needs_full_redraw = True
+
+    def present(self, backdrop, items, draw):
+        """Draw and present one frame
+
+        draw(clip) renders the whole frame limited to the clip rect (None
+        means the whole window). Returns "full", "partial" or "skipped".
+        """
+        previous_items = self.previous_items
+        self.previous_items = items
+
+        if not self.enabled or self.needs_full_redraw or backdrop != self.previous_backdrop:
+            self.previous_backdrop = backdrop
+            self.needs_full_redraw = False
+            draw(None)
+            with self.present_section:
+                pygame.display.flip()
+            self.full_frames += 1
+            self.last_update_area = self.screen_rect.width * self.screen_rect.height
+            return "full"
+
+        dirty = []
+        for key, entry in items.items():
+            old = previous_items.get(key)
+            if old != entry:
+                dirty.append(entry[0])
+                if old is not None:
+                    dirty.append(old[0])
+        for key, old in previous_items.items():
+            if key not in items:
+                dirty.append(old[0])
+
+        regions = self.merge(dirty)
+        if not regions:
+            self.skipped_frames += 1
+            self.last_update_area = 0
+            return "skipped"
+
+        for region in regions:
+            draw(region)
+        with self.present_section:
+            pygame.display.update(regions)
+        self.partial_frames += 1
+        self.last_update_area = sum(region.width * region.height for region in regions)
+        return "partial"
+
+    def merge(self, rects):
+        """Snap rects to the grid, clip them to the window and merge overlaps"""
+        align = self.align
+        regions = []
+        for rect in rects:
+            rect = pygame.Rect(rect)
+            if align > 1:
+                left = rect.left // align * align
+                top = rect.top // align * align
+                right = -(-rect.right // align) * align
+                bottom = -(-rect.bottom // align) * align
+                rect.update(left, top, right - left, bottom - top)
+            rect = rect.clip(self.screen_rect)
+            if not rect.width or not rect.height:
+                continue
+
+            # Absorb every region this one touches (repeat until stable)
+            index = rect.collidelist(regions)
+            while index != -1:
+                rect.union_ip(regions.pop(index))
+                index = rect.collidelist(regions)
+            regions.append(rect)
+
+        if len(regions) > self.MAX_REGIONS:
+            regions = [regions[0].unionall(regions[1:])]
+        return regions
+
+    def stats(self):
+        """Frame counters as a dict"""
+        return {
+            "full": self.full_frames,
+            "partial": self.partial_frames,
+            "skipped": self.skipped_frames,
+        }
@@ -0,0 +1,282 @@
+import bisect
+import struct
+import zlib
+from .simulation import Simulation, TickInput, NO_INPUT
+
+# Input codes stored per tick: bit 0 jump, bit 1 duck
+INPUTS = (NO_INPUT, TickInput(True, False), TickInput(False, True), TickInput(True, True))
+
+def input_code(tick_input):
+    """The code of a TickInput in INPUTS"""
+    return tick_input.jump | tick_input.duck << 1
+
+
+def encode_runs(inputs):
+    """Run-length encode input codes: one varint (run length << 2 | code) per run"""
+    out = bytearray()
+    count = len(inputs)
+    i = 0
+    while i < count:
+        code = inputs[i]
+        start = i
+        while i < count and inputs[i] == code:
+            i += 1
+        value = (i - start) << 2 | code
+        while value >= 0x80:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+# Longest run encode_runs() output decodes to: varints of a run length < 2**32 take at most 5 bytes
+MAX_VARINT_BYTES = 5
+
+
+def decode_runs(data, ticks):
+    """Input codes from encode_runs() output, as a bytearray; raises ValueError past ticks codes"""
+    inputs = bytearray()
+    total = 0
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            if shift >= 7 * MAX_VARINT_BYTES:
+                raise ValueError("Replay input run is too long")
+            continue
+        total += value >> 2
+        if total > ticks:
+            raise ValueError(f"Replay has more than {ticks} ticks of input, as the header says")
+        inputs.extend(bytes((value & 3,)) * (value >> 2))
+        value = shift = 0
+    if shift:
+        raise ValueError("Replay input stream is truncated")
+    return inputs
+
+
+class Replay:
+    """A recorded run: its seed and the input of every tick
+
+    The simulation is deterministic for a seed and its inputs, so this is
+    all it takes to play a run again. The claimed result (score, coins,
+    tick count and whether the run ended in a death) is stored too, so a
+    replay can be checked by simulating it. assisted marks runs played by
+    the autopilot, a scripted policy or with rewind, which set no high
+    score however well they replay.
+
+    File format (little endian): a HEADER with the magic, version, flags,
+    screen size, seed, ticks, score and coins, then the zlib-compressed
+    run-length-encoded input codes (see encode_runs()).
+    """
+
+    MAGIC = b"DRPL"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBBHHQIII")
+    ENDED = 1  # Flag: the run ended in a death on its last tick
+    ASSISTED = 2  # Flag: the run was played by the autopilot or a policy, or rewound
+    MAX_TICKS = 24 * 60 * 60 * Simulation.TICK_RATE  # Longer replays are rejected unread
+
+    def __init__(self, seed, screen_width=1152, screen_height=648, inputs=()):
+        if not 0 <= seed < 2 ** 64:
+            raise ValueError(f"Replay seed must fit in 64 bits, got {seed}")
+        self.seed = seed
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.inputs = bytearray(inputs)  # Input code of every running tick, in order
+
+        # Claimed result
+        self.score = 0
+        self.token_score = 0
+        self.ended = False
+        self.assisted = False
+
+    @property
+    def ticks(self):
+        return len(self.inputs)
+
+    @property
+    def duration(self):
+        """Length of the run in seconds of game time"""
+        return len(self.inputs) / Simulation.TICK_RATE
+
+    def set_result(self, simulation, assisted=False):
+        """Take the claimed result from the simulation that played the run"""
+        self.score = int(simulation.score)
+        self.token_score = simulation.token_score
+        self.ended = simulation.game_ended
+        self.assisted = assisted
+
+    def mismatches(self, simulation):
+        """How a simulation of this replay differs from the claimed result (empty if it matches)"""
+        problems = []
+        if simulation.game_ended != self.ended or simulation.ticks != self.ticks:
+            simulated = f"{'died at' if simulation.game_ended else 'alive after'} tick {simulation.ticks}"
+            claimed = f"{'died at' if self.ended else 'alive after'} tick {self.ticks}"
+            problems.append(f"{simulated}, claimed {claimed}")
+        if int(simulation.score) != self.score:
+            problems.append(f"score {int(simulation.score)}, claimed {self.score}")
+        if simulation.token_score != self.token_score:
+            problems.append(f"coins {simulation.token_score}, claimed {self.token_score}")
+        return problems
+
+    def matches(self, simulation):
+        """True if a simulation of this replay got the claimed result"""
+        return not self.mismatches(simulation)
+
+    def to_bytes(self):
+        flags = (self.ENDED if self.ended else 0) | (self.ASSISTED if self.assisted else 0)
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, flags, self.screen_width, self.screen_height, self.seed, len(self.inputs), self.score, self.token_score)
+        return header + zlib.compress(encode_runs(self.inputs), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Parse to_bytes() output; raises ValueError for anything else"""
+        if len(data) < cls.HEADER.size:
+            raise ValueError("Replay is truncated")
+        magic, version, flags, screen_width, screen_height, seed, ticks, score, token_score = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a replay file")
+        if version != cls.VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        if ticks > cls.MAX_TICKS:
+            raise ValueError(f"Replay claims {ticks} ticks, more than the {cls.MAX_TICKS} allowed")
+        # Every run takes at least one byte, so the stream is at most this long
+        max_length = max(ticks * MAX_VARINT_BYTES, 1)  # 0 would mean no limit
+        try:
+            decompressor = zlib.decompressobj()
+            stream = decompressor.decompress(data[cls.HEADER.size:], max_length)
+        except zlib.error as e:
+            raise ValueError(f"Replay input stream is corrupt: {e}")
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Replay input stream is longer than {ticks} ticks need")
+        if not decompressor.eof:
+            raise ValueError("Replay input stream is truncated")
+        inputs = decode_runs(stream, ticks)
+        if len(inputs) != ticks:
+            raise ValueError(f"Replay has {len(inputs)} ticks of input, header says {ticks}")
+        replay = cls(seed, screen_width, screen_height, inputs)
+        replay.score = score
+        replay.token_score = token_score
+        replay.ended = bool(flags & cls.ENDED)
+        replay.assisted = bool(flags & cls.ASSISTED)
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def simulate(replay, simulation=None):
+    """Play a replay headless as fast as possible; returns the simulation at its end
+
+    A simulation of the replay's screen size is created unless one is given
+    (reusing one across replays saves building its objects). Playback stops
+    at the first death, so a replay with inputs past it does not match.
+    """
+    if simulation is None:
+        simulation = Simulation(replay.screen_width, replay.screen_height)
+    simulation.new_game(replay.seed)
+    simulation.start()
+    step = simulation.step
+    delta_time = simulation.FIXED_DELTA
+    for code in replay.inputs:
+        if not simulation.game_running:
+            break
+        step(delta_time, INPUTS[code])
+    return simulation
+
+
+class ReplayRecorder:
+    """Records the inputs of the run being played into a Replay"""
+
+    def __init__(self):
+        self.replay = None  # Replay of the current (or last) run
+
+    def record(self, simulation, tick_input):
+        """Add the input of a tick the simulation just ran (call after every running tick)"""
+        if simulation.ticks == 1:
+            self.replay = Replay(simulation.seed, simulation.screen_width, simulation.screen_height)
+        elif self.replay is None:
+            return  # Started recording halfway through a run; wait for the next one
+        self.replay.inputs.append(input_code(tick_input))
+
+
+class ReplayPlayer:
+    """Plays a replay through a simulation tick by tick, with seeking
+
+    Every KEYFRAME_INTERVAL seconds of the run the simulation state (and the
+    background scroll, when a background is given) is kept as a keyframe
+    the first time playback passes it. seek() restores the nearest keyframe
+    at or before the target and simulates the rest headless, so seeking
+    never replays more than one interval, except forwards into a part not
+    played yet.
+    """
+
+    KEYFRAME_INTERVAL = 5.0
+
+    def __init__(self, replay, simulation, background=None):
+        self.replay = replay
+        self.simulation = simulation
+        self.background = background
+        self.keyframe_ticks = int(self.KEYFRAME_INTERVAL * simulation.TICK_RATE)
+        self.keyframes = {}  # Tick -> (SimulationState, background scroll_state() or None)
+        self.keyframe_list = []  # Sorted keyframe ticks
+
+    def start(self):
+        """Start the run from the beginning"""
+        self.simulation.new_game(self.replay.seed)
+        self.simulation.start()
+        self.keyframes.clear()
+        self.keyframe_list.clear()
+        self.capture()
+
+    @property
+    def at_end(self):
+        """True when the recorded inputs are used up or the run ended"""
+        return self.simulation.ticks >= self.replay.ticks or not self.simulation.game_running
+
+    def next_input(self):
+        """TickInput for the next tick (nothing held past the end of the recording)"""
+        tick = self.simulation.ticks
+        inputs = self.replay.inputs
+        return INPUTS[inputs[tick]] if tick < len(inputs) else NO_INPUT
+
+    def tick_done(self):
+        """Call after every tick played from next_input(); keeps keyframes"""
+        if self.simulation.ticks % self.keyframe_ticks == 0:
+            self.capture()
+
+    def capture(self):
+        tick = self.simulation.ticks
+        if tick not in self.keyframes:
+            scroll = self.background.scroll_state() if self.background else None
+            self.keyframes[tick] = (self.simulation.save_state(), scroll)
+            bisect.insort(self.keyframe_list, tick)
+
+    def step(self):
+        """Play one tick headless (the background scrolls, nothing is drawn)"""
+        simulation = self.simulation
+        simulation.step(simulation.FIXED_DELTA, self.next_input())
+        if self.background and simulation.game_running:
+            self.background.update(simulation.FIXED_DELTA, simulation.speed)
+        self.tick_done()
+
+    def seek(self, tick):
+        """Jump to a tick of the run (clamped to the recording)"""
+        tick = max(0, min(tick, self.replay.ticks))
+        simulation = self.simulation
+        keyframe = self.keyframe_list[bisect.bisect_right(self.keyframe_list, tick) - 1]
+        # Simulating on from where we are is cheaper if no keyframe lies between
+        if not keyframe <= simulation.ticks <= tick:
+            state, scroll = self.keyframes[keyframe]
+            simulation.restore_state(state)
+            if scroll is not None:
+                self.background.restore_scroll(scroll)
+        while simulation.ticks < tick and simulation.game_running:
+            self.step()
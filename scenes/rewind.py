@@ -0,0 +1,53 @@
+from collections import namedtuple
+
+# Everything MainGame needs to go back to a moment of a run: the
+# Simulation.save_state() and the Background.scroll_state() of that tick
+GameState = namedtuple("GameState", ["simulation", "scroll"])
+
+
+class RewindBuffer:
+    """Fixed-size ring of the most recent game states
+
+    Holds at most capacity states in a list allocated once; pushing onto a
+    full ring overwrites the oldest. States are compact tuples of plain
+    values that share their unchanged parts (see Simulation.save_state()),
+    so memory stays bounded by capacity times the size of one state.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.states = [None] * capacity
+        self.start = 0  # Index of the oldest state
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, state):
+        """Add the newest state, dropping the oldest when full"""
+        index = self.start + self.count
+        if index >= self.capacity:
+            index -= self.capacity
+        self.states[index] = state
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = index + 1 if index + 1 < self.capacity else 0
+
+    def pop(self):
+        """Remove and return the newest state (None when empty)"""
+        if not self.count:
+            return None
+        self.count -= 1
+        index = self.start + self.count
+        if index >= self.capacity:
+            index -= self.capacity
+        state = self.states[index]
+        self.states[index] = None
+        return state
+
+    def clear(self):
+        for i in range(self.capacity):
+            self.states[i] = None
+        self.start = 0
+        self.count = 0
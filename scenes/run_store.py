@@ -0,0 +1,185 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# One finished run. powerups is a tuple of (effect, times picked up) pairs,
+# ended_at a Unix time and duration in seconds. assisted runs (rewind or
+# autopilot) are kept in the history but left off the leaderboard.
+RunRecord = namedtuple("RunRecord", [
+    "ended_at", "score", "coins", "duration", "death_cause", "powerups", "seed", "assisted",
+])
+
+# Per-day summary from RunStore.daily()
+DaySummary = namedtuple("DaySummary", ["day", "runs", "best_score", "coins"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,
+    day TEXT NOT NULL,  -- Local date the run ended, YYYY-MM-DD
+    score INTEGER NOT NULL,
+    coins INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    death_cause TEXT,
+    powerups TEXT NOT NULL,  -- "effect=count,..."
+    seed INTEGER,
+    assisted INTEGER NOT NULL
+);
+-- Leaderboard: the first rows in index order are the answer, so top-N reads N rows.
+-- coins lets daily summaries read only the index
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (assisted, score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, assisted, score DESC, coins);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+COLUMNS = "ended_at, score, coins, duration, death_cause, powerups, seed, assisted"
+INSERT = f"INSERT INTO runs (day, {COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+HIGH_SCORE_MIGRATED = "high_score_json_migrated"
+
+
+def run_record(simulation, assisted=False, ended_at=None):
+    """RunRecord of the run a Simulation just played"""
+    return RunRecord(time.time() if ended_at is None else ended_at, int(simulation.score), simulation.token_score,
+                     simulation.ticks / simulation.TICK_RATE, simulation.death_cause,
+                     tuple(simulation.powerups_used.items()), simulation.seed, assisted)
+
+
+def day_of(timestamp):
+    """Local date of a Unix time as YYYY-MM-DD"""
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+def encode_powerups(powerups):
+    return ",".join(f"{effect}={count}" for effect, count in powerups)
+
+
+def decode_powerups(text):
+    pairs = (item.split("=") for item in text.split(",") if item)
+    return tuple((effect, int(count)) for effect, count in pairs)
+
+
+class RunStore:
+    """Run history and leaderboard in a local SQLite database
+
+    record() only queues a run: a writer thread with its own connection
+    takes whatever has queued up and inserts it in one transaction, so
+    the game never waits for the disk. The database runs in WAL mode,
+    which lets the leaderboard be read while the writer commits. Queries
+    read the runs_by_score and runs_by_day indexes in order, so a top-10
+    reads ten rows however many runs are stored, and daily summaries
+    only read the index entries of their days.
+
+    Call close() (or flush()) before exiting; runs still queued are lost
+    otherwise.
+    """
+
+    def __init__(self, path, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size  # Most runs inserted per transaction
+        self.connection = self.connect()
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+        self.pending = queue.Queue()
+        self.writes = 0  # Transactions committed by the writer
+        self.writer = threading.Thread(target=self.write_loop, name="run-store", daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; commits skip the fsync
+        return connection
+
+    def record(self, run):
+        """Queue a RunRecord for the writer thread (returns at once)"""
+        self.pending.put(run)
+
+    def flush(self):
+        """Wait until every queued run is written"""
+        self.pending.join()
+
+    def close(self):
+        """Write the queued runs and stop the writer"""
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        self.connection.close()
+
+    def write_loop(self):
+        connection = self.connect()
+        running = True
+        while running:
+            runs = [self.pending.get()]
+            while len(runs) < self.batch_size:
+                try:
+                    runs.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            if None in runs:
+                running = False  # close() puts None after the last run
+            rows = [(day_of(run.ended_at), run.ended_at, run.score, run.coins, run.duration, run.death_cause,
+                     encode_powerups(run.powerups), run.seed, int(run.assisted)) for run in runs if run is not None]
+            try:
+                with connection:
+                    connection.executemany(INSERT, rows)
+                self.writes += 1
+            except sqlite3.Error as e:
+                print(f"Error saving {len(rows)} run(s): {e}")
+            for _ in runs:
+                self.pending.task_done()
+        connection.close()
+
+    def top(self, count=10, day=None, assisted=False):
+        """The count best RunRecords, of one day (YYYY-MM-DD) when given; assisted runs count when assisted is True"""
+        where = "assisted = ?" if day is None else "day = ? AND assisted = ?"
+        best = f"SELECT {COLUMNS} FROM runs WHERE {where} ORDER BY score DESC LIMIT ?"
+        day_argument = [] if day is None else [day]
+        if assisted:
+            # Merges the best of each assisted value, so both read the index in order instead of sorting every run
+            query = f"SELECT * FROM ({best}) UNION ALL SELECT * FROM ({best}) ORDER BY score DESC LIMIT ?"
+            arguments = day_argument + [0, count] + day_argument + [1, count, count]
+        else:
+            query = best
+            arguments = day_argument + [0, count]
+        rows = self.connection.execute(query, arguments).fetchall()
+        return [RunRecord(ended_at, score, coins, duration, death_cause, decode_powerups(powerups), seed, bool(assisted))
+                for ended_at, score, coins, duration, death_cause, powerups, seed, assisted in rows]
+
+    def best_score(self):
+        """Best unassisted score (0 with no runs)"""
+        row = self.connection.execute("SELECT MAX(score) FROM runs WHERE assisted = 0").fetchone()
+        return row[0] or 0
+
+    def daily(self, first_day, last_day):
+        """DaySummary of every day from first_day to last_day (YYYY-MM-DD) with runs, oldest first (assisted runs included)"""
+        rows = self.connection.execute(
+            "SELECT day, COUNT(*), MAX(score), SUM(coins) FROM runs WHERE day BETWEEN ? AND ? GROUP BY day ORDER BY day",
+            (first_day, last_day)).fetchall()
+        return [DaySummary(*row) for row in rows]
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def migrate_high_score(self, path):
+        """Import the score of an old high_score.json once, as a run without details; True if imported"""
+        with self.connection:
+            if self.connection.execute("SELECT 1 FROM meta WHERE key = ?", (HIGH_SCORE_MIGRATED,)).fetchone():
+                return False
+            try:
+                with open(path, "r") as f:
+                    score = int(json.load(f).get("high_score", 0))
+                ended_at = os.path.getmtime(path)
+            except FileNotFoundError:
+                score = 0
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                # Unreadable, not JSON, not an object or not a number: nothing to import
+                print(f"Error reading {path}: {e}")
+                score = 0
+            if score > 0:
+                self.connection.execute(INSERT, (day_of(ended_at), ended_at, score, 0, 0.0, None, "", None, 0))
+            self.connection.execute("INSERT INTO meta VALUES (?, ?)", (HIGH_SCORE_MIGRATED, str(score)))
+        return score > 0
@@ -0,0 +1,332 @@
+import random
+from collections import namedtuple
+from .dino import Dino
+from .obstacles import ObstacleManager
+from .tokens import TokenManager
+from .background import Background
+
+# Per-tick player input. The simulation never polls the keyboard itself.
+TickInput = namedtuple("TickInput", ["jump", "duck"])
+NO_INPUT = TickInput(False, False)
+JUMP = TickInput(True, False)
+DUCK = TickInput(False, True)
+
+
+class VersionedRandom(random.Random):
+    """random.Random that counts changes to its state
+
+    getstate() copies the whole Mersenne Twister state (625 ints), but the
+    spawners only draw a few times a second, so most saved states can share
+    the last copy; version tells when it went stale. Draws produce the same
+    numbers as random.Random.
+    """
+
+    version = 0
+
+    def random(self):
+        self.version += 1
+        return super().random()
+
+    def getrandbits(self, k):
+        self.version += 1
+        return super().getrandbits(k)
+
+    def seed(self, *args, **kwargs):
+        self.version += 1
+        super().seed(*args, **kwargs)
+
+    def setstate(self, state):
+        self.version += 1
+        super().setstate(state)
+
+# Everything that decides how a run continues, from Simulation.save_state().
+# Objects are stored as tuples of plain values, so a state shares nothing
+# with the live game and can be restored any number of times. States saved
+# between two spawns share one (immutable) rng state tuple.
+SimulationState = namedtuple("SimulationState", [
+    "seed", "rng_state", "game_running", "game_ended", "score", "token_score", "speed", "base_speed",
+    "difficulty", "camera_x", "ticks", "death_cause", "active_powerups", "coin_multiplier", "is_invincible",
+    "powerups_used", "dino", "obstacles", "tokens",
+])
+
+class Simulation:
+    """Display-free game logic: dino, obstacles, tokens, powerups and scoring
+
+    Works without a window, audio device or keyboard. Each call to step()
+    advances the game by one fixed tick using an explicit TickInput. All
+    spawning draws from one seeded random.Random, so the same seed and the
+    same inputs always reproduce the same run. Side effects that belong to
+    the presentation layer (sounds, game over screen) are reported through
+    the events list, which is refilled on every step. Spawns, powerups and
+    skin changes are only printed when verbose is set (the game sets it;
+    headless users leave it off).
+    """
+
+    # Constants for game settings
+    DINO_START_POS = (150, 485)
+    START_SPEED = 200.0  # Higher starting speed
+    MAX_SPEED = 1000.0  # Much higher max speed
+    SPEED_MODIFIER = 50  # Lower modifier means faster speed gain
+    SCORE_MODIFIER = 10
+    MAX_DIFFICULTY = 2
+
+    # Fixed simulation rate, independent of the render frame rate
+    TICK_RATE = 60
+    FIXED_DELTA = 1.0 / TICK_RATE
+
+    def __init__(self, screen_width=1152, screen_height=648, ground_y=None, seed=None, verbose=False):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        if ground_y is None:
+            ground_y = Background.compute_ground_y(screen_height)
+        self.ground_y = ground_y
+        # Ground offset so the dino stays a bit lower
+        self.ground_offset = 40
+        self.verbose = verbose  # Print game events to the console
+
+        # Game variables
+        self.game_running = False
+        self.game_ended = False
+        self.score = 0
+        self.token_score = 0  # Separate score for tokens collected
+        self.speed = self.START_SPEED
+        self.base_speed = self.START_SPEED  # Store original speed for powerup calculations
+        self.difficulty = 0
+        self.camera_x = 0
+        self.ticks = 0
+        self.death_cause = None  # Obstacle type that ended the run
+
+        # Powerup effects
+        self.active_powerups = {}  # Dictionary to track active powerups
+        self.powerups_used = {}  # Powerup effect -> times picked up this run
+        self.coin_multiplier = 1  # Multiplier for coin collection (doublegold effect)
+        self.is_invincible = False  # God mode invincibility state
+
+        # Events produced by the last step: (name, data) tuples
+        self.events = []
+
+        # Per-session random source shared by every spawner
+        self.seed = None
+        self.rng = VersionedRandom()
+        self.rng_state = None  # Last rng.getstate(), shared by saved states
+        self.rng_state_version = -1  # rng.version it was taken at
+
+        # Game objects
+        self.dino = Dino(self.DINO_START_POS[0], self.ground_y - self.ground_offset, verbose)
+        self.obstacle_manager = ObstacleManager(screen_width, self.ground_y, self.rng, verbose)
+        self.token_manager = TokenManager(screen_width, self.ground_y, self.rng, verbose)
+
+        self.new_game(seed)
+
+    def new_game(self, seed=None):
+        """Reset the simulation for a new run
+
+        Args:
+            seed: seed for this run's spawns; a fresh random seed when None
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng.seed(seed)
+
+        self.score = 0
+        self.token_score = 0
+        self.game_running = False
+        self.game_ended = False
+        self.difficulty = 0
+        self.speed = self.START_SPEED
+        self.base_speed = self.START_SPEED
+        self.camera_x = 0
+        self.ticks = 0
+        self.death_cause = None
+
+        # Reset powerups
+        self.active_powerups.clear()
+        self.powerups_used.clear()
+        self.coin_multiplier = 1
+        self.is_invincible = False
+        self.events = []
+
+        # Reset game objects
+        self.dino.position.x = self.DINO_START_POS[0]
+        self.dino.position.y = self.ground_y + self.ground_offset - self.dino.rect.height // 2  # Use consistent offset
+        self.dino.velocity.x = 0
+        self.dino.velocity.y = 0
+        self.dino.state = "idle"
+        self.dino.store_previous_position()
+
+        self.obstacle_manager.clear()
+        self.token_manager.clear()
+
+    def save_state(self):
+        """The run as it is now, as a SimulationState for restore_state()"""
+        if self.rng_state_version != self.rng.version:
+            self.rng_state = self.rng.getstate()
+            self.rng_state_version = self.rng.version
+        return SimulationState(
+            self.seed, self.rng_state, self.game_running, self.game_ended, self.score, self.token_score,
+            self.speed, self.base_speed, self.difficulty, self.camera_x, self.ticks, self.death_cause,
+            tuple(self.active_powerups.items()), self.coin_multiplier, self.is_invincible, tuple(self.powerups_used.items()),
+            self.dino.save_state(), self.obstacle_manager.save_state(), self.token_manager.save_state(),
+        )
+
+    def restore_state(self, state):
+        """Continue from a SimulationState; the following ticks match those after it was saved"""
+        (self.seed, rng_state, self.game_running, self.game_ended, self.score, self.token_score,
+         self.speed, self.base_speed, self.difficulty, self.camera_x, self.ticks, self.death_cause,
+         active_powerups, self.coin_multiplier, self.is_invincible, powerups_used, dino, obstacles, tokens) = state
+        self.active_powerups.clear()
+        self.active_powerups.update(active_powerups)
+        self.powerups_used.clear()
+        self.powerups_used.update(powerups_used)
+        self.events = []
+        self.dino.restore_state(dino)
+        self.obstacle_manager.restore_state(obstacles)
+        self.token_manager.restore_state(tokens)
+        self.rng.setstate(rng_state)
+        self.rng_state = rng_state
+        self.rng_state_version = self.rng.version
+
+    def start(self):
+        """Start running (leave the idle/start screen)"""
+        if not self.game_running and not self.game_ended:
+            self.game_running = True
+
+    def step(self, delta_time=FIXED_DELTA, tick_input=NO_INPUT):
+        """Advance the simulation by one tick"""
+        if self.events:
+            self.events = []  # A new list: the last one may still be held by whoever read it
+
+        if self.game_running:
+            self.ticks += 1
+
+            # Update powerups first
+            self.update_powerups(delta_time)
+
+            # Calculate base speed for scoring (always normal speed)
+            self.base_speed = self.START_SPEED + self.score / self.SPEED_MODIFIER
+            if self.base_speed > self.MAX_SPEED:
+                self.base_speed = self.MAX_SPEED
+
+            # Movement speed (can be affected by halfspeed powerup)
+            if "halfspeed" in self.active_powerups:
+                self.speed = self.base_speed * 0.7 # Slower movement for obstacles/background
+            else:
+                self.speed = self.base_speed
+
+            self.difficulty = int(self.score / self.SPEED_MODIFIER)
+            if self.difficulty > self.MAX_DIFFICULTY:
+                self.difficulty = self.MAX_DIFFICULTY
+
+            # Update camera position (following dino)
+            self.camera_x = self.dino.position.x - 200
+
+            # Update score (always use base_speed, not affected by halfspeed powerup)
+            self.score += self.base_speed * delta_time
+
+            # Update game objects
+            self.update_dino(delta_time, tick_input)
+            self.obstacle_manager.update(delta_time, self.speed, self.score, self.difficulty, self.camera_x)
+            self.token_manager.update(delta_time, self.speed, self.score, self.difficulty, self.camera_x, self.obstacle_manager)
+
+            # Check token collisions (collect tokens and powerups)
+            coin_value, powerup_effects = self.token_manager.check_collision(self.dino)
+            if coin_value > 0:
+                # Apply coin multiplier from doublegold powerup
+                actual_coins = coin_value * self.coin_multiplier
+                self.token_score += actual_coins
+                if self.coin_multiplier > 1 and self.verbose:
+                    print(f"Doublegold active! Collected {coin_value} coin(s) -> {actual_coins} coins!")
+                self.events.append(("coin", actual_coins))
+
+            # Handle powerup effects
+            for powerup in powerup_effects:
+                self.activate_powerup(powerup["effect"], powerup["duration"], powerup["type"])
+
+            # Check obstacle collisions (game over) - only if not invincible
+            if not self.is_invincible:
+                obstacle = self.obstacle_manager.find_collision(self.dino)
+                if obstacle is not None:
+                    self.death_cause = obstacle.KIND
+                    self.game_over()
+        else:
+            # Update dino in idle state
+            self.update_dino(delta_time, tick_input)
+
+    def update_dino(self, delta_time, tick_input):
+        """Update the dino and report a jump event"""
+        self.dino.update(delta_time, self.game_running, self.ground_y + self.ground_offset, self.active_powerups, self.score, tick_input)
+        if self.dino.jumped:
+            self.events.append(("jump", None))
+
+    def game_over(self):
+        """End the run"""
+        self.game_running = False
+        self.game_ended = True
+        self.events.append(("game_over", int(self.score)))
+
+    def update_powerups(self, delta_time):
+        """Update active powerup timers"""
+        if not self.active_powerups:
+            return
+        expired_powerups = []
+
+        for powerup_name, remaining_time in self.active_powerups.items():
+            remaining_time -= delta_time
+            if remaining_time <= 0:
+                expired_powerups.append(powerup_name)
+            else:
+                self.active_powerups[powerup_name] = remaining_time
+
+        # Remove expired powerups and reset their effects
+        for powerup_name in expired_powerups:
+            del self.active_powerups[powerup_name]
+            if powerup_name == "doublegold":
+                self.coin_multiplier = 1
+                message = "Doublegold powerup expired!"
+            elif powerup_name == "halfspeed":
+                message = "Halfspeed powerup expired!"
+            elif powerup_name == "godmode":
+                self.is_invincible = False
+                message = "God mode powerup expired!"
+            if self.verbose:
+                print(message)
+            self.events.append(("powerup_expired", powerup_name))
+
+    def activate_powerup(self, effect, duration, powerup_type):
+        """Activate a powerup effect"""
+        message = None
+        if effect == "halfspeed":
+            self.active_powerups["halfspeed"] = duration
+            message = f"Halfspeed activated for {duration} seconds! (Slower gameplay, same scoring)"
+        elif effect == "doublegold":
+            self.active_powerups["doublegold"] = duration
+            self.coin_multiplier = 2
+            message = f"Doublegold activated for {duration} seconds!"
+        elif effect == "godmode":
+            self.active_powerups["godmode"] = duration
+            self.is_invincible = True
+            message = f"God mode activated for {duration} seconds! (Invincible to obstacles)"
+        if message and self.verbose:
+            print(message)
+        self.powerups_used[effect] = self.powerups_used.get(effect, 0) + 1
+        self.events.append(("powerup", effect))
+
+    def run(self, policy, seed=None, max_ticks=None):
+        """Play one full run headless at the fixed tick rate
+
+        Args:
+            policy: callable taking the simulation and returning a TickInput
+            seed: seed for the run (random when None)
+            max_ticks: optional tick limit for runs that never end
+
+        Returns:
+            int: number of ticks simulated
+        """
+        self.new_game(seed)
+        self.start()
+        while self.game_running:
+            self.step(self.FIXED_DELTA, policy(self))
+            if max_ticks is not None and self.ticks >= max_ticks:
+                break
+        return self.ticks
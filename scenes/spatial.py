@@ -0,0 +1,91 @@
+class SortedXList:
+    """Game objects kept in ascending position.x order (sweep-and-prune broadphase)
+
+    Obstacles and tokens only ever move left, all by the same amount per
+    tick, so once an object is inserted in x order it stays in order. That
+    lets collision and spawn checks binary-search for the few objects near
+    an x range instead of scanning every live object, and lets off-screen
+    objects be dropped from the front in one slice.
+
+    Iteration, len() and indexing behave like the plain list it replaces.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.max_half_width = 0  # Widest object seen, so queries can pad by it
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def _bisect(self, x, right=False):
+        """Index of the first object with position.x >= x (> x when right)"""
+        items = self.items
+        lo, hi = 0, len(items)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_x = items[mid].position.x
+            if mid_x < x or (right and mid_x == x):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def add(self, obj):
+        """Insert an object at its x position (after any object with the same x)"""
+        if obj.rect:
+            # Rect edges are rounded from position.x, so pad by one pixel
+            half_width = (obj.rect.width + 1) // 2 + 1
+            if half_width > self.max_half_width:
+                self.max_half_width = half_width
+
+        items = self.items
+        if not items or items[-1].position.x <= obj.position.x:
+            items.append(obj)  # Usual case: spawned ahead of everything
+        else:
+            items.insert(self._bisect(obj.position.x, right=True), obj)
+
+    def remove(self, obj):
+        """Remove one object"""
+        items = self.items
+        index = self._bisect(obj.position.x)
+        while items[index] is not obj:
+            index += 1
+        del items[index]
+
+    def remove_before(self, x):
+        """Drop every object with position.x < x; returns the dropped objects"""
+        count = self._bisect(x)
+        if not count:
+            return ()
+        removed = self.items[:count]
+        del self.items[:count]
+        return removed
+
+    def span(self, left, right):
+        """(start, stop): items[start:stop] are the objects query() returns
+
+        Builds no list, for checks that run every tick. Adding or removing
+        objects moves the indices.
+        """
+        pad = self.max_half_width
+        return self._bisect(left - pad), self._bisect(right + pad, right=True)
+
+    def query(self, left, right):
+        """Objects whose rects may overlap the x range [left, right), in x order
+
+        The result is a new list, so the caller may remove objects while
+        iterating over it.
+        """
+        start, stop = self.span(left, right)
+        return self.items[start:stop]
+
+    def clear(self):
+        """Remove all objects"""
+        self.items.clear()
+        self.max_half_width = 0
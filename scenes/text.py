@@ -0,0 +1,154 @@
+import re
+import numpy as np
+import pygame
+from collections import OrderedDict
+
+class TextCache:
+    """Rendered text with its drop shadow baked into one surface
+
+    Strings are rendered once per (text, font, color, shadow) and reused
+    until evicted, so unchanging labels cost one blit per frame instead of
+    two font.render calls and two blits.
+
+    Strings with digits (score, timers, FPS) would fill the cache with a
+    new string every frame, so they are drawn glyph by glyph from a per-font
+    atlas of pre-rendered digits instead; only once such a string has been
+    drawn PROMOTE_AFTER times (high score, coins) is it baked like a label.
+    The game fonts have no kerning, so glyphs placed by their advance land
+    exactly where font.render would put them.
+    """
+
+    ATLAS_CHARS = "0123456789."
+    DIGIT_RUNS = re.compile(r"([0-9][0-9.]*)")  # Split keeps runs at odd indices
+    PROMOTE_AFTER = 30  # Draws of the same digit string before it is cached whole
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (text, font, color, shadow) -> (surface, width, height)
+        self.atlases = {}  # (font, color, shadow) -> (surface, {char: (area, advance)})
+        self.sightings = {}  # Digit string key -> times drawn from the atlas
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def bake(text, font, color, shadow_color, shadow_offset):
+        """Render text over its shadow into one per-pixel alpha surface
+
+        The two anti-aliased renders are composited exactly ("over"), so
+        blitting the result matches blitting the shadow and then the text.
+        """
+        main = font.render(text, True, color)
+        width, height = main.get_size()
+        surface = pygame.Surface((width + shadow_offset, height + shadow_offset), pygame.SRCALPHA)
+        if not shadow_offset:
+            surface.blit(main, (0, 0))
+            return surface
+        shadow = font.render(text, True, shadow_color)
+
+        main_alpha = np.zeros(surface.get_size())
+        main_alpha[:width, :height] = pygame.surfarray.pixels_alpha(main) / 255.0
+        shadow_alpha = np.zeros(surface.get_size())
+        shadow_alpha[shadow_offset:, shadow_offset:] = pygame.surfarray.pixels_alpha(shadow) / 255.0
+        shadow_alpha *= 1.0 - main_alpha
+        alpha = main_alpha + shadow_alpha
+
+        rgb = (np.multiply.outer(main_alpha, color) + np.multiply.outer(shadow_alpha, shadow_color))
+        rgb /= np.maximum(alpha, 1e-6)[..., None]
+        pygame.surfarray.pixels3d(surface)[...] = np.rint(rgb)
+        pygame.surfarray.pixels_alpha(surface)[...] = np.rint(alpha * 255)
+        return surface
+
+    def get(self, text, font, color, shadow_color=(0, 0, 0), shadow_offset=2):
+        """Cached (surface, text width, text height) for a string"""
+        key = (text, font, color, shadow_color, shadow_offset)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        surface = self.bake(text, font, color, shadow_color, shadow_offset)
+        entry = (surface, surface.get_width() - shadow_offset, surface.get_height() - shadow_offset)
+        self.entries[key] = entry
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def get_atlas(self, font, color, shadow_color=(0, 0, 0), shadow_offset=2):
+        """Digit glyphs of a font side by side in one surface, built on first use"""
+        key = (font, color, shadow_color, shadow_offset)
+        atlas = self.atlases.get(key)
+        if atlas is not None:
+            return atlas
+
+        glyphs = [self.bake(char, font, color, shadow_color, shadow_offset) for char in self.ATLAS_CHARS]
+        width = sum(glyph.get_width() + 1 for glyph in glyphs)  # 1px gap so areas never bleed
+        height = max(glyph.get_height() for glyph in glyphs)
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        areas = {}
+        x = 0
+        for char, glyph in zip(self.ATLAS_CHARS, glyphs):
+            # Additive blit onto clear pixels copies the glyph exactly
+            surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            areas[char] = (pygame.Rect(x, 0, glyph.get_width(), glyph.get_height()), font.metrics(char)[0][4])
+            x += glyph.get_width() + 1
+        atlas = self.atlases[key] = (surface, areas)
+        return atlas
+
+    def draw(self, screen, text, font, x, y, color, shadow_color=(0, 0, 0), shadow_offset=2):
+        """Draw shadowed text; returns the (width, height) of the text itself"""
+        key = (text, font, color, shadow_color, shadow_offset)
+        if key not in self.entries and self.DIGIT_RUNS.search(text):
+            count = self.sightings.get(key, 0) + 1
+            if count < self.PROMOTE_AFTER:
+                if len(self.sightings) >= self.max_entries:
+                    self.sightings.clear()  # Old values of changing fields
+                self.sightings[key] = count
+                return self.draw_digits(screen, text, font, x, y, color, shadow_color, shadow_offset)
+            self.sightings.pop(key, None)
+            
+        surface, width, height = self.get(text, font, color, shadow_color, shadow_offset)
+        screen.blit(surface, (x, y))
+        return width, height
+        
+    def draw_digits(self, screen, text, font, x, y, color, shadow_color=(0, 0, 0), shadow_offset=2):
+        """Draw text with its digit runs taken glyph by glyph from the atlas"""
+        atlas, areas = self.get_atlas(font, color, shadow_color, shadow_offset)
+        start = x
+        for i, part in enumerate(self.DIGIT_RUNS.split(text)):
+            if i % 2:
+                for char in part:
+                    area, advance = areas[char]
+                    screen.blit(atlas, (x, y), area)
+                    x += advance
+            elif part:
+                surface, width, height = self.get(part, font, color, shadow_color, shadow_offset)
+                screen.blit(surface, (x, y))
+                x += width
+        return x - start, font.get_height()
+
+    def stats(self):
+        """Counters as a dict (for logging and benchmarks)"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "atlases": len(self.atlases),
+        }
+
+    def clear(self):
+        """Drop every cached string and atlas"""
+        self.entries.clear()
+        self.atlases.clear()
+        self.sightings.clear()
+
+
+# Shared by the HUD and the game over screen
+text_cache = TextCache()
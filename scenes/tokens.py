@@ -2,12 +2,31 @@ import pygame
 import random
 import math
 from .game_object import GameObject
+from .assets import asset_cache
 from .path_utils import get_resource_path
+from .spatial import SortedXList
+from .pool import ObjectPool
 
 class Token(GameObject):
     """Collectible token class"""
     
-    def __init__(self, x, y, token_type="coin", scale=1):  # Much smaller scale for large sprites
+    SPRITE_PATHS = {
+        "coin": "assets/img/rewards/coin.png",
+        "halfspeed": "assets/img/rewards/halfspeed.png",
+        "doublegold": "assets/img/rewards/doublegold.png",
+        "godmode": "assets/img/rewards/godmode.png"
+    }
+    
+    # Render setting shared by every token: draw the bob, or keep tokens on
+    # their spawn line (the simulated position, and collisions, still bob)
+    draw_bob = True
+    
+    @staticmethod
+    def preload_assets(scale=1):
+        """Load every token sprite into the asset cache before gameplay starts"""
+        asset_cache.preload(images=[(get_resource_path(path), scale) for path in Token.SPRITE_PATHS.values()])
+    
+    def __init__(self, x, y, token_type="coin", scale=1, rng=random):  # Much smaller scale for large sprites
         super().__init__(x, y)
         self.token_type = token_type
         
@@ -34,33 +53,60 @@ class Token(GameObject):
         # Animation properties for visual appeal
         self.bob_speed = 3.0  # Speed of up/down movement
         self.bob_amplitude = 5  # Amplitude of bobbing motion
-        self.bob_offset = random.uniform(0, 2 * math.pi)  # Random start phase
+        self.bob_offset = rng.uniform(0, 2 * math.pi)  # Random start phase
         self.initial_y = y
         
         # Load token sprite based on type
         self.load_token_sprite(token_type, scale)
         
+    def reset(self, x=0, y=0, rng=random):
+        """Return a recycled token to its freshly spawned state (same type and sprite)"""
+        super().reset(x, y)
+        self.collected = False
+        self.bob_offset = rng.uniform(0, 2 * math.pi)  # Random start phase
+        self.initial_y = y
+        
+    def save_state(self):
+        """GameObject state plus the bob phase and spawn line"""
+        return (super().save_state(), self.collected, self.bob_offset, self.initial_y)
+        
+    def restore_state(self, state):
+        object_state, self.collected, self.bob_offset, self.initial_y = state
+        super().restore_state(object_state)
+        
+    def get_render_rect(self, alpha=1.0):
+        """Interpolated sprite rect, without the bob when draw_bob is off"""
+        rect = super().get_render_rect(alpha)
+        if not Token.draw_bob:
+            rect.centery = self.initial_y / asset_cache.render_factor
+        return rect
+        
+    def snapshot_positions(self):
+        """(previous, current) centre, kept on the spawn line when draw_bob is off"""
+        if Token.draw_bob:
+            return super().snapshot_positions()
+        return (self.previous_position.x, self.initial_y), (self.position.x, self.initial_y)
+        
+    def reload_sprites(self):
+        """Fetch the sprite again after the render factor changed"""
+        if self.sprite_path:
+            super().reload_sprites()
+        else:
+            self.create_fallback_sprite(self.scale)
+        
     def load_token_sprite(self, token_type, scale):
         """Load the appropriate sprite for the token type"""
-        sprite_paths = {
-            "coin": get_resource_path("assets/img/rewards/coin.png"),
-            "halfspeed": get_resource_path("assets/img/rewards/halfspeed.png"),
-            "doublegold": get_resource_path("assets/img/rewards/doublegold.png"),
-            "godmode": get_resource_path("assets/img/rewards/godmode.png")
-        }
-        
-        sprite_path = sprite_paths.get(token_type, sprite_paths["coin"])
+        sprite_path = get_resource_path(self.SPRITE_PATHS.get(token_type, self.SPRITE_PATHS["coin"]))
         
         try:
             self.load_sprite(sprite_path, scale)
-            print(f"{token_type.capitalize()} loaded successfully at position ({self.position.x}, {self.position.y}), scale: {scale}")
         except Exception as e:
             # Create a simple colored rectangle as fallback
             self.create_fallback_sprite(scale)
             
     def create_fallback_sprite(self, scale):
         """Create a simple colored shape if sprite loading fails"""
-        size = int(24 * scale)  # Base size scaled
+        size = int(24 * scale)  # Base size scaled (logical)
         print(f"Creating fallback {self.token_type} sprite with size: {size}x{size}")
         
         # Different colors for different token types
@@ -73,7 +119,9 @@ class Token(GameObject):
         
         color = colors.get(self.token_type, colors["coin"])
         
-        # Create different shapes for different powerups
+        # Create different shapes for different powerups (drawn at render resolution)
+        logical_size = size
+        size = max(1, size // asset_cache.render_factor)
         self.sprite = pygame.Surface((size, size), pygame.SRCALPHA)
         
         if self.token_type == "coin":
@@ -101,7 +149,7 @@ class Token(GameObject):
             pygame.draw.rect(self.sprite, (200, 200, 200), (center - thickness//2, thickness, thickness, size - 2*thickness), 2)
             pygame.draw.rect(self.sprite, (200, 200, 200), (thickness, center - thickness//2, size - 2*thickness, thickness), 2)
         
-        self.rect = self.sprite.get_rect()
+        self.rect = pygame.Rect(0, 0, logical_size, logical_size)
         self.rect.center = (self.position.x, self.position.y)
         print(f"Fallback {self.token_type} rect: {self.rect}")
         
@@ -109,6 +157,8 @@ class Token(GameObject):
         """Update token position and animation"""
         if self.collected:
             return
+        
+        self.store_previous_position()
             
         # Move left with game speed
         self.velocity.x = -speed * self.speed_multiplier
@@ -141,22 +191,34 @@ class Token(GameObject):
 class TokenManager:
     """Manages all tokens in the game"""
     
-    def __init__(self, screen_width, ground_y):
+    PREWARM_PER_TYPE = 4  # More than are ever on screen at once
+    SPAWN_SETTINGS = (
+        "min_spawn_interval", "max_spawn_interval", "min_powerup_interval", "max_powerup_interval",
+        "coin_probability", "doublegold_probability", "halfspeed_min_score", "godmode_min_score",
+        "godmode_probability", "min_distance_from_obstacles", "vertical_safe_zone",
+    )
+    
+    def __init__(self, screen_width, ground_y, rng=None, verbose=False):
         self.screen_width = screen_width
         self.ground_y = ground_y
-        self.tokens = []
+        self.verbose = verbose  # Print every powerup spawn
+        self.tokens = SortedXList()  # Kept in x order; every token moves at the same speed
+        # Random source for spawning (a seeded random.Random for reproducible runs)
+        self.rng = rng if rng is not None else random.Random()
+        # Collected and off-screen tokens waiting to be reused, per token type
+        self.pool = ObjectPool()
         
         # Spawn timing
         self.spawn_timer = 0.0
         self.min_spawn_interval = 3.0  # Minimum seconds between token spawns
         self.max_spawn_interval = 8.0  # Maximum seconds between token spawns
-        self.next_spawn_time = random.uniform(self.min_spawn_interval, self.max_spawn_interval)
+        self.next_spawn_time = self.rng.uniform(self.min_spawn_interval, self.max_spawn_interval)
         
         # Powerup spawn timing (separate from regular tokens)
         self.powerup_spawn_timer = 0.0
         self.min_powerup_interval = 15.0  # Minimum seconds between powerup spawns
         self.max_powerup_interval = 30.0  # Maximum seconds between powerup spawns
-        self.next_powerup_time = random.uniform(self.min_powerup_interval, self.max_powerup_interval)
+        self.next_powerup_time = self.rng.uniform(self.min_powerup_interval, self.max_powerup_interval)
         
         # Token heights (different levels for variety)
         self.token_heights = [
@@ -191,7 +253,7 @@ class TokenManager:
             base_max = self.max_spawn_interval
             difficulty_factor = max(0.5, 1.0 - (difficulty * 0.2))
             
-            self.next_spawn_time = random.uniform(
+            self.next_spawn_time = self.rng.uniform(
                 base_min * difficulty_factor,
                 base_max * difficulty_factor
             )
@@ -203,15 +265,63 @@ class TokenManager:
         if self.powerup_spawn_timer >= self.next_powerup_time:
             self.spawn_powerup(camera_x, score, obstacle_manager)
             self.powerup_spawn_timer = 0.0
-            self.next_powerup_time = random.uniform(self.min_powerup_interval, self.max_powerup_interval)
+            self.next_powerup_time = self.rng.uniform(self.min_powerup_interval, self.max_powerup_interval)
         
         # Update existing tokens
-        for token in self.tokens[:]:  # Use slice copy to allow removal during iteration
+        for token in self.tokens:
             token.update(delta_time, speed)
             
-            # Remove tokens that are off screen
-            if token.is_off_screen(camera_x, self.screen_width):
-                self.tokens.remove(token)
+        # Remove tokens that are off screen (always the leftmost ones, see Token.is_off_screen)
+        for token in self.tokens.remove_before(camera_x - 100):
+            self.pool.release(token.token_type, token)
+                
+    def spawn_settings(self):
+        """Spawn tuning by attribute name, for apply_spawn_settings()"""
+        return {name: getattr(self, name) for name in self.SPAWN_SETTINGS}
+        
+    def apply_spawn_settings(self, settings):
+        for name, value in settings.items():
+            setattr(self, name, value)
+        
+    def save_state(self):
+        """Spawn timers and every token's state, for restore_state()"""
+        return (self.spawn_timer, self.next_spawn_time, self.powerup_spawn_timer, self.next_powerup_time,
+                tuple((token.token_type, token.save_state()) for token in self.tokens))
+        
+    def restore_state(self, state):
+        """Put back a save_state(); tokens come from the pool (does not touch the random source)"""
+        self.spawn_timer, self.next_spawn_time, self.powerup_spawn_timer, self.next_powerup_time, tokens = state
+        current = self.tokens
+        if len(current) == len(tokens) and all(token.token_type == token_type for token, (token_type, _) in zip(current, tokens)):
+            # Same tokens as when saved (a nearby tick): restore them in place
+            for token, (token_type, token_state) in zip(current, tokens):
+                token.restore_state(token_state)
+            return
+        for token in self.tokens:
+            self.pool.release(token.token_type, token)
+        self.tokens.clear()
+        for token_type, token_state in tokens:
+            token = self.pool.acquire(token_type)
+            if token is None:
+                token = Token(0, 0, token_type)
+            token.restore_state(token_state)
+            self.tokens.add(token)
+            
+    def prewarm(self, count=PREWARM_PER_TYPE):
+        """Build pooled tokens up front so spawning never allocates during play"""
+        for token_type in Token.SPRITE_PATHS:
+            # The module-level random keeps the seeded spawn sequence untouched
+            self.pool.prewarm(token_type, count, lambda: Token(0, 0, token_type))
+            
+    def create_token(self, x, y, token_type):
+        """Get a token from the pool (or a new one) and add it to the field"""
+        token = self.pool.acquire(token_type)
+        if token is None:
+            token = Token(x, y, token_type, rng=self.rng)
+        else:
+            token.reset(x, y, self.rng)
+        self.tokens.add(token)
+        return token
                 
     def is_safe_spawn_position(self, x, y, obstacle_manager):
         """Check if a position is safe to spawn a token (not overlapping with obstacles)"""
@@ -221,8 +331,11 @@ class TokenManager:
         # Create a temporary rect for the proposed token position
         token_rect = pygame.Rect(x - 20, y - 20, 40, 40)  # Token size approximation
         
-        # Check against all existing obstacles
-        for obstacle in obstacle_manager.obstacles:
+        # Check against the obstacles whose safe zone can reach the token
+        margin = self.min_distance_from_obstacles
+        obstacles = obstacle_manager.obstacles
+        for index in range(*obstacles.span(token_rect.left - margin, token_rect.right + margin)):
+            obstacle = obstacles[index]
             if obstacle.rect:
                 # Expand obstacle rect with safety buffer
                 safe_rect = obstacle.rect.inflate(
@@ -243,23 +356,21 @@ class TokenManager:
         
         while attempts < max_attempts:
             # Position token ahead of camera
-            x = camera_x + self.screen_width + random.randint(100, 300)
-            y = random.choice(self.token_heights)
+            x = camera_x + self.screen_width + self.rng.randint(100, 300)
+            y = self.rng.choice(self.token_heights)
             
             # Check if position is safe
             if obstacle_manager is None or self.is_safe_spawn_position(x, y, obstacle_manager):
                 # Create coin
-                token = Token(x, y, "coin")
-                self.tokens.append(token)
+                self.create_token(x, y, "coin")
                 return
                 
             attempts += 1
         
         # If we couldn't find a safe position, spawn anyway but further ahead
-        x = camera_x + self.screen_width + random.randint(400, 600)
-        y = random.choice(self.token_heights)
-        token = Token(x, y, "coin")
-        self.tokens.append(token)
+        x = camera_x + self.screen_width + self.rng.randint(400, 600)
+        y = self.rng.choice(self.token_heights)
+        self.create_token(x, y, "coin")
         
     def spawn_powerup(self, camera_x, score, obstacle_manager=None):
         """Spawn a powerup in a safe location based on conditions"""
@@ -270,7 +381,7 @@ class TokenManager:
         available_powerups = []
         
         # Doublegold can always spawn (but with probability)
-        if random.random() < self.doublegold_probability:
+        if self.rng.random() < self.doublegold_probability:
             available_powerups.append("doublegold")
             
         # Halfspeed only spawns if score is high enough
@@ -278,40 +389,40 @@ class TokenManager:
             available_powerups.append("halfspeed")
             
         # Godmode only spawns if score is very high and with low probability
-        if score >= self.godmode_min_score and random.random() < self.godmode_probability:
+        if score >= self.godmode_min_score and self.rng.random() < self.godmode_probability:
             available_powerups.append("godmode")
         
         # Return early if no powerups are available
         if not available_powerups:
             return
             
-        powerup_type = random.choice(available_powerups)
+        powerup_type = self.rng.choice(available_powerups)
         
         while attempts < max_attempts:
             # Position powerup ahead of camera
-            x = camera_x + self.screen_width + random.randint(200, 500)
-            y = random.choice(self.token_heights)
+            x = camera_x + self.screen_width + self.rng.randint(200, 500)
+            y = self.rng.choice(self.token_heights)
             
             # Check if position is safe
             if obstacle_manager is None or self.is_safe_spawn_position(x, y, obstacle_manager):
-                powerup = Token(x, y, powerup_type)
-                self.tokens.append(powerup)
-                print(f"Spawned {powerup_type} powerup at score {int(score)} at safe position")
+                self.create_token(x, y, powerup_type)
+                if self.verbose:
+                    print(f"Spawned {powerup_type} powerup at score {int(score)} at safe position")
                 return
                 
             attempts += 1
         
         # If we couldn't find a safe position, spawn anyway but much further ahead
-        x = camera_x + self.screen_width + random.randint(600, 800)
-        y = random.choice(self.token_heights)
-        powerup = Token(x, y, powerup_type)
-        self.tokens.append(powerup)
-        print(f"Spawned {powerup_type} powerup at score {int(score)} at fallback position")
+        x = camera_x + self.screen_width + self.rng.randint(600, 800)
+        y = self.rng.choice(self.token_heights)
+        self.create_token(x, y, powerup_type)
+        if self.verbose:
+            print(f"Spawned {powerup_type} powerup at score {int(score)} at fallback position")
         
     def choose_token_type(self):
         """Choose a token type based on rarity weights"""
         total_weight = sum(self.token_types.values())
-        random_value = random.randint(1, total_weight)
+        random_value = self.rng.randint(1, total_weight)
         
         cumulative_weight = 0
         for token_type, weight in self.token_types.items():
@@ -322,43 +433,59 @@ class TokenManager:
         return "coin"  # Fallback
         
     def check_collision(self, dino):
-        """Check collision between dino and tokens"""
-        collected_items = []
+        """Check collision between dino and tokens
+
+        Returns (coin value, powerup effects). The effects are an empty
+        tuple on the usual tick nothing is collected, so checking allocates
+        nothing then.
+        """
         total_coin_value = 0
-        powerup_effects = []
-        
-        for token in self.tokens[:]:
-            if not token.collected and token.collides_with(dino):
-                collected_data = token.collect()
-                collected_items.append(collected_data)
-                
-                if collected_data["type"] == "coin":
-                    total_coin_value += collected_data["value"]
-                else:
-                    # It's a powerup
-                    powerup_effects.append({
-                        "effect": collected_data["effect"],
-                        "duration": collected_data["duration"],
-                        "type": collected_data["type"]
-                    })
-                
-                self.tokens.remove(token)
+        powerup_effects = ()
+        
+        dino_rect = dino.get_rect()
+        items = self.tokens.items
+        index, stop = self.tokens.span(dino_rect.left, dino_rect.right)
+        while index < stop:
+            token = items[index]
+            if token.collected or not token.collides_with(dino):
+                index += 1
+                continue
+            collected_data = token.collect()
+            
+            if collected_data["type"] == "coin":
+                total_coin_value += collected_data["value"]
+            else:
+                # It's a powerup
+                if not powerup_effects:
+                    powerup_effects = []
+                powerup_effects.append({
+                    "effect": collected_data["effect"],
+                    "duration": collected_data["duration"],
+                    "type": collected_data["type"]
+                })
+            
+            # Removing it moves the tokens after it down one index
+            del items[index]
+            stop -= 1
+            self.pool.release(token.token_type, token)
                 
         return total_coin_value, powerup_effects
         
-    def draw(self, screen):
-        """Draw all tokens"""
+    def draw(self, screen, alpha=1.0):
+        """Draw all tokens (alpha interpolates between the last two ticks)"""
         active_items = 0
         for token in self.tokens:
             if not token.collected:
                 active_items += 1
                 if token.sprite and token.rect:
-                    token.draw(screen)
+                    token.draw(screen, alpha)
                 
     def clear(self):
         """Clear all tokens (for game restart)"""
+        for token in self.tokens:
+            self.pool.release(token.token_type, token)
         self.tokens.clear()
         self.spawn_timer = 0.0
         self.powerup_spawn_timer = 0.0
-        self.next_spawn_time = random.uniform(self.min_spawn_interval, self.max_spawn_interval)
-        self.next_powerup_time = random.uniform(self.min_powerup_interval, self.max_powerup_interval)
+        self.next_spawn_time = self.rng.uniform(self.min_spawn_interval, self.max_spawn_interval)
+        self.next_powerup_time = self.rng.uniform(self.min_powerup_interval, self.max_powerup_interval)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Show the leaderboard and run history kept by the game (runs.db, see
+scenes/run_store.py).
+
+Lists the best runs overall or of one day, or one line per day with the
+number of runs, the best score and the coins collected. Assisted runs
+(rewind or autopilot) are listed only with --assisted; day lines count
+every run.
+
+Usage:
+    python tools/leaderboard.py                    # top 10
+    python tools/leaderboard.py --top 50 --day 2026-10-16
+    python tools/leaderboard.py --days 30
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.path_utils import get_save_path
+from scenes.run_store import RunStore, day_of
+
+
+def format_run(rank, run):
+    powerups = ", ".join(f"{effect} x{count}" for effect, count in run.powerups) or "-"
+    ended = time.strftime("%Y-%m-%d %H:%M", time.localtime(run.ended_at))
+    return (f"{rank:3d}. {run.score // 10:7d}  {run.coins:4d} coins  {run.duration:6.1f}s  {run.death_cause or '-':7s}"
+            f"  {ended}  seed {run.seed if run.seed is not None else '-'}  powerups: {powerups}"
+            f"{'  (assisted)' if run.assisted else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the leaderboard and run history")
+    parser.add_argument("--database", default=get_save_path("runs.db"))
+    parser.add_argument("--top", type=int, default=10, help="number of runs to list")
+    parser.add_argument("--day", help="only runs of this day (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, help="one line per day for the last DAYS days instead of runs")
+    parser.add_argument("--assisted", action="store_true", help="include runs that used rewind or the autopilot")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        print(f"No run history at {args.database}")
+        return 1
+    try:
+        store = RunStore(args.database)
+    except sqlite3.Error as e:
+        print(f"Error opening {args.database}: {e}")
+        return 1
+    try:
+        if args.days:
+            now = time.time()
+            for day in store.daily(day_of(now - (args.days - 1) * 86400), day_of(now)):
+                print(f"{day.day}: {day.runs:6d} runs, best {day.best_score // 10:7d}, {day.coins} coins")
+        else:
+            print(f"{store.count()} runs recorded; best of {args.day or 'all time'}:")
+            for rank, run in enumerate(store.top(args.top, args.day, args.assisted), 1):
+                print(format_run(rank, run))
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
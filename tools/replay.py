@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Record and check replays without a window.
+
+play re-simulates replay files headless as fast as the simulation runs,
+checks each against the result stored in it and reports how much faster
+than real time it played. record plays seeded runs with a scripted policy
+(see scenes/policies.py) and saves them as replays, marked assisted so
+the verification service does not take them for high scores. Watch a
+replay in the game with `python main.py --replay=FILE`.
+
+Usage:
+    python tools/replay.py play run.replay [more.replay ...]
+    python tools/replay.py record --policy reflex --seeds 1-20 --output replays
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.simulation import Simulation
+from scenes.replay import Replay, ReplayRecorder, simulate
+from scenes import policies
+
+
+def parse_seeds(spec):
+    """"1-20" or "3,7,9" -> list of ints"""
+    seeds = []
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        seeds.extend(range(int(first), int(last or first) + 1))
+    return seeds
+
+
+def play(paths):
+    """Simulate every replay; returns the number that did not match"""
+    mismatches = 0
+    simulations = {}  # Screen size -> Simulation, reused across replays
+    total_ticks = 0
+    total_time = 0.0
+    for path in paths:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}")
+            mismatches += 1
+            continue
+        size = (replay.screen_width, replay.screen_height)
+        if size not in simulations:
+            simulations[size] = Simulation(*size)
+        start = time.perf_counter()
+        simulation = simulate(replay, simulations[size])
+        elapsed = time.perf_counter() - start
+        total_ticks += simulation.ticks
+        total_time += elapsed
+        problems = replay.mismatches(simulation)
+        mismatches += bool(problems)
+        print(f"{path}: seed {replay.seed}, {replay.duration:.1f}s in {os.path.getsize(path)} bytes, "
+              f"score {replay.score // 10}, coins {replay.token_score}{' (assisted)' if replay.assisted else ''} -> "
+              f"{'MISMATCH (' + '; '.join(problems) + ')' if problems else 'OK'}"
+              f" ({simulation.ticks / Simulation.TICK_RATE / max(elapsed, 1e-9):.0f}x real time)")
+    if total_time:
+        print(f"{len(paths)} replays, {total_ticks / Simulation.TICK_RATE / total_time:.0f}x real time overall")
+    return mismatches
+
+
+def record(policy_name, seeds, output, max_seconds):
+    """Play and save one run per seed"""
+    if policy_name == "random":
+        policy = policies.RandomPolicy()
+    elif policy_name == "lookahead":
+        policy = policies.LookaheadPolicy()
+    else:
+        policy = policies.reflex_policy if policy_name == "reflex" else policies.idle_policy
+    os.makedirs(output, exist_ok=True)
+    recorder = ReplayRecorder()
+    simulation = Simulation()
+    max_ticks = int(max_seconds * Simulation.TICK_RATE)
+    for seed in seeds:
+        if policy_name in ("random", "lookahead"):
+            policy.reset(seed)
+        simulation.new_game(seed)
+        simulation.start()
+        while simulation.game_running and simulation.ticks < max_ticks:
+            tick_input = policy(simulation)
+            simulation.step(simulation.FIXED_DELTA, tick_input)
+            recorder.record(simulation, tick_input)
+        replay = recorder.replay
+        replay.set_result(simulation, assisted=True)  # Played by a policy, not a person
+        path = os.path.join(output, f"{policy_name}-{seed}.replay")
+        replay.save(path)
+        print(f"{path}: {replay.duration:.1f}s, score {replay.score // 10}, {os.path.getsize(path)} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and check replays headless")
+    commands = parser.add_subparsers(dest="command", required=True)
+    play_parser = commands.add_parser("play", help="re-simulate replays and check their results")
+    play_parser.add_argument("paths", nargs="+")
+    record_parser = commands.add_parser("record", help="record runs of a scripted policy")
+    record_parser.add_argument("--policy", choices=("idle", "random", "reflex", "lookahead"), default="reflex")
+    record_parser.add_argument("--seeds", default="0", help="seeds to play, e.g. 1-20 or 3,7")
+    record_parser.add_argument("--output", default="replays", help="directory for the replay files")
+    record_parser.add_argument("--max-seconds", type=float, default=600.0, help="stop runs that last longer")
+    args = parser.parse_args()
+
+    if args.command == "play":
+        return 1 if play(args.paths) else 0
+    record(args.policy, parse_seeds(args.seeds), args.output, args.max_seconds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo rollout pool for difficulty tuning.
+
+Plays seeded headless runs with a scripted policy across a process pool and
+aggregates survival time, coin rate and death causes. Spawn parameters can
+be swept over a grid; every grid point plays the same seeds (common random
+numbers), so differences between configurations come from the parameters
+and not from luck.
+
+Work is split into chunks of runs that are handed out round-robin over the
+grid, so partial results for every configuration stream in early. Workers
+only send back compact per-chunk results, which keeps throughput scaling
+with the number of processes.
+
+Engines:
+    scalar  Simulation, one run at a time per worker
+    batch   BatchSimulation, a whole chunk stepped in lockstep per worker
+
+Usage:
+    python tools/rollout.py --runs 10000 --policy reflex
+    python tools/rollout.py --runs 2000 --sweep bird_probability=0.3,0.5,0.7 \\
+        --sweep max_group_spacing=250,350 --output sweep.jsonl
+    python tools/rollout.py --engine batch --runs 1000000 --max-ticks 7200
+    python tools/rollout.py --runs 200 --policy lookahead
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.simulation import Simulation
+from scenes.batch_simulation import BatchSimulation, OBSTACLE_TYPES
+from scenes import policies
+
+# Tunable spawn parameters: name -> (manager attribute owner, type)
+PARAMETERS = {
+    "min_group_spacing": ("obstacle_manager", int),
+    "max_group_spacing": ("obstacle_manager", int),
+    "bird_probability": ("obstacle_manager", float),
+    "min_spawn_interval": ("token_manager", float),
+    "max_spawn_interval": ("token_manager", float),
+    "min_powerup_interval": ("token_manager", float),
+    "max_powerup_interval": ("token_manager", float),
+    "doublegold_probability": ("token_manager", float),
+    "halfspeed_min_score": ("token_manager", float),
+    "godmode_min_score": ("token_manager", float),
+    "godmode_probability": ("token_manager", float),
+}
+
+POLICY_NAMES = ("idle", "random", "reflex", "lookahead")  # lookahead: scalar engine only
+TIMEOUT = "timeout"  # Death cause for runs cut off by --max-ticks
+
+# Per-process state, created once by init_worker
+_worker = {}
+
+
+def parse_sweep(specs):
+    """Turn ["name=v1,v2", ...] into a list of parameter dicts (the grid)"""
+    names = []
+    values = []
+    for spec in specs:
+        name, _, raw = spec.partition("=")
+        name = name.strip()
+        if name not in PARAMETERS or not raw:
+            raise ValueError(f"Bad sweep '{spec}', expected name=v1,v2 with name in: {', '.join(PARAMETERS)}")
+        cast = PARAMETERS[name][1]
+        names.append(name)
+        values.append([cast(value) for value in raw.split(",")])
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def make_units(configs, runs, chunk_size, base_seed):
+    """Split runs x configs into (config_index, params, first_seed, count) work units"""
+    units = []
+    for first in range(0, runs, chunk_size):
+        count = min(chunk_size, runs - first)
+        for index, params in enumerate(configs):
+            units.append((index, params, base_seed + first, count))
+    return units
+
+
+class RolloutStats:
+    """Aggregated results for one configuration"""
+
+    def __init__(self):
+        self.ticks = []  # int32 arrays of ticks survived, one per merged chunk
+        self.runs = 0
+        self.coins = 0
+        self.score = 0.0
+        self.causes = Counter()
+
+    def merge(self, result):
+        """Add one chunk result from a worker"""
+        ticks, coins, score, causes = result
+        self.ticks.append(ticks)
+        self.runs += len(ticks)
+        self.coins += coins
+        self.score += score
+        self.causes.update(causes)
+
+    def summary(self):
+        """Survival percentiles, coin rate and death cause distribution"""
+        if not self.runs:
+            return {"runs": 0}
+        ticks = np.concatenate(self.ticks)
+        if len(self.ticks) > 1:
+            self.ticks = [ticks]  # Keep one array so later summaries stay cheap
+        seconds = ticks / Simulation.TICK_RATE
+        total_seconds = float(seconds.sum())
+        p50, p90, p99 = np.percentile(seconds, (50, 90, 99))
+        return {
+            "runs": self.runs,
+            "survival_mean": round(float(seconds.mean()), 3),
+            "survival_p50": round(float(p50), 3),
+            "survival_p90": round(float(p90), 3),
+            "survival_p99": round(float(p99), 3),
+            "coins_per_minute": round(self.coins / total_seconds * 60, 3) if total_seconds else 0.0,
+            "score_mean": round(self.score / self.runs, 1),
+            "death_causes": {cause: round(count / self.runs, 4) for cause, count in self.causes.most_common()},
+        }
+
+
+def init_worker(engine, policy_name, max_ticks, batch_size):
+    """Build the engine once per process"""
+    _worker["engine"] = engine
+    _worker["policy"] = policy_name
+    _worker["max_ticks"] = max_ticks
+    _worker["batch_size"] = batch_size
+    _worker["batches"] = {}
+    if engine == "scalar":
+        simulation = Simulation()
+        _worker["simulation"] = simulation
+        _worker["defaults"] = {name: getattr(getattr(simulation, owner), name) for name, (owner, _) in PARAMETERS.items()}
+
+
+def run_unit(unit):
+    """Play one chunk of seeded runs; returns (config_index, chunk result)"""
+    index, params, first_seed, count = unit
+    if _worker["engine"] == "batch":
+        return index, run_batch_chunk(params, first_seed, count)
+    return index, run_scalar_chunk(params, first_seed, count)
+
+
+def run_scalar_chunk(params, first_seed, count):
+    """Play count runs one after another with the scalar engine"""
+    simulation = _worker["simulation"]
+    for name, value in {**_worker["defaults"], **params}.items():
+        setattr(getattr(simulation, PARAMETERS[name][0]), name, value)
+
+    name = _worker["policy"]
+    if name == "random":
+        policy = policies.RandomPolicy()
+    elif name == "lookahead":
+        policy = policies.LookaheadPolicy()
+    else:
+        policy = policies.reflex_policy if name == "reflex" else policies.idle_policy
+    max_ticks = _worker["max_ticks"]
+
+    ticks = np.zeros(count, dtype=np.int32)
+    coins = 0
+    score = 0.0
+    causes = Counter()
+    for run in range(count):
+        seed = first_seed + run
+        if name in ("random", "lookahead"):
+            policy.reset(seed)
+        ticks[run] = simulation.run(policy, seed, max_ticks)
+        coins += simulation.token_score
+        score += simulation.score
+        causes[simulation.death_cause or TIMEOUT] += 1
+    return ticks, coins, score, causes
+
+
+def run_batch_chunk(params, first_seed, count):
+    """Play count runs in lockstep, refilling finished games with the next seeds"""
+    size = min(_worker["batch_size"], count)
+    batch = _worker["batches"].get(size)
+    if batch is None:
+        batch = _worker["batches"][size] = BatchSimulation(size)
+        if "defaults" not in _worker:
+            _worker["defaults"] = {name: getattr(batch, name) for name in PARAMETERS}
+    # BatchSimulation mirrors the manager attributes under the same names
+    for name, value in {**_worker["defaults"], **params}.items():
+        setattr(batch, name, value)
+
+    name = _worker["policy"]
+    if name == "random":
+        policy = policies.BatchRandomPolicy(seed=first_seed)
+    else:
+        policy = policies.batch_reflex_policy if name == "reflex" else policies.batch_idle_policy
+    max_ticks = _worker["max_ticks"]
+
+    batch.reset(list(range(first_seed, first_seed + size)))
+    next_seed = first_seed + size
+    last_seed = first_seed + count
+
+    ticks = []
+    coins = 0
+    score = 0.0
+    causes = Counter()
+    while batch.alive.any():
+        jump, duck = policy(batch)
+        ended = batch.step(jump, duck)
+        if max_ticks is not None:
+            timed_out = batch.alive & (batch.ticks >= max_ticks)
+            if timed_out.any():
+                batch.alive &= ~timed_out
+                ended = ended | timed_out
+        if not ended.any():
+            continue
+
+        games = np.flatnonzero(ended)
+        ticks.append(batch.ticks[games].astype(np.int32))
+        coins += int(batch.token_score[games].sum())
+        score += float(batch.score[games].sum())
+        for cause in batch.death_cause[games].tolist():
+            causes[OBSTACLE_TYPES[cause] if cause >= 0 else TIMEOUT] += 1
+
+        # Keep the batch full until this chunk's seeds run out
+        refill = games[:max(0, last_seed - next_seed)]
+        if len(refill):
+            batch.reset_games(refill, list(range(next_seed, next_seed + len(refill))))
+            next_seed += len(refill)
+    return np.concatenate(ticks), coins, score, causes
+
+
+def format_summary(params, summary):
+    """One readable line per configuration"""
+    label = " ".join(f"{name}={value}" for name, value in params.items()) or "defaults"
+    if not summary["runs"]:
+        return f"{label}: no runs yet"
+    causes = ", ".join(f"{cause} {share:.1%}" for cause, share in summary["death_causes"].items())
+    return (f"{label}: runs={summary['runs']} survival mean={summary['survival_mean']:.1f}s "
+            f"p50={summary['survival_p50']:.1f}s p90={summary['survival_p90']:.1f}s "
+            f"coins/min={summary['coins_per_minute']:.1f} | {causes}")
+
+
+def write_results(output, configs, stats, elapsed, final):
+    """Append one JSON line per configuration to the output stream"""
+    for params, config_stats in zip(configs, stats):
+        record = {"params": params, "elapsed": round(elapsed, 2), "final": final}
+        record.update(config_stats.summary())
+        output.write(json.dumps(record) + "\n")
+    output.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo rollouts for difficulty tuning")
+    parser.add_argument("--runs", type=int, default=1000, help="runs per configuration")
+    parser.add_argument("--policy", choices=POLICY_NAMES, default="reflex")
+    parser.add_argument("--engine", choices=("scalar", "batch"), default="scalar")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-ticks", type=int, default=Simulation.TICK_RATE * 60 * 5,
+                        help="cut runs off after this many ticks (0 for no limit)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="runs per work unit (default 100 scalar, 2048 batch)")
+    parser.add_argument("--sweep", action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"parameter grid axis; one of: {', '.join(PARAMETERS)}")
+    parser.add_argument("--output", help="stream JSON lines of partial and final results to this file")
+    parser.add_argument("--report-interval", type=float, default=2.0, help="seconds between progress reports")
+    args = parser.parse_args()
+
+    try:
+        configs = parse_sweep(args.sweep) if args.sweep else [{}]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.engine == "batch" and args.policy == "lookahead":
+        parser.error("The lookahead policy searches forks of a Simulation; use --engine scalar")
+    chunk_size = args.chunk_size or (2048 if args.engine == "batch" else 100)
+    max_ticks = args.max_ticks or None
+    units = make_units(configs, args.runs, chunk_size, args.seed)
+    stats = [RolloutStats() for _ in configs]
+    total_runs = args.runs * len(configs)
+    output = open(args.output, "a") if args.output else None
+
+    print(f"{len(configs)} configuration(s) x {args.runs} runs, {len(units)} chunks, "
+          f"{args.workers} worker(s), {args.engine} engine, {args.policy} policy")
+
+    initargs = (args.engine, args.policy, max_ticks, chunk_size)
+    start = time.perf_counter()
+    last_report = start
+    done_runs = 0
+    interrupted = False
+    if args.workers > 1:
+        pool = multiprocessing.Pool(args.workers, init_worker, initargs)
+        results = pool.imap_unordered(run_unit, units)
+    else:
+        pool = None
+        init_worker(*initargs)
+        results = map(run_unit, units)
+
+    try:
+        for index, result in results:
+            stats[index].merge(result)
+            done_runs += len(result[0])
+            now = time.perf_counter()
+            if now - last_report >= args.report_interval:
+                last_report = now
+                elapsed = now - start
+                print(f"[{elapsed:7.1f}s] {done_runs}/{total_runs} runs ({done_runs / elapsed:.0f} runs/s)")
+                if output:
+                    write_results(output, configs, stats, elapsed, False)
+    except KeyboardInterrupt:
+        interrupted = True
+        if pool is not None:
+            pool.terminate()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    elapsed = time.perf_counter() - start
+    if interrupted:
+        print("Interrupted, partial results:")
+    print(f"{done_runs} runs in {elapsed:.1f}s ({done_runs / elapsed:.0f} runs/s, "
+          f"{done_runs / elapsed / args.workers:.0f} runs/s per worker)")
+    for params, config_stats in zip(configs, stats):
+        print(format_summary(params, config_stats.summary()))
+    if output:
+        write_results(output, configs, stats, elapsed, not interrupted)
+        output.close()
+    return 1 if interrupted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
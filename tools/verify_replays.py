@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Replay verification service for high-score submissions.
+
+Takes submitted replays from a queue directory (layout in the README),
+re-simulates them headless on a process pool and accepts only those whose
+score, coins and death tick match what they claim. Several services can
+share one queue.
+
+Usage:
+    python tools/verify_replays.py QUEUE                  # keep watching
+    python tools/verify_replays.py QUEUE --once --workers 8
+"""
+
+import argparse
+import collections
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenes.simulation import Simulation
+from scenes.replay import Replay, simulate
+
+QUEUE_DIRS = ("incoming", "processing", "accepted", "rejected")
+EXTENSION = ".replay"
+ACCEPTED = "accepted"
+REJECTED = "rejected"
+
+# Per-process state, created once by init_worker
+_worker = {}
+
+
+def init_worker(screen_size):
+    """Build the simulation once per process"""
+    _worker["screen_size"] = screen_size
+    _worker["simulation"] = Simulation(*screen_size)
+
+
+def verify_chunk(paths):
+    """Verify replay files; returns [(path, result dict, ticks simulated)]"""
+    return [verify_file(path) for path in paths]
+
+
+def verify_file(path):
+    """(path, result, ticks simulated) for one replay file; anything a replay makes fail rejects it"""
+    result = {"file": os.path.basename(path)}
+    try:
+        with open(path, "rb") as f:
+            replay = Replay.from_bytes(f.read())
+    except (OSError, ValueError) as e:
+        result.update(status=REJECTED, reason=f"unreadable: {e}")
+        return path, result, 0
+    except Exception as e:
+        result.update(status=REJECTED, reason=f"unreadable: {type(e).__name__}: {e}")
+        return path, result, 0
+
+    result.update(seed=replay.seed, score=replay.score, coins=replay.token_score, ticks=replay.ticks)
+    screen_size = (replay.screen_width, replay.screen_height)
+    if screen_size != _worker["screen_size"]:
+        result.update(status=REJECTED, reason=f"recorded at {screen_size[0]}x{screen_size[1]}")
+        return path, result, 0
+    if not replay.ended:
+        result.update(status=REJECTED, reason="run did not end")
+        return path, result, 0
+    if replay.assisted:
+        result.update(status=REJECTED, reason="assisted run (autopilot, scripted policy or rewind)")
+        return path, result, 0
+
+    try:
+        simulation = simulate(replay, _worker["simulation"])
+    except Exception as e:
+        result.update(status=REJECTED, reason=f"simulation failed: {type(e).__name__}: {e}")
+        return path, result, 0
+    problems = replay.mismatches(simulation)
+    if problems:
+        result.update(status=REJECTED, reason="; ".join(problems))
+    else:
+        result.update(status=ACCEPTED, death_cause=simulation.death_cause)
+    return path, result, simulation.ticks
+
+
+def owner_gone(owner):
+    """True if owner (HOST-PID) is a process of this host that no longer runs (POSIX only)"""
+    host, _, pid = owner.rpartition("-")
+    if host != socket.gethostname() or os.name != "posix" or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass  # Running as another user
+    return False
+
+
+class ReplayQueue:
+    """The queue directory: listing, claiming and filing replays"""
+
+    def __init__(self, root):
+        self.root = root
+        self.dirs = {name: os.path.join(root, name) for name in QUEUE_DIRS}
+        for path in self.dirs.values():
+            os.makedirs(path, exist_ok=True)
+        self.results_path = os.path.join(root, "results.jsonl")
+        self.owner = f"{socket.gethostname()}-{os.getpid()}"
+        self.claim_dir = os.path.join(self.dirs["processing"], self.owner)
+        os.makedirs(self.claim_dir, exist_ok=True)
+
+    def heartbeat(self):
+        """Touch this service's claim directory so other services leave its replays alone"""
+        try:
+            os.utime(self.claim_dir)
+        except OSError as e:
+            print(f"Error touching {self.claim_dir}: {e}")
+
+    def recover(self, stale_after=None):
+        """Move replays of services that stopped (or of every other service with stale_after None) back to incoming/"""
+        moved = 0
+        now = time.time()
+        with os.scandir(self.dirs["processing"]) as entries:
+            entries = [entry for entry in entries if entry.path != self.claim_dir]
+        for entry in entries:
+            try:
+                if not entry.is_dir():
+                    paths = [entry.path]  # Claimed directly in processing/ by an older version
+                elif stale_after is None or owner_gone(entry.name) or now - entry.stat().st_mtime >= stale_after:
+                    paths = [os.path.join(entry.path, name) for name in os.listdir(entry.path)]
+                else:
+                    continue
+            except FileNotFoundError:
+                continue  # Recovered by another service
+            moved += self.requeue(paths)
+            if entry.is_dir():
+                try:
+                    os.rmdir(entry.path)
+                except OSError:
+                    pass
+        return moved
+
+    def recover_own(self):
+        """Move replays left by an earlier service with this host name and PID back to incoming/ (call before claiming)"""
+        return self.requeue([os.path.join(self.claim_dir, name) for name in os.listdir(self.claim_dir)])
+
+    def requeue(self, paths):
+        """Move claimed replays back to incoming/; returns how many were moved"""
+        moved = 0
+        for path in paths:
+            try:
+                os.replace(path, os.path.join(self.dirs["incoming"], os.path.basename(path)))
+                moved += 1
+            except FileNotFoundError:
+                pass
+        return moved
+
+    def release(self):
+        """Remove this service's claim directory when nothing is left in it"""
+        try:
+            os.rmdir(self.claim_dir)
+        except OSError:
+            pass
+
+    def pending(self):
+        """Names of submitted replays, oldest name first"""
+        with os.scandir(self.dirs["incoming"]) as entries:
+            return sorted(entry.name for entry in entries if entry.name.endswith(EXTENSION) and entry.is_file())
+
+    def depth(self):
+        """Number of submitted replays nobody has claimed yet"""
+        with os.scandir(self.dirs["incoming"]) as entries:
+            return sum(1 for entry in entries if entry.name.endswith(EXTENSION))
+
+    def claim(self, names):
+        """Move replays into this service's claim directory; returns the paths it got"""
+        claimed = []
+        for name in names:
+            path = os.path.join(self.claim_dir, name)
+            try:
+                os.rename(os.path.join(self.dirs["incoming"], name), path)
+            except FileNotFoundError:
+                continue  # Another verifier took it
+            claimed.append(path)
+        return claimed
+
+    def file(self, path, status):
+        """Move a verified replay into accepted/ or rejected/"""
+        try:
+            os.replace(path, os.path.join(self.dirs[status], os.path.basename(path)))
+        except OSError as e:
+            print(f"Error filing {path}: {e}")
+
+
+class VerifyStats:
+    """Counters for the progress report"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.counts = collections.Counter()
+        self.ticks = 0
+
+    def add(self, result, ticks):
+        self.counts[result["status"]] += 1
+        self.ticks += ticks
+
+    def report(self, depth, in_flight):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        verified = sum(self.counts.values())
+        return (f"[{elapsed:7.1f}s] verified {verified} ({self.counts[ACCEPTED]} accepted, {self.counts[REJECTED]} rejected), "
+                f"{verified / elapsed * 60:.0f} replays/min, {self.ticks / elapsed / Simulation.TICK_RATE:.0f}x real time, "
+                f"queue depth {depth} (+{in_flight} in flight)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify submitted replays from a queue directory")
+    parser.add_argument("queue", help="queue directory (see the README)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty instead of watching it")
+    parser.add_argument("--chunk-size", type=int, default=16, help="replays per work unit")
+    parser.add_argument("--poll", type=float, default=0.5, help="seconds between looks at an empty queue")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="seconds between progress reports")
+    parser.add_argument("--screen", default="1152x648", help="screen size replays must be recorded at")
+    parser.add_argument("--stale-after", type=float, default=120.0,
+                        help="seconds without a heartbeat after which another service's claims are taken back")
+    parser.add_argument("--recover", action="store_true",
+                        help="move every claimed replay back to the queue on start (no other service may be running)")
+    args = parser.parse_args()
+
+    try:
+        screen_size = tuple(int(value) for value in args.screen.split("x"))
+    except ValueError:
+        parser.error(f"Bad --screen '{args.screen}', expected WIDTHxHEIGHT")
+    queue = ReplayQueue(args.queue)
+    recovered = queue.recover_own() + queue.recover(None if args.recover else args.stale_after)
+    if recovered:
+        print(f"Moved {recovered} interrupted replay(s) back to the queue")
+    # Heartbeat from its own thread, so long chunks do not make this service look stopped
+    stopped = threading.Event()
+    heartbeat_interval = args.stale_after / 4
+
+    def heartbeat():
+        while not stopped.wait(heartbeat_interval):
+            queue.heartbeat()
+
+    threading.Thread(target=heartbeat, name="heartbeat", daemon=True).start()
+    print(f"Verifying {args.queue} with {args.workers} worker(s){' until it is empty' if args.once else ''}")
+
+    if args.workers > 1:
+        start_pool = lambda: ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(screen_size,))
+        pool = start_pool()
+
+        def submit(chunk):
+            try:
+                return pool.submit(verify_chunk, chunk)
+            except BrokenProcessPool as e:
+                # Broke since the last result was collected; fail it like the chunks already on it
+                failed = Future()
+                failed.set_exception(e)
+                return failed
+    else:
+        pool = None
+        init_worker(screen_size)
+        # Verified when the result is asked for, so failures surface in result() as with the pool
+        deferred = collections.namedtuple("Deferred", ["result"])
+        submit = lambda chunk: deferred(lambda: verify_chunk(chunk))
+    max_in_flight = args.workers * 2  # Keeps every worker busy while results are filed
+
+    stats = VerifyStats()
+    backlog = collections.deque()
+    in_flight = collections.deque()  # (claimed paths, future, pool it runs on, whether it runs alone)
+    # Claimed replays of chunks that were running when a worker process died. Each is
+    # verified again on its own, so only a replay that kills a worker by itself is rejected
+    suspects = collections.deque()
+    last_report = time.perf_counter()
+    interrupted = False
+    results_file = open(queue.results_path, "a")
+    try:
+        while True:
+            if suspects:
+                if not in_flight:
+                    chunk = [suspects.popleft()]
+                    in_flight.append((chunk, submit(chunk), pool, True))
+            else:
+                if not backlog:
+                    backlog.extend(queue.pending())
+                while backlog and len(in_flight) < max_in_flight:
+                    chunk = queue.claim([backlog.popleft() for _ in range(min(args.chunk_size, len(backlog)))])
+                    if chunk:
+                        in_flight.append((chunk, submit(chunk), pool, False))
+
+            if in_flight:
+                chunk, pending, chunk_pool, alone = in_flight.popleft()
+                try:
+                    verified = pending.result()
+                except BrokenProcessPool:
+                    if chunk_pool is pool:
+                        print("A worker process died; restarting the pool")
+                        pool.shutdown(wait=False)
+                        pool = start_pool()
+                    if alone:
+                        # It ran with nothing else on the pool, so it killed the worker
+                        failure = "verification killed its worker process"
+                        verified = [(chunk[0], {"file": os.path.basename(chunk[0]), "status": REJECTED, "reason": failure}, 0)]
+                    else:
+                        suspects.extend(chunk)
+                        verified = []
+                for path, result, ticks in verified:
+                    result["verified_at"] = round(time.time(), 3)
+                    queue.file(path, result["status"])
+                    results_file.write(json.dumps(result) + "\n")
+                    stats.add(result, ticks)
+                results_file.flush()
+            elif args.once:
+                break
+            else:
+                time.sleep(args.poll)
+
+            now = time.perf_counter()
+            if now - last_report >= args.report_interval:
+                last_report = now
+                recovered = queue.recover(args.stale_after)
+                if recovered:
+                    print(f"Moved {recovered} replay(s) of a stopped service back to the queue")
+                print(stats.report(queue.depth(), len(suspects) + sum(len(chunk) for chunk, *_ in in_flight)))
+    except KeyboardInterrupt:
+        interrupted = True
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    finally:
+        stopped.set()
+        results_file.close()
+        queue.release()
+        if pool is not None:
+            pool.shutdown()
+
+    print(stats.report(queue.depth(), 0))
+    if interrupted:
+        print(f"Interrupted; replays claimed in {queue.claim_dir} go back to the queue on the next start")
+    return 1 if interrupted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())